@@ -0,0 +1,444 @@
+import asyncio
+import datetime
+import decimal
+import json
+import logging
+import re
+from urllib.parse import urlsplit, parse_qs
+
+import order_service
+import reservation_service
+import event_service
+import inventory_service
+import purchase_service
+import shift_service
+import staff_service
+import supplier_service
+import menu_service
+import recipe_service
+import sales_service
+from reference_data import recipe
+from low_stock import low_stock
+from menu_search import menu_search
+from records import END_OF_DAY
+from config import API_HOST, API_PORT, API_TOKEN
+
+logger = logging.getLogger(__name__)
+
+# Lightweight HTTP/JSON front end over the service modules, for clients
+# other than the Streamlit pages (kitchen display, POS terminals).
+# Service calls are blocking database work, so they run in the default
+# thread pool while the event loop keeps serving other connections.
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def to_json(value):
+    if value == END_OF_DAY:
+        return "24:00:00"
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        seconds = int(value.total_seconds())
+        return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+def rows(result, columns):
+    return [dict(zip(columns, row)) for row in result]
+
+
+def arg(data, name, parse=str, default=None):
+    value = data.get(name)
+    if value is None:
+        if default is None:
+            raise ApiError(400, f"Missing parameter: {name}")
+        return default
+    try:
+        return parse(value)
+    except (TypeError, ValueError, ArithmeticError):   # decimal.InvalidOperation is an ArithmeticError
+        raise ApiError(400, f"Invalid value for {name}: {value!r}")
+
+# A list parameter whose entries are JSON objects
+def entries(data, name):
+    value = data.get(name)
+    if not isinstance(value, list) or not all(isinstance(entry, dict) for entry in value):
+        raise ApiError(400, f"{name} must be a list of objects")
+    return value
+
+def date_arg(data, name, default=None):
+    return arg(data, name, datetime.date.fromisoformat, default)
+
+def time_arg(data, name):
+    return arg(data, name, datetime.time.fromisoformat)
+
+def optional_date(data, name):
+    return date_arg(data, name) if data.get(name) else None
+
+
+# ------------------ ORDERS ------------------
+def get_orders(query, body):
+    start = date_arg(query, "start")
+    end = date_arg(query, "end", start)
+    orders = order_service.list_orders(start, end, arg(query, "page", int, 1))
+    items = order_service.fetch_order_items([order.order_id for order in orders])
+    result = rows(orders, ["order_id", "customer", "order_time", "status", "total"])
+    for order in result:
+        order["items"] = rows(items[order["order_id"]], ["name", "quantity", "price"])
+    return {"total": order_service.count_orders(start, end), "orders": result}
+
+def post_order(query, body):
+    # prices come from the menu, not the request
+    lines = [(arg(line, "menu_item_id", int), arg(line, "quantity", int)) for line in entries(body, "lines")]
+    order_id, invoice_id, total = order_service.place_order(
+        arg(body, "staff_id", int), arg(body, "customer_name"), arg(body, "phone"), lines,
+        discount_id=body.get("discount_id"),
+        discount_percent=arg(body, "discount_percent", decimal.Decimal, 0),
+        payment_method=body.get("payment_method"),
+    )
+    return {"order_id": order_id, "invoice_id": invoice_id, "total": total}
+
+def cancel_order(query, body, order_id):
+    if not order_service.cancel_order(int(order_id)):
+        raise ApiError(409, "Only a placed order can be cancelled")
+    return {"order_id": int(order_id), "status": "Cancelled"}
+
+def post_payment(query, body):
+    order_service.record_payment(arg(body, "invoice_id", int), arg(body, "amount", decimal.Decimal), arg(body, "method"))
+    return {"recorded": True}
+
+
+def get_sales(query, body):
+    start = date_arg(query, "start")
+    end = date_arg(query, "end", start)
+    return {
+        "days": rows(sales_service.daily_sales(start, end), ["date", "orders", "items_sold", "gross_amount", "net_amount"]),
+        "categories": rows(sales_service.category_sales(start, end), ["category", "quantity", "gross_amount"]),
+        "payment_methods": rows(sales_service.payment_sales(start, end), ["payment_method", "payments", "amount"]),
+        "top_items": rows(sales_service.item_sales(start, end), ["item", "quantity", "gross_amount"]),
+    }
+
+
+# ------------------ RESERVATIONS ------------------
+RESERVATION_FIELDS = ["reservation_id", "customer", "table_number", "reservation_date", "start_time", "end_time", "guest_count", "status"]
+
+def get_reservations(query, body):
+    result = reservation_service.list_reservations(optional_date(query, "start"), optional_date(query, "end"))
+    return rows(result, RESERVATION_FIELDS)
+
+def get_available_tables(query, body):
+    result = reservation_service.available_tables(
+        date_arg(query, "date"), arg(query, "slot"), arg(query, "seats", int, 1)
+    )
+    return rows(result, ["table_id", "table_number", "seating_capacity"])
+
+def get_reservation_conflicts(query, body):
+    start = date_arg(query, "start")
+    result = reservation_service.find_double_bookings(start, date_arg(query, "end", start))
+    return rows(result, ["table_id", "reservation_date", "reservation_id", "conflicting_reservation_id"])
+
+def post_reservation(query, body):
+    reservation_id = reservation_service.create_reservation(
+        arg(body, "customer_name"), arg(body, "phone"), arg(body, "table_id", int),
+        date_arg(body, "reservation_date"), arg(body, "time_slot"), arg(body, "guest_count", int)
+    )
+    return {"reservation_id": reservation_id}
+
+def put_reservation(query, body, reservation_id):
+    reservation_service.update_reservation(
+        int(reservation_id), date_arg(body, "reservation_date"), arg(body, "time_slot"), arg(body, "guest_count", int)
+    )
+    return {"reservation_id": int(reservation_id)}
+
+def cancel_reservation(query, body, reservation_id):
+    reservation_service.cancel_reservation(int(reservation_id))
+    return {"reservation_id": int(reservation_id), "status": "Cancelled"}
+
+
+# ------------------ EVENTS ------------------
+def get_events(query, body):
+    start = date_arg(query, "start")
+    result = event_service.list_event_bookings(start, date_arg(query, "end", start))
+    return rows(result, ["event_name", "location", "event_date", "start_time", "end_time", "customer", "guest_count", "booked_by"])
+
+def post_event(query, body):
+    event_id = event_service.book_event(
+        arg(body, "staff_id", int), arg(body, "customer_name"), arg(body, "phone"), arg(body, "event_name"),
+        arg(body, "location"), date_arg(body, "event_date"), time_arg(body, "start_time"), time_arg(body, "end_time"),
+        arg(body, "guest_count", int)
+    )
+    return {"event_id": event_id}
+
+def put_event(query, body, event_id):
+    event_service.update_event(
+        int(event_id), arg(body, "event_name"), arg(body, "location"), time_arg(body, "start_time"), time_arg(body, "end_time")
+    )
+    return {"event_id": int(event_id)}
+
+def post_event_season(query, body):
+    dates = event_service.season_dates(date_arg(body, "first_date"), date_arg(body, "last_date"), arg(body, "every_weeks", int, 1))
+    location, start_time, end_time = arg(body, "location"), time_arg(body, "start_time"), time_arg(body, "end_time")
+    if arg(body, "check_only", bool, False):
+        clashes = event_service.check_season(location, dates, start_time, end_time)
+        return {"dates": len(dates), "conflicts": [{"event_date": day, "message": message} for day, message in clashes]}
+    event_ids = event_service.book_season(
+        arg(body, "staff_id", int), arg(body, "customer_name"), arg(body, "phone"), arg(body, "event_name"),
+        location, dates, start_time, end_time, arg(body, "guest_count", int)
+    )
+    return {"event_ids": event_ids}
+
+def delete_event(query, body, event_id):
+    event_service.delete_event(int(event_id))
+    return {"event_id": int(event_id), "deleted": True}
+
+
+# ------------------ INVENTORY ------------------
+def get_inventory(query, body):
+    result = inventory_service.items_in_category(arg(query, "category"))
+    return rows(result, ["item_id", "item_name", "unit", "current_quantity", "par_level"])
+
+def get_low_stock(query, body):
+    return rows(low_stock.low_items(), ["item_id", "item_name", "unit", "current_quantity", "par_level"])
+
+def post_inventory(query, body):
+    item_id = inventory_service.add_item(
+        arg(body, "item_name"), arg(body, "unit"), arg(body, "current_quantity", decimal.Decimal), arg(body, "category"),
+        arg(body, "par_level", decimal.Decimal, 0)
+    )
+    return {"item_id": item_id}
+
+def put_inventory(query, body, item_id):
+    inventory_service.update_item(
+        int(item_id), arg(body, "item_name"), arg(body, "unit"), arg(body, "current_quantity", decimal.Decimal),
+        arg(body, "par_level", decimal.Decimal, 0)
+    )
+    return {"item_id": int(item_id)}
+
+
+# ------------------ MENU ------------------
+def get_menu_search(query, body):
+    return rows(menu_search.search(arg(query, "q"), arg(query, "limit", int, 10)), ["menu_item_id", "name", "price"])
+
+def post_menu_item(query, body):
+    menu_item_id = menu_service.add_menu_item(
+        arg(body, "name"), arg(body, "price", decimal.Decimal), arg(body, "category_id", int)
+    )
+    return {"menu_item_id": menu_item_id}
+
+def get_recipe(query, body, menu_item_id):
+    return rows(recipe(int(menu_item_id)), ["item_id", "item_name", "unit", "quantity"])
+
+def put_recipe(query, body, menu_item_id):
+    ingredients = [(arg(line, "item_id", int), arg(line, "quantity", decimal.Decimal)) for line in entries(body, "ingredients")]
+    recipe_service.set_recipe(int(menu_item_id), ingredients)
+    return {"menu_item_id": int(menu_item_id), "ingredients": len(ingredients)}
+
+
+# ------------------ STAFF AND SUPPLIERS ------------------
+def post_staff(query, body):
+    staff_id = staff_service.add_staff(
+        arg(body, "name"), arg(body, "phone", str, ""), arg(body, "role_name"), arg(body, "salary", decimal.Decimal, 0)
+    )
+    return {"staff_id": staff_id}
+
+def post_supplier(query, body):
+    supplier_id = supplier_service.add_supplier(arg(body, "name"), arg(body, "phone", str, ""), arg(body, "category"))
+    return {"supplier_id": supplier_id}
+
+
+# ------------------ PURCHASES ------------------
+def get_purchases(query, body):
+    start = date_arg(query, "start")
+    end = date_arg(query, "end", start)
+    purchases = purchase_service.list_purchases(start, end, arg(query, "page", int, 1))
+    details = purchase_service.fetch_purchase_details([p.purchase_id for p in purchases])
+    result = rows(purchases, ["purchase_id", "supplier", "purchase_date", "status", "total_amount"])
+    for purchase in result:
+        purchase["items"] = rows(details[purchase["purchase_id"]], ["item_name", "quantity", "price_per_unit"])
+    return {"total": purchase_service.count_purchases(start, end), "purchases": result}
+
+def post_purchase(query, body):
+    items = [
+        (arg(item, "item_id", int), arg(item, "quantity", decimal.Decimal), arg(item, "price_per_unit", decimal.Decimal))
+        for item in entries(body, "items")
+    ]
+    purchase_id, total = purchase_service.record_purchase(
+        arg(body, "supplier_id", int), arg(body, "staff_id", int), date_arg(body, "purchase_date"),
+        arg(body, "status"), items
+    )
+    return {"purchase_id": purchase_id, "total_amount": total}
+
+def post_purchase_receive(query, body):
+    start = date_arg(body, "start")
+    received = purchase_service.receive_pending_purchases(start, date_arg(body, "end", start))
+    return {"received": received}
+
+def post_purchase_status(query, body, purchase_id):
+    purchase_service.update_purchase_status(int(purchase_id), arg(body, "status"))
+    return {"purchase_id": int(purchase_id), "status": body["status"]}
+
+
+# ------------------ SHIFTS ------------------
+def get_shifts(query, body):
+    start = date_arg(query, "start")
+    result = shift_service.list_shifts(start, date_arg(query, "end", start), query.get("role"))
+    return rows(result, ["name", "role", "shift_date", "start_time", "end_time"])
+
+def post_shift(query, body):
+    shift_id = shift_service.add_shift(
+        arg(body, "staff_id", int), date_arg(body, "shift_date"), time_arg(body, "start_time"), time_arg(body, "end_time")
+    )
+    return {"shift_id": shift_id}
+
+def put_shift(query, body, shift_id):
+    shift_service.update_shift(int(shift_id), time_arg(body, "start_time"), time_arg(body, "end_time"))
+    return {"shift_id": int(shift_id)}
+
+def post_roster(query, body):
+    written, conflicts = shift_service.apply_template(
+        arg(body, "template_id", int), date_arg(body, "start"), date_arg(body, "end"), arg(body, "skip_conflicts", bool, False)
+    )
+    return {"shifts": written, "skipped": conflicts}
+
+def delete_shift(query, body, shift_id):
+    shift_service.delete_shift(int(shift_id))
+    return {"shift_id": int(shift_id), "deleted": True}
+
+
+ROUTES = [
+    ("GET", r"/orders", get_orders),
+    ("POST", r"/orders", post_order),
+    ("POST", r"/orders/(\d+)/cancel", cancel_order),
+    ("POST", r"/payments", post_payment),
+    ("GET", r"/sales", get_sales),
+    ("GET", r"/reservations", get_reservations),
+    ("GET", r"/reservations/conflicts", get_reservation_conflicts),
+    ("POST", r"/reservations", post_reservation),
+    ("PUT", r"/reservations/(\d+)", put_reservation),
+    ("POST", r"/reservations/(\d+)/cancel", cancel_reservation),
+    ("GET", r"/tables/available", get_available_tables),
+    ("GET", r"/events", get_events),
+    ("POST", r"/events", post_event),
+    ("POST", r"/events/season", post_event_season),
+    ("PUT", r"/events/(\d+)", put_event),
+    ("DELETE", r"/events/(\d+)", delete_event),
+    ("GET", r"/inventory", get_inventory),
+    ("GET", r"/inventory/low", get_low_stock),
+    ("POST", r"/inventory", post_inventory),
+    ("PUT", r"/inventory/(\d+)", put_inventory),
+    ("GET", r"/menu/search", get_menu_search),
+    ("POST", r"/menu", post_menu_item),
+    ("GET", r"/menu/(\d+)/recipe", get_recipe),
+    ("PUT", r"/menu/(\d+)/recipe", put_recipe),
+    ("POST", r"/staff", post_staff),
+    ("POST", r"/suppliers", post_supplier),
+    ("GET", r"/purchases", get_purchases),
+    ("POST", r"/purchases", post_purchase),
+    ("POST", r"/purchases/receive", post_purchase_receive),
+    ("POST", r"/purchases/(\d+)/status", post_purchase_status),
+    ("GET", r"/shifts", get_shifts),
+    ("POST", r"/shifts", post_shift),
+    ("POST", r"/shifts/roster", post_roster),
+    ("PUT", r"/shifts/(\d+)", put_shift),
+    ("DELETE", r"/shifts/(\d+)", delete_shift),
+]
+COMPILED_ROUTES = [(method, re.compile(pattern + "$"), handler) for method, pattern, handler in ROUTES]
+
+def resolve(method, path):
+    path_matched = False
+    for route_method, pattern, handler in COMPILED_ROUTES:
+        match = pattern.match(path)
+        if match:
+            path_matched = True
+            if route_method == method:
+                return handler, match.groups()
+    raise ApiError(405 if path_matched else 404, "Method not allowed" if path_matched else "Not found")
+
+
+# ------------------ HTTP ------------------
+REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+           405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+MAX_BODY = 1024 * 1024
+
+async def read_request(reader):
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY:
+        raise ApiError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, headers, body
+
+def write_response(writer, status, payload, keep_alive):
+    data = json.dumps(payload, default=to_json).encode()
+    writer.write(
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+    )
+
+async def dispatch(method, target, headers, body):
+    if API_TOKEN and headers.get("authorization") != f"Bearer {API_TOKEN}":
+        raise ApiError(401, "Missing or invalid API token")
+    url = urlsplit(target)
+    handler, path_args = resolve(method, url.path.rstrip("/") or "/")
+    query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+    try:
+        payload = json.loads(body) if body else {}
+    except ValueError:
+        raise ApiError(400, "Body is not valid JSON")
+    if not isinstance(payload, dict):
+        raise ApiError(400, "Body must be a JSON object")
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, lambda: handler(query, payload, *path_args))
+
+async def handle_connection(reader, writer):
+    try:
+        while True:
+            keep_alive = False
+            try:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                status, payload = 200, await dispatch(method, target, headers, body)
+            except ApiError as e:
+                status, payload = e.status, {"error": str(e)}
+            except asyncio.IncompleteReadError:
+                status, payload = 400, {"error": "Malformed request"}
+            except ValueError as e:
+                status, payload = 400, {"error": str(e) or "Malformed request"}
+            except Exception:
+                # the details (SQL, driver messages) stay in the server log
+                logger.exception("Unhandled error while handling a request")
+                status, payload = 500, {"error": "Internal server error"}
+            write_response(writer, status, payload, keep_alive)
+            await writer.drain()
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+async def serve(host=API_HOST, port=API_PORT):
+    server = await asyncio.start_server(handle_connection, host, port)
+    print(f"Restaurant API listening on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+if __name__ == "__main__":
+    asyncio.run(serve())
@@ -0,0 +1,165 @@
+import bisect
+import datetime
+import threading
+import time
+from db import db_cursor
+from records import END_OF_DAY
+from config import AVAILABILITY_TTL
+
+# ------------------ TABLE AVAILABILITY INDEX ------------------
+# Answers "which tables seating >= N are free on date D during slot S" from
+# memory. Reservations for a date are loaded in one query the first time the
+# date is asked about (and again after AVAILABILITY_TTL, to pick up bookings
+# made by other processes), then kept current by reservation_service. The
+# table list is reloaded on the same TTL, or at once after invalidate_tables().
+# Dates before today are dropped whenever another date is loaded.
+#
+# Per date, reservations are bucketed by the hours they touch, so a lookup
+# only compares against bookings in the same hours of the same day.
+
+DAY_MINUTES = 24 * 60
+
+def parse_slot(time_slot):
+    try:
+        start, end = time_slot.split("-")
+        start_h, start_m = start.strip().split(":")[:2]
+        end_h, end_m = end.strip().split(":")[:2]
+        start_min = int(start_h) * 60 + int(start_m)
+        end_min = int(end_h) * 60 + int(end_m)
+    except (AttributeError, ValueError):
+        # Unreadable slot: treat the table as taken all day rather than double-book it
+        return 0, DAY_MINUTES
+    if end_min <= start_min:
+        end_min = DAY_MINUTES
+    return start_min, end_min
+
+# TIME columns come back from mysql.connector as timedelta, and as time in records
+def minutes_of(value):
+    if hasattr(value, "total_seconds"):
+        return int(value.total_seconds()) // 60
+    if value == END_OF_DAY:
+        return DAY_MINUTES
+    return value.hour * 60 + value.minute
+
+# (start, end) times -> "HH:MM-HH:MM". A time input can't show 24:00, so an
+# end in the day's last minute (END_OF_DAY included) is written as 24:00.
+def slot_text(start_time, end_time):
+    end = "24:00" if end_time >= datetime.time(23, 59) else end_time.strftime("%H:%M")
+    return f"{start_time.strftime('%H:%M')}-{end}"
+
+def slot_hours(start_min, end_min):
+    return range(start_min // 60, (end_min - 1) // 60 + 1)
+
+
+class AvailabilityIndex:
+    def __init__(self, ttl=AVAILABILITY_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._tables = None         # [(seating_capacity, table_id, table_number)] sorted
+        self._tables_loaded_at = 0
+        self._capacities = []       # seating capacities alone, for bisect
+        self._days = {}             # date -> (loaded_at, {hour: {reservation_id: (table_id, start, end)}})
+        self._reservations = {}     # reservation_id -> (date, table_id, start, end)
+
+    # ---- loading ----
+    def _load_tables(self):
+        with db_cursor() as cursor:
+            cursor.execute("SELECT table_id, table_number, seating_capacity FROM `Table`")
+            tables = sorted((cap, tid, num) for tid, num, cap in cursor.fetchall())
+        self._tables = tables
+        self._tables_loaded_at = time.monotonic()
+        self._capacities = [cap for cap, _, _ in tables]
+
+    def _evict_past(self):
+        today = datetime.date.today()
+        for day in [day for day in self._days if day < today]:
+            del self._days[day]
+        for reservation_id in [rid for rid, (d, *_) in self._reservations.items() if d < today]:
+            del self._reservations[reservation_id]
+
+    def _load_day(self, day):
+        with db_cursor() as cursor:
+            cursor.execute("""
+                SELECT reservation_id, table_id, start_time, end_time
+                FROM Reservation
+                WHERE reservation_date = %s AND status <> 'Cancelled'
+            """, (day,))
+            rows = cursor.fetchall()
+        self._evict_past()
+        for reservation_id in [rid for rid, (d, *_) in self._reservations.items() if d == day]:
+            del self._reservations[reservation_id]
+        buckets = {}
+        self._days[day] = (time.monotonic(), buckets)
+        for reservation_id, table_id, start_time, end_time in rows:
+            self._insert(reservation_id, table_id, day, minutes_of(start_time), minutes_of(end_time))
+
+    def _day(self, day):
+        if self._tables is None or time.monotonic() - self._tables_loaded_at > self.ttl:
+            self._load_tables()
+        entry = self._days.get(day)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            self._load_day(day)
+        return self._days[day][1]
+
+    def _insert(self, reservation_id, table_id, day, start, end):
+        buckets = self._days[day][1]
+        for hour in slot_hours(start, end):
+            buckets.setdefault(hour, {})[reservation_id] = (table_id, start, end)
+        self._reservations[reservation_id] = (day, table_id, start, end)
+
+    def _remove(self, reservation_id):
+        entry = self._reservations.pop(reservation_id, None)
+        if entry is None:
+            return
+        day, _, start, end = entry
+        if day in self._days:
+            buckets = self._days[day][1]
+            for hour in slot_hours(start, end):
+                buckets.get(hour, {}).pop(reservation_id, None)
+
+    def _booked(self, day, start, end, ignore=None):
+        buckets = self._day(day)
+        booked = set()
+        for hour in slot_hours(start, end):
+            for reservation_id, (table_id, s, e) in buckets.get(hour, {}).items():
+                if reservation_id != ignore and s < end and start < e:
+                    booked.add(table_id)
+        return booked
+
+    # ---- queries ----
+    # [(table_id, table_number, seating_capacity)], smallest suitable tables first
+    def free_tables(self, day, time_slot, min_seats=1):
+        start, end = parse_slot(time_slot)
+        with self._lock:
+            booked = self._booked(day, start, end)
+            first = bisect.bisect_left(self._capacities, min_seats)
+            return [(tid, num, cap) for cap, tid, num in self._tables[first:] if tid not in booked]
+
+    def is_free(self, table_id, day, time_slot, ignore_reservation=None):
+        start, end = parse_slot(time_slot)
+        with self._lock:
+            return table_id not in self._booked(day, start, end, ignore_reservation)
+
+    # ---- incremental maintenance (called after the write has committed) ----
+    def add(self, reservation_id, table_id, day, time_slot):
+        with self._lock:
+            self._remove(reservation_id)
+            if day in self._days:
+                self._insert(reservation_id, table_id, day, *parse_slot(time_slot))
+
+    def remove(self, reservation_id):
+        with self._lock:
+            self._remove(reservation_id)
+
+    def invalidate_tables(self):
+        with self._lock:
+            self._tables = None
+
+    def clear(self):
+        with self._lock:
+            self._tables = None
+            self._days.clear()
+            self._reservations.clear()
+
+
+availability = AvailabilityIndex()
@@ -0,0 +1,179 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from db import db_cursor, pool_stats, backend
+from availability import availability
+from reference_data import available_menu_items, menu_categories, reference_cache
+from order_service import count_orders, list_orders, fetch_order_items, place_order
+from reservation_service import list_reservations, available_tables
+from purchase_service import count_purchases, list_purchases, fetch_purchase_details
+from shift_service import list_shifts, shifts_on
+from datagen import read_datasets
+
+# Times the queries behind each screen against whatever database config points
+# at (fill one with datagen.py first) and writes the results as JSON, so runs
+# before and after a change can be compared with --compare.
+
+TABLES = ["`Order`", "OrderDetail", "Invoice", "Payment", "Customer", "Reservation",
+          "Event", "Purchase", "PurchaseDetail", "ShiftSchedule", "InventoryItem", "MenuItem"]
+
+
+def latest_day():
+    with db_cursor() as cursor:
+        cursor.execute("SELECT order_time FROM `Order` ORDER BY order_time DESC LIMIT 1")
+        latest = cursor.fetchone()
+    return latest[0].date() if latest else datetime.date.today()
+
+def row_counts():
+    counts = {}
+    with db_cursor() as cursor:
+        for table in TABLES:
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            counts[table.strip("`")] = cursor.fetchone()[0]
+    return counts
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)), text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ---- scenarios: each returns a zero-argument callable doing one screen's work ----
+def orders_page(start, end):
+    def run():
+        count_orders(start, end)
+        orders = list_orders(start, end, page=1)
+        fetch_order_items([o.order_id for o in orders])
+    return run
+
+def reservations_day(day):
+    def run():
+        list_reservations(day, day)
+        available_tables(day, "19:00-20:00", 4)
+    return run
+
+def purchases_page(start, end):
+    def run():
+        count_purchases(start, end)
+        purchases = list_purchases(start, end, page=1)
+        fetch_purchase_details([p.purchase_id for p in purchases])
+    return run
+
+def shifts_week(start):
+    def run():
+        list_shifts(start, start + datetime.timedelta(days=6))
+        shifts_on(start)
+    return run
+
+def order_placement():
+    items = [item for category_id, _ in menu_categories() for item in available_menu_items(category_id)]
+    lines = [(menu_item_id, 2) for menu_item_id, _, _ in items[:3]]
+    with db_cursor() as cursor:
+        cursor.execute("SELECT MIN(staff_id) FROM Staff")
+        staff_id = cursor.fetchone()[0]
+    def run():
+        place_order(staff_id, "Benchmark Customer", "9000000000", lines, payment_method="Cash")
+    return run
+
+def scenarios(day, writes):
+    month_start = day.replace(day=1)
+    week_start = day - datetime.timedelta(days=day.weekday())
+    result = {
+        "orders_day": orders_page(day, day),
+        "orders_month": orders_page(month_start, day),
+        "reservations_day": reservations_day(day),
+        "purchases_month": purchases_page(month_start, day),
+        "shifts_week": shifts_week(week_start),
+    }
+    if writes:
+        result["place_order"] = order_placement()
+    return result
+
+
+def measure(run, iterations, warmup):
+    for _ in range(warmup):
+        run()
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "mean_ms": round(statistics.mean(timings), 3),
+        "min_ms": round(timings[0], 3),
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        "max_ms": round(timings[-1], 3),
+    }
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path) as f:
+        baseline = json.load(f)["scenarios"]
+    regressions = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        change = (current["p50_ms"] - before["p50_ms"]) / before["p50_ms"] if before["p50_ms"] else 0
+        print(f"{name:18} p50 {before['p50_ms']:>9.3f} -> {current['p50_ms']:>9.3f} ms ({change:+.1%})")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the restaurant screens' queries")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="scenario names to run")
+    parser.add_argument("--writes", action="store_true", help="include write scenarios (adds rows to the database)")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="earlier results file; exit 1 if any p50 regressed past --threshold")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed p50 slowdown as a fraction")
+    args = parser.parse_args(argv)
+
+    day = latest_day()
+    results = {}
+    for name, run in scenarios(day, args.writes).items():
+        if args.only and name not in args.only:
+            continue
+        # Start every scenario cold so one doesn't warm the caches for the next
+        reference_cache.clear()
+        availability.clear()
+        results[name] = measure(run, args.iterations, args.warmup)
+        print(f"{name:18} p50 {results[name]['p50_ms']:>9.3f} ms  p95 {results[name]['p95_ms']:>9.3f} ms")
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "database": backend.describe(),
+        "python": platform.python_version(),
+        "reference_day": day.isoformat(),
+        # seed, end date and scale datagen.py filled this database with, if it did
+        "dataset": read_datasets().get(backend.describe()),
+        "row_counts": row_counts(),
+        "pool": pool_stats(),
+        "scenarios": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"p50 regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import datetime
+import sys
+from db import db_cursor, backend
+from utils import day_range
+from order_service import ORDERS_PAGE, ORDER_ITEMS
+from reservation_service import RESERVATIONS_ON, RESERVATIONS_BETWEEN, OVERLAP_QUERY
+from event_service import EVENT_BOOKINGS
+from shift_service import shifts_query
+
+# The filtered queries behind each screen, with representative parameters.
+# The SQL is imported from the service modules, so this checks what actually runs.
+today = datetime.date.today()
+week_start, week_end = day_range(today - datetime.timedelta(days=7), today)
+
+SCREEN_QUERIES = [
+    ("manager_dashboard_view_orders: orders page", ORDERS_PAGE, (week_start, week_end, 25, 0)),
+    ("manager_dashboard_view_orders: line items", ORDER_ITEMS.format(placeholders="%s, %s, %s"), (1, 2, 3)),
+    ("admin_manage_reservations: by date", RESERVATIONS_ON, (today,)),
+    ("admin_manage_reservations: by date range", RESERVATIONS_BETWEEN, (today, today + datetime.timedelta(days=7))),
+    ("reservation_service: table overlap check", OVERLAP_QUERY, (1, today, "13:00:00", "12:00:00")),
+    ("admin_view_upcoming_events: by date range", EVENT_BOOKINGS, (today, today + datetime.timedelta(days=30))),
+    ("manager_manage_shifts: by date range", shifts_query(False), (today, today + datetime.timedelta(days=6))),
+    ("manager_manage_shifts: by date range and role", shifts_query(True),
+     (today, today + datetime.timedelta(days=6), "Manager")),
+]
+
+def sqlite_full_scans(cursor, sql, params):
+    cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+    # detail reads "SCAN o" for a full scan, "SEARCH o USING INDEX ..." otherwise
+    return [detail.split()[1] for *_, detail in cursor.fetchall()
+            if detail.startswith("SCAN ") and "INDEX" not in detail]
+
+def full_scans(cursor, sql, params):
+    if backend.name == "sqlite":
+        return sqlite_full_scans(cursor, sql, params)
+    cursor.execute("EXPLAIN " + sql, params)
+    columns = [col[0] for col in cursor.description]
+    scans = []
+    for row in cursor.fetchall():
+        plan = dict(zip(columns, row))
+        if plan.get("type") == "ALL":
+            scans.append(plan.get("table"))
+    return scans
+
+def main():
+    failed = False
+    with db_cursor() as cursor:
+        for label, sql, params in SCREEN_QUERIES:
+            scans = full_scans(cursor, sql, params)
+            if scans:
+                failed = True
+                print(f"FULL SCAN  {label}: {', '.join(scans)}")
+            else:
+                print(f"ok         {label}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
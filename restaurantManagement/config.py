@@ -1,6 +1,45 @@
-DB_HOST = "localhost"
-DB_USER = "root"
-DB_PASSWORD = "root12345"
-DB_NAME = "fdbproject"
+import os
+
+# "mysql" (server, settings below) or "sqlite" (embedded file at DB_PATH, no server needed)
+DB_BACKEND = os.environ.get("RESTAURANT_DB_BACKEND", "mysql")
+DB_PATH = os.environ.get("RESTAURANT_DB_PATH", "restaurant.db")
+
+DB_HOST = os.environ.get("RESTAURANT_DB_HOST", "localhost")
+DB_USER = os.environ.get("RESTAURANT_DB_USER", "root")
+DB_PASSWORD = os.environ.get("RESTAURANT_DB_PASSWORD", "root12345")
+DB_NAME = os.environ.get("RESTAURANT_DB_NAME", "fdbproject")
 
 UPI_ID = "restaurant@upi"
+UPI_PAYEE_NAME = "Restaurant"  # shown in the payer's UPI app
+UPI_QR_CACHE_SIZE = 128  # payment QR images kept in memory, least recently used dropped first
+
+DB_POOL_SIZE = 8
+DB_POOL_TIMEOUT = 10  # seconds to wait for a free pooled connection
+DB_POOL_PING_AFTER = 30  # ping idle connections older than this on checkout
+DB_POOL_POLL = 0.05  # how often a waiting checkout re-checks for room freed by a discarded connection
+
+# Development mode turns on connection leak reporting (RESTAURANT_DEV=1)
+DEV_MODE = os.environ.get("RESTAURANT_DEV", "0") == "1"
+
+REFERENCE_CACHE_TTL = 300  # seconds before cached reference data is re-read
+REFERENCE_CACHE_SIZE = 256  # max cached queries before least-recently-used eviction
+
+API_HOST = "127.0.0.1"
+API_PORT = 8080
+API_TOKEN = os.environ.get("RESTAURANT_API_TOKEN")  # required as a Bearer token when set
+
+AVAILABILITY_TTL = 60  # seconds before a date's reservations are reloaded into the availability index
+EVENT_INDEX_TTL = 300  # seconds before a date's events are reloaded into the event conflict index
+LOW_STOCK_TTL = 300  # seconds before stock levels are reloaded into the low-stock index
+
+SLOW_QUERY_MS = float(os.environ.get("RESTAURANT_SLOW_QUERY_MS", "200"))  # statements at least this slow are logged
+SLOW_QUERY_LOG = os.environ.get("RESTAURANT_SLOW_QUERY_LOG", "slow_queries.log")  # empty string: keep them in memory only
+METRICS_SAMPLES = 1000  # latest timings kept per query / page for percentiles
+
+CUSTOMER_CACHE_SIZE = 500  # recently seen customers kept in memory, keyed by phone
+CUSTOMER_CACHE_TTL = 600  # seconds before a cached customer is looked up again
+MENU_SEARCH_TTL = 300  # seconds before the menu search index is rebuilt to pick up other processes' edits
+
+EXPORT_DIR = os.environ.get("RESTAURANT_EXPORT_DIR", "exports")  # where export files are written
+EXPORT_CHUNK_ROWS = 5000  # rows fetched from the database and written out at a time
+IMPORT_BATCH_ROWS = 1000  # rows per batched INSERT / UPDATE during a CSV import
@@ -0,0 +1,140 @@
+import argparse
+import re
+from db import db_cursor, after_commit
+from reference_data import TTLCache
+from config import CUSTOMER_CACHE_SIZE, CUSTOMER_CACHE_TTL
+
+# ------------------ CUSTOMERS ------------------
+# One Customer row per phone number instead of one per order, reservation or
+# booking. Phones are matched on phone_key: the digits only, without a country
+# or trunk prefix, so "+91 98765-43210" and "098765 43210" are one customer.
+# Customers given without a phone still get a row each.
+
+PHONE_DIGITS = 10
+_NON_DIGITS = re.compile(r"\D")
+
+def phone_key(phone):
+    digits = _NON_DIGITS.sub("", phone or "")
+    return digits[-PHONE_DIGITS:] or None
+
+# phone_key -> (customer_id, name) for customers seen recently, so a regular
+# at the order screen costs no lookup. Only committed rows are cached.
+recent_customers = TTLCache(maxsize=CUSTOMER_CACHE_SIZE, ttl=CUSTOMER_CACHE_TTL)
+
+def _lookup(cursor, key):
+    cursor.execute("""
+        SELECT customer_id, name FROM Customer
+        WHERE phone_key = %s
+        ORDER BY customer_id
+        LIMIT 1
+    """, (key,))
+    return cursor.fetchone()
+
+# (customer_id, name) or None
+def find_customer(phone):
+    key = phone_key(phone)
+    if key is None:
+        return None
+    hit, customer = recent_customers.get(("Customer", key))
+    if not hit:
+        with db_cursor() as cursor:
+            customer = _lookup(cursor, key)
+        if customer is not None:
+            recent_customers.set(("Customer", key), customer)
+    return customer
+
+# Inside the caller's transaction: the existing customer_id for this phone
+# (taking the latest name given), or a newly inserted customer. Two first
+# visits racing on the same new phone can still both insert; the merge job
+# below folds such pairs together. The cache is only updated once the
+# caller's transaction commits.
+def upsert_customer(cursor, name, phone):
+    key = phone_key(phone)
+    if key is None:
+        cursor.execute("INSERT INTO Customer (name, phone) VALUES (%s, %s)", (name, phone))
+        return cursor.lastrowid
+
+    hit, customer = recent_customers.get(("Customer", key))
+    if not hit:
+        customer = _lookup(cursor, key)
+    if customer is None:
+        cursor.execute("""
+            INSERT INTO Customer (name, phone, phone_key) VALUES (%s, %s, %s)
+        """, (name, phone, key))
+        customer_id = cursor.lastrowid
+        after_commit(lambda: recent_customers.set(("Customer", key), (customer_id, name)))
+        return customer_id
+
+    customer_id, known_name = customer
+    if name and name != known_name:
+        cursor.execute("UPDATE Customer SET name = %s, phone = %s WHERE customer_id = %s", (name, phone, customer_id))
+    after_commit(lambda: recent_customers.set(("Customer", key), (customer_id, name or known_name)))
+    return customer_id
+
+
+# ------------------ DEDUPLICATION ------------------
+# One-off cleanup for the rows written before upserts: fills phone_key, then
+# folds every customer into the oldest row with the same phone_key. Each batch
+# repoints the duplicates' orders, reservations and bookings and deletes them
+# in its own transaction, so the job can be stopped and rerun at any point.
+CUSTOMER_REFERENCES = ["`Order`", "Reservation", "EventBooking"]
+
+def backfill_phone_keys(batch_size=1000):
+    filled, last_id = 0, 0
+    while True:
+        with db_cursor() as cursor:
+            cursor.execute("""
+                SELECT customer_id, phone FROM Customer
+                WHERE customer_id > %s AND phone_key IS NULL AND phone IS NOT NULL
+                ORDER BY customer_id
+                LIMIT %s
+            """, (last_id, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                return filled
+            keys = [(phone_key(phone), customer_id) for customer_id, phone in rows]
+            cursor.executemany("UPDATE Customer SET phone_key = %s WHERE customer_id = %s",
+                               [(key, customer_id) for key, customer_id in keys if key])
+        filled += sum(1 for key, _ in keys if key)
+        last_id = rows[-1][0]
+
+# [(duplicate_id, kept_id), ...]
+def duplicate_customers():
+    with db_cursor() as cursor:
+        cursor.execute("""
+            SELECT c.customer_id, k.kept_id
+            FROM Customer c
+            JOIN (
+                SELECT phone_key, MIN(customer_id) AS kept_id
+                FROM Customer
+                WHERE phone_key IS NOT NULL
+                GROUP BY phone_key
+                HAVING COUNT(*) > 1
+            ) k ON k.phone_key = c.phone_key
+            WHERE c.customer_id <> k.kept_id
+            ORDER BY c.customer_id
+        """)
+        return cursor.fetchall()
+
+def merge_duplicate_customers(batch_size=1000):
+    filled = backfill_phone_keys(batch_size)
+    duplicates = duplicate_customers()
+    for i in range(0, len(duplicates), batch_size):
+        batch = duplicates[i:i + batch_size]
+        with db_cursor() as cursor:
+            for table in CUSTOMER_REFERENCES:
+                cursor.executemany(f"UPDATE {table} SET customer_id = %s WHERE customer_id = %s",
+                                   [(kept_id, duplicate_id) for duplicate_id, kept_id in batch])
+            cursor.executemany("DELETE FROM Customer WHERE customer_id = %s",
+                               [(duplicate_id,) for duplicate_id, _ in batch])
+    recent_customers.clear()
+    return filled, len(duplicates)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge Customer rows that share a phone number")
+    parser.add_argument("--merge-duplicates", action="store_true", required=True)
+    parser.add_argument("--batch-size", type=int, default=1000, help="customers merged per transaction")
+    args = parser.parse_args()
+    filled, merged = merge_duplicate_customers(args.batch_size)
+    print(f"Filled phone keys for {filled} customers; merged {merged} duplicate customers.")
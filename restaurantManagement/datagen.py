@@ -0,0 +1,316 @@
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+from db import db_cursor, backend
+from config import DB_NAME, DB_BACKEND, DB_PATH
+from reservation_service import TIME_SLOTS, slot_bounds
+from availability import availability
+from sales_service import rebuild_sales
+from customer_service import phone_key
+
+# Fills every table of the fdbproject schema with synthetic data at a
+# configurable scale, for benchmarks. Rows are generated and inserted in
+# chunks with explicit ids, so memory stays flat even at millions of orders.
+# Run migrate.py against the target database first.
+
+BATCH_SIZE = 5000
+
+# The parameters of the last fill of each database, which benchmark.py copies
+# into its report so results can be traced back to (and rebuilt from) their data
+DATASET_FILE = "datagen_dataset.json"
+
+CATEGORIES = ["Tiffins", "Lunch", "Snacks", "Drinks", "Desserts", "Specials"]
+INVENTORY_CATEGORIES = ["Grocery", "Meat", "Drinks", "Dairy", "Vegetables", "Spices"]
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Meera", "Kabir", "Anaya", "Rohan", "Saanvi", "Vihaan", "Priya",
+               "Alice", "Bob", "Sara", "John", "Mike", "Nisha", "Arjun", "Kavya", "Dev", "Riya"]
+LAST_NAMES = ["Sharma", "Reddy", "Iyer", "Khan", "Patel", "Nair", "Singh", "Das", "Rao", "Gupta"]
+LOCATIONS = ["Banquet Hall", "Conference Room", "Rooftop", "Garden", "Private Dining"]
+
+
+def next_id(cursor, table, column):
+    cursor.execute(f"SELECT COALESCE(MAX({column}), 0) FROM {table}")
+    return cursor.fetchone()[0] + 1
+
+def insert_rows(cursor, table, columns, rows):
+    if rows:
+        placeholders = ", ".join(["%s"] * len(columns))
+        cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+
+def bulk_insert(table, columns, rows):
+    chunk = []
+    count = 0
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= BATCH_SIZE:
+            with db_cursor() as cursor:
+                insert_rows(cursor, table, columns, chunk)
+            count += len(chunk)
+            chunk = []
+    with db_cursor() as cursor:
+        insert_rows(cursor, table, columns, chunk)
+    return count + len(chunk)
+
+def person(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+def phone(rng):
+    return f"9{rng.randrange(10**8, 10**9)}"
+
+def busy_time(rng, day):
+    # Lunch and dinner peaks, some all-day trade
+    hour = rng.choice([12, 13, 13, 14, 19, 20, 20, 21] + list(range(9, 23)))
+    return datetime.datetime.combine(day, datetime.time(hour, rng.randrange(60), rng.randrange(60)))
+
+
+class Generator:
+    def __init__(self, orders, days, seed, end_date=None):
+        self.rng = random.Random(seed)
+        self.orders = orders
+        self.days = days
+        self.end_date = end_date or datetime.date.today()
+        self.start_date = self.end_date - datetime.timedelta(days=days - 1)
+        self.counts = {}
+
+    def day(self):
+        return self.start_date + datetime.timedelta(days=self.rng.randrange(self.days))
+
+    def ids(self, table, column, n):
+        with db_cursor() as cursor:
+            first = next_id(cursor, table, column)
+        return range(first, first + n)
+
+    def add(self, table, columns, rows):
+        name = table.strip("`")
+        self.counts[name] = self.counts.get(name, 0) + bulk_insert(table, columns, rows)
+
+    # ---- reference data ----
+    def reference(self):
+        rng = self.rng
+        with db_cursor() as cursor:
+            cursor.execute("SELECT role_id, role_name FROM Role")
+            roles = {name.lower(): rid for rid, name in cursor.fetchall()}
+            for name in ["Admin", "Manager", "Chef"]:
+                if name.lower() not in roles:
+                    cursor.execute("INSERT INTO Role (role_name) VALUES (%s)", (name,))
+                    roles[name.lower()] = cursor.lastrowid
+
+        staff_count = max(10, self.orders // 25000)
+        self.staff_ids = list(self.ids("Staff", "staff_id", staff_count))
+        self.add("Staff", ["staff_id", "name", "phone", "role_id", "salary"], (
+            (sid, person(rng), phone(rng), rng.choice(list(roles.values())), rng.randrange(20000, 60000))
+            for sid in self.staff_ids
+        ))
+
+        self.customer_ids = self.ids("Customer", "customer_id", max(100, self.orders // 4))
+        self.add("Customer", ["customer_id", "name", "phone", "phone_key"], (
+            (cid, person(rng), number, phone_key(number)) for cid in self.customer_ids for number in [phone(rng)]
+        ))
+
+        with db_cursor() as cursor:
+            cursor.execute("SELECT COALESCE(MAX(table_number), 0) FROM `Table`")
+            first_number = cursor.fetchone()[0] + 1
+        self.table_ids = list(self.ids("`Table`", "table_id", 30))
+        self.add("`Table`", ["table_id", "table_number", "seating_capacity", "status"], (
+            (tid, first_number + i, rng.choice([2, 2, 4, 4, 4, 6, 8]), "Available") for i, tid in enumerate(self.table_ids)
+        ))
+
+        with db_cursor() as cursor:
+            cursor.execute("SELECT category_name FROM MenuCategory")
+            existing = {row[0] for row in cursor.fetchall()}
+        new_categories = [name for name in CATEGORIES if name not in existing]
+        category_ids = self.ids("MenuCategory", "category_id", len(new_categories))
+        self.add("MenuCategory", ["category_id", "category_name"], zip(category_ids, new_categories))
+        with db_cursor() as cursor:
+            cursor.execute("SELECT category_id FROM MenuCategory")
+            all_categories = [row[0] for row in cursor.fetchall()]
+
+        menu_ids = self.ids("MenuItem", "menu_item_id", 120)
+        self.menu = [(mid, rng.randrange(40, 400)) for mid in menu_ids]
+        self.add("MenuItem", ["menu_item_id", "name", "price", "category_id", "is_available"], (
+            (mid, f"Dish {mid}", price, rng.choice(all_categories), int(rng.random() > 0.05)) for mid, price in self.menu
+        ))
+
+        discount_ids = self.ids("Discount", "discount_id", 5)
+        self.discounts = [(did, rng.choice([5, 10, 15, 20])) for did in discount_ids]
+        self.add("Discount", ["discount_id", "discount_code", "discount_percentage"], (
+            (did, f"BENCH{did}", pct) for did, pct in self.discounts
+        ))
+
+        item_ids = self.ids("InventoryItem", "item_id", 300)
+        self.inventory = {cat: [] for cat in INVENTORY_CATEGORIES}
+        rows = []
+        for iid in item_ids:
+            category = rng.choice(INVENTORY_CATEGORIES)
+            self.inventory[category].append(iid)
+            rows.append((iid, f"Item {iid}", rng.choice(["kg", "litre", "unit", "bottle"]), rng.randrange(0, 500),
+                         rng.randrange(0, 100), category))
+        self.add("InventoryItem", ["item_id", "item_name", "unit", "current_quantity", "par_level", "category"], rows)
+
+        # Each dish draws on a few inventory items, so orders deplete stock
+        self.add("Recipe", ["menu_item_id", "item_id", "quantity"], (
+            (mid, iid, round(rng.uniform(0.05, 0.5), 3))
+            for mid, _ in self.menu for iid in rng.sample(item_ids, rng.randint(2, 5))
+        ))
+
+        supplier_ids = self.ids("Supplier", "supplier_id", 30)
+        self.suppliers = [(sid, rng.choice(INVENTORY_CATEGORIES)) for sid in supplier_ids]
+        self.add("Supplier", ["supplier_id", "name", "phone", "category"], (
+            (sid, f"Supplier {sid}", phone(rng), category) for sid, category in self.suppliers
+        ))
+
+    # ---- orders, with their details, invoices and payments ----
+    def sales(self):
+        rng = self.rng
+        order_ids = self.ids("`Order`", "order_id", self.orders)
+        with db_cursor() as cursor:
+            detail_id = next_id(cursor, "OrderDetail", "order_detail_id")
+            invoice_id = next_id(cursor, "Invoice", "invoice_id")
+            payment_id = next_id(cursor, "Payment", "payment_id")
+
+        for start in range(0, self.orders, BATCH_SIZE):
+            orders, details, invoices, payments = [], [], [], []
+            for order_id in order_ids[start:start + BATCH_SIZE]:
+                order_time = busy_time(rng, self.day())
+                cancelled = rng.random() < 0.03
+                orders.append((order_id, rng.choice(self.staff_ids), rng.choice(self.customer_ids),
+                               order_time, "Cancelled" if cancelled else "Placed"))
+                total = 0
+                for menu_item_id, price in rng.sample(self.menu, rng.randint(1, 6)):
+                    qty = rng.randint(1, 4)
+                    details.append((detail_id, order_id, menu_item_id, qty, price))
+                    detail_id += 1
+                    total += qty * price
+                discount_id = None
+                if rng.random() < 0.1:
+                    discount_id, pct = rng.choice(self.discounts)
+                    total = round(total * (1 - pct / 100), 2)
+                invoices.append((invoice_id, order_id, total, discount_id, order_time))
+                if not cancelled:
+                    payments.append((payment_id, invoice_id, total, rng.choice(["Cash", "UPI"]), order_time))
+                    payment_id += 1
+                invoice_id += 1
+
+            with db_cursor() as cursor:
+                insert_rows(cursor, "`Order`", ["order_id", "staff_id", "customer_id", "order_time", "status"], orders)
+                insert_rows(cursor, "OrderDetail", ["order_detail_id", "order_id", "menu_item_id", "quantity", "price"], details)
+                insert_rows(cursor, "Invoice", ["invoice_id", "order_id", "total_amount", "discount_id", "created_at"], invoices)
+                insert_rows(cursor, "Payment", ["payment_id", "invoice_id", "amount_paid", "payment_method", "payment_date"], payments)
+            for table, rows in [("Order", orders), ("OrderDetail", details), ("Invoice", invoices), ("Payment", payments)]:
+                self.counts[table] = self.counts.get(table, 0) + len(rows)
+            print(f"  orders: {min(start + BATCH_SIZE, self.orders)}/{self.orders}", file=sys.stderr)
+
+    # ---- reservations, events, purchases, shifts ----
+    def bookings(self):
+        rng = self.rng
+        taken = set()
+        reservation_count = max(10, self.orders // 10)
+        reservation_ids = self.ids("Reservation", "reservation_id", reservation_count)
+
+        def reservations():
+            for rid in reservation_ids:
+                for _ in range(10):
+                    key = (self.day(), rng.choice(self.table_ids), rng.choice(TIME_SLOTS))
+                    if key not in taken:
+                        break
+                taken.add(key)
+                day, table_id, slot = key
+                start, end = slot_bounds(slot)
+                yield (rid, rng.choice(self.customer_ids), table_id, day, slot, start, end,
+                       rng.randint(1, 8), "Cancelled" if rng.random() < 0.08 else "Reserved")
+        self.add("Reservation", ["reservation_id", "customer_id", "table_id", "reservation_date", "time_slot",
+                                 "start_time", "end_time", "guest_count", "status"], reservations())
+
+        event_ids = list(self.ids("Event", "event_id", max(5, self.orders // 1000)))
+        events = []
+        for eid in event_ids:
+            start_hour = rng.randint(10, 19)
+            events.append((eid, f"Event {eid}", self.day(), datetime.time(start_hour), datetime.time(start_hour + rng.randint(2, 4)),
+                           rng.choice(LOCATIONS), rng.choice(self.staff_ids)))
+        self.add("Event", ["event_id", "event_name", "event_date", "start_time", "end_time", "location", "created_by_staff_id"], events)
+        self.add("EventBooking", ["event_id", "customer_id", "booking_date", "guest_count"], (
+            (eid, rng.choice(self.customer_ids), event_date - datetime.timedelta(days=rng.randint(1, 60)), rng.randint(10, 200))
+            for eid, _, event_date, *_ in events
+        ))
+
+        purchase_ids = self.ids("Purchase", "purchase_id", self.days * 3)
+        purchases, details = [], []
+        for pid in purchase_ids:
+            supplier_id, category = rng.choice(self.suppliers)
+            items = self.inventory[category] or [i for ids in self.inventory.values() for i in ids]
+            total = 0
+            for item_id in rng.sample(items, min(len(items), rng.randint(1, 8))):
+                qty, price = rng.randint(1, 50), rng.randint(10, 500)
+                details.append((pid, item_id, qty, price))
+                total += qty * price
+            purchases.append((pid, supplier_id, rng.choice(self.staff_ids), self.day(),
+                              rng.choice(["Ordered", "Received", "Received", "Cancelled"]), total))
+        self.add("Purchase", ["purchase_id", "supplier_id", "staff_id", "purchase_date", "status", "total_amount"], purchases)
+        self.add("PurchaseDetail", ["purchase_id", "item_id", "quantity", "price_per_unit"], details)
+
+        def shifts():
+            for offset in range(self.days):
+                day = self.start_date + datetime.timedelta(days=offset)
+                for staff_id in self.staff_ids:
+                    start_hour = rng.choice([7, 9, 11, 14])
+                    yield (staff_id, day, datetime.time(start_hour), datetime.time(start_hour + 8))
+        self.add("ShiftSchedule", ["staff_id", "shift_date", "start_time", "end_time"], shifts())
+
+    # Refresh optimizer statistics after the bulk load so plans match the new sizes
+    def analyze(self):
+        with db_cursor() as cursor:
+            if backend.name == "sqlite":
+                cursor.execute("ANALYZE")
+            else:
+                cursor.execute("ANALYZE TABLE " + ", ".join(f"`{table}`" for table in self.counts))
+                cursor.fetchall()
+
+    def run(self):
+        self.reference()
+        self.sales()
+        self.bookings()
+        # Generated orders bypass order_service, so roll them up in one pass
+        rebuild_sales(self.start_date, self.end_date)
+        # Tables and reservations were written around reservation_service too
+        availability.clear()
+        self.analyze()
+        return self.counts
+
+
+def record_dataset(**params):
+    datasets = read_datasets()
+    datasets[backend.describe()] = dict(params, generated_at=datetime.datetime.now().isoformat(timespec="seconds"))
+    with open(DATASET_FILE, "w") as f:
+        json.dump(datasets, f, indent=2)
+
+def read_datasets():
+    if not os.path.exists(DATASET_FILE):
+        return {}
+    with open(DATASET_FILE) as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fill the database with synthetic restaurant data")
+    parser.add_argument("--orders", type=int, default=100000, help="number of orders to generate (other tables scale with it)")
+    parser.add_argument("--days", type=int, default=365, help="days of history ending on --end-date")
+    parser.add_argument("--end-date", type=datetime.date.fromisoformat, default=datetime.date.today(),
+                        help="last day of history, YYYY-MM-DD (default today); fix it to rebuild the same data later")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--force", action="store_true", help="allow writing to the default database")
+    args = parser.parse_args(argv)
+
+    if DB_BACKEND == "mysql" and DB_NAME == "fdbproject" and not args.force:
+        parser.error("refusing to fill the default database; set RESTAURANT_DB_NAME or pass --force")
+    if DB_BACKEND == "sqlite" and DB_PATH == "restaurant.db" and not args.force:
+        parser.error("refusing to fill the default database; set RESTAURANT_DB_PATH or pass --force")
+
+    counts = Generator(args.orders, args.days, args.seed, args.end_date).run()
+    record_dataset(orders=args.orders, days=args.days, seed=args.seed, end_date=args.end_date.isoformat())
+    for table, count in sorted(counts.items()):
+        print(f"{table:15} {count:>10}")
+
+if __name__ == "__main__":
+    main()
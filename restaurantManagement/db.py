@@ -1,25 +1,331 @@
-import mysql.connector
+import logging
+import queue
+import threading
+import time
+import traceback
 from contextlib import contextmanager
-from config import DB_HOST, DB_USER, DB_PASSWORD, DB_NAME
+from config import DB_BACKEND
+from config import DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_POOL_PING_AFTER, DB_POOL_POLL, DEV_MODE
+from db_backends import get_backend
+from metrics import TimedCursor
+
+logger = logging.getLogger(__name__)
+
+backend = get_backend(DB_BACKEND)
 
 def get_db_connection():
-    return mysql.connector.connect(
-        host=DB_HOST,
-        user=DB_USER,
-        password=DB_PASSWORD,
-        database=DB_NAME
-    )
+    return backend.connect()
+
+
+# ------------------ CONNECTION POOL ------------------
+class ConnectionPool:
+    def __init__(self, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT, ping_after=DB_POOL_PING_AFTER):
+        self.size = size
+        self.timeout = timeout
+        self.ping_after = ping_after
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._checked_out = {}
+        self._stats = {"checkouts": 0, "waits": 0, "reconnects": 0, "created": 0, "discarded": 0}
+
+    def _bump(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _open(self):
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            self._created += 1
+        try:
+            conn = get_db_connection()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+        self._bump("created")
+        return conn
+
+    def _discard(self, conn):
+        with self._lock:
+            self._created -= 1
+            self._stats["discarded"] += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    # (conn, idle_since): an idle connection, else a new one while under size,
+    # else the next one released. A discarded connection frees room without
+    # putting anything on _idle, so a waiter re-checks _open() every DB_POOL_POLL.
+    def _next(self, deadline):
+        waited = False
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            conn = self._open()
+            if conn is not None:
+                return conn, None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise backend.PoolError(
+                    f"No free connection after {self.timeout}s (pool size {self.size})"
+                )
+            if not waited:
+                self._bump("waits")
+                waited = True
+            try:
+                return self._idle.get(timeout=min(remaining, DB_POOL_POLL))
+            except queue.Empty:
+                pass
+
+    def acquire(self, label=None):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            conn, idle_since = self._next(deadline)
+            # Health check: only ping connections that sat idle long enough to go stale
+            if idle_since is None or time.monotonic() - idle_since <= self.ping_after:
+                break
+            try:
+                if not conn.is_connected():
+                    conn.reconnect(attempts=2, delay=0)
+                    self._bump("reconnects")
+                break
+            except Exception:
+                # Dead for good: drop it and take the next idle one or open a fresh one
+                logger.warning("Discarding a pooled connection that could not reconnect", exc_info=True)
+                self._discard(conn)
+
+        self._bump("checkouts")
+        if DEV_MODE:
+            if label is None:
+                frame = traceback.extract_stack(limit=4)[0]
+                label = f"{frame.filename}:{frame.lineno} ({frame.name})"
+            with self._lock:
+                self._checked_out[id(conn)] = (label, time.monotonic())
+        return conn
+
+    def release(self, conn):
+        if DEV_MODE:
+            with self._lock:
+                self._checked_out.pop(id(conn), None)
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except Exception:
+            self._discard(conn)
+            return
+        self._idle.put((conn, time.monotonic()))
+
+    def leaks(self):
+        now = time.monotonic()
+        with self._lock:
+            return [(label, now - since) for label, since in self._checked_out.values()]
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["open"] = self._created
+        stats["idle"] = self._idle.qsize()
+        stats["in_use"] = stats["open"] - stats["idle"]
+        return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = ConnectionPool()
+                if backend.embedded:
+                    # An embedded database is created and migrated on first use;
+                    # other threads wait on the lock until the schema is in place
+                    from migrate import run_migrations
+                    run_migrations(pool)
+                _pool = pool
+    return _pool
+
+def pool_stats():
+    return get_pool().stats()
+
+# Any connection still checked out when this runs (end of a rerun) outlived its scope
+def report_leaks():
+    if not DEV_MODE or _pool is None:
+        return []
+    leaks = _pool.leaks()
+    for label, held_for in leaks:
+        logger.warning("DB connection leaked: acquired at %s, held for %.1fs", label, held_for)
+    return leaks
+
+
+# Streamlit raises these to rerun or stop a page; they are not failures.
+# They subclass BaseException, so the scopes below catch BaseException.
+SCRIPT_CONTROL = ("RerunException", "StopException")
 
+def is_script_control(e):
+    return type(e).__name__ in SCRIPT_CONTROL
+
+# Unit of work active on this thread, if any (see unit_of_work below)
+_local = threading.local()
+
+# ---- after-commit callbacks ----
+# One list per open transaction scope on this thread, innermost last
+def _pending():
+    stack = getattr(_local, "pending", None)
+    if stack is None:
+        stack = _local.pending = []
+    return stack
+
+# Runs callback once the enclosing db_cursor() or unit of work has committed
+# (right away outside one), and drops it if that rolls back. For cache upkeep,
+# so no other session can load rows that are not committed yet.
+def after_commit(callback):
+    stack = _pending()
+    if stack:
+        stack[-1].append(callback)
+    else:
+        callback()
+
+def _run_callbacks(callbacks):
+    for callback in callbacks:
+        callback()
+
+# pool: only for code that runs before the shared pool is published (migrations)
 @contextmanager
-def db_cursor():
-    conn = get_db_connection()
-    cursor = conn.cursor()
+def db_cursor(pool=None):
+    uow = getattr(_local, "uow", None)
+    if uow is not None:
+        # Inside a unit of work, borrow its connection instead of checking out
+        # another; the unit of work owns the transaction
+        with uow.savepoint() as cursor:
+            yield cursor
+        return
+    pool = pool or get_pool()
+    conn = pool.acquire()
+    cursor = TimedCursor(conn.cursor())
+    callbacks = []
+    _pending().append(callbacks)
+    committed = False
     try:
         yield cursor
         conn.commit()
-    except Exception as e:
-        conn.rollback()
+        committed = True
+    except BaseException as e:
+        if is_script_control(e):
+            conn.commit()
+            committed = True
+        else:
+            conn.rollback()
         raise e
     finally:
+        _pending().pop()
         cursor.close()
-        conn.close()
+        pool.release(conn)
+        if committed:
+            _run_callbacks(callbacks)
+
+
+# ------------------ UNIT OF WORK ------------------
+# One pooled connection shared by every cursor opened inside the scope,
+# including db_cursor() calls made by code running within it.
+# Commits on success, rolls back on error and always returns the connection.
+# Each db_cursor() block inside it is a savepoint: a block that fails undoes
+# only its own statements (the page may catch the error and carry on), and
+# nothing is committed before the scope ends.
+class UnitOfWork:
+    def __init__(self, conn):
+        self.conn = conn
+        self._cursors = []
+        self._depth = 0
+        self.closed = False
+
+    def cursor(self):
+        if self.closed:
+            raise RuntimeError("Unit of work has already released its connection")
+        cursor = TimedCursor(self.conn.cursor())
+        self._cursors.append(cursor)
+        return cursor
+
+    @contextmanager
+    def savepoint(self):
+        cursor = self.cursor()
+        control = self.conn.cursor()   # untimed, so savepoints stay out of the query stats
+        self._depth += 1
+        name = f"uow_{self._depth}"
+        callbacks = []
+        _pending().append(callbacks)
+        kept = False
+        try:
+            control.execute(f"SAVEPOINT {name}")
+            yield cursor
+            control.execute(f"RELEASE SAVEPOINT {name}")
+            kept = True
+        except BaseException as e:
+            kept = is_script_control(e)
+            if not kept:
+                control.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            control.execute(f"RELEASE SAVEPOINT {name}")
+            raise e
+        finally:
+            _pending().pop()
+            # a kept block's callbacks wait for the unit of work's commit
+            if kept:
+                _pending()[-1].extend(callbacks)
+            self._depth -= 1
+            control.close()
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def close(self):
+        for cursor in self._cursors:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        self._cursors = []
+        self.closed = True
+
+
+@contextmanager
+def unit_of_work(label=None):
+    outer = getattr(_local, "uow", None)
+    if outer is not None:
+        yield outer
+        return
+    pool = get_pool()
+    conn = pool.acquire(label)
+    uow = UnitOfWork(conn)
+    _local.uow = uow
+    callbacks = []
+    _pending().append(callbacks)
+    committed = False
+    try:
+        backend.begin(conn)
+        yield uow
+        conn.commit()
+        committed = True
+    except BaseException as e:
+        # st.rerun() / st.stop() end the script run early; the work before them stands
+        if is_script_control(e):
+            conn.commit()
+            committed = True
+        else:
+            conn.rollback()
+        raise e
+    finally:
+        _local.uow = None
+        _pending().pop()
+        uow.close()
+        pool.release(conn)
+        if committed:
+            _run_callbacks(callbacks)
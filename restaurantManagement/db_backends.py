@@ -0,0 +1,206 @@
+import datetime
+import decimal
+import functools
+import re
+import sqlite3
+from config import DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, DB_PATH
+
+# ------------------ DATABASE BACKENDS ------------------
+# The app's SQL is written for MySQL (backtick-quoted `Order`/`Table`, %s
+# placeholders, CURDATE()/NOW()). Each backend opens DB-API connections that
+# accept that SQL and return the same Python types mysql.connector does.
+
+def _insert_sql(table, columns):
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+
+
+class MySQLBackend:
+    name = "mysql"
+    embedded = False
+
+    def __init__(self):
+        import mysql.connector
+        self._connector = mysql.connector
+        self.PoolError = mysql.connector.errors.PoolError
+
+    def connect(self):
+        return self._connector.connect(
+            host=DB_HOST,
+            user=DB_USER,
+            password=DB_PASSWORD,
+            database=DB_NAME
+        )
+
+    # autocommit is off, so the first statement opens the transaction
+    def begin(self, conn):
+        pass
+
+    def describe(self):
+        return f"mysql://{DB_USER}@{DB_HOST}/{DB_NAME}"
+
+    # Locks the matching rows (and under REPEATABLE READ the index gap around
+    # them, so no new match can be inserted) until the transaction ends
+    def lock_rows(self, cursor, table, column, value):
+        cursor.execute(f"SELECT {column} FROM {table} WHERE {column} = %s FOR UPDATE", (value,))
+        cursor.fetchall()
+
+    # INSERT that adds the value columns onto an existing row with the same key
+    def accumulate_sql(self, table, keys, values):
+        updates = ", ".join(f"{v} = {v} + VALUES({v})" for v in values)
+        return f"{_insert_sql(table, keys + values)} ON DUPLICATE KEY UPDATE {updates}"
+
+
+# ---- SQLite: type mapping ----
+# Stored as the same text MySQL prints; read back through the declared column type
+def _time_text(value):
+    if isinstance(value, datetime.timedelta):
+        seconds = int(value.total_seconds())
+        return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return value.strftime("%H:%M:%S")
+
+# mysql.connector returns TIME as timedelta, so SQLite does too
+def _parse_time(raw):
+    parts = raw.decode().split(":")
+    hours, minutes = int(parts[0]), int(parts[1])
+    seconds = float(parts[2]) if len(parts) > 2 else 0
+    return datetime.timedelta(hours=hours, minutes=minutes, seconds=seconds)
+
+sqlite3.register_adapter(decimal.Decimal, str)
+sqlite3.register_adapter(datetime.date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime.datetime, lambda d: d.isoformat(" ", "seconds"))
+sqlite3.register_adapter(datetime.time, _time_text)
+sqlite3.register_adapter(datetime.timedelta, _time_text)
+sqlite3.register_converter("DATE", lambda raw: datetime.date.fromisoformat(raw.decode()[:10]))
+sqlite3.register_converter("DATETIME", lambda raw: datetime.datetime.fromisoformat(raw.decode()))
+sqlite3.register_converter("TIMESTAMP", lambda raw: datetime.datetime.fromisoformat(raw.decode()))
+sqlite3.register_converter("TIME", _parse_time)
+sqlite3.register_converter("DECIMAL", lambda raw: decimal.Decimal(raw.decode()))
+
+# ---- SQLite: dialect ----
+_CURDATE = re.compile(r"\bCURDATE\(\)", re.IGNORECASE)
+_NOW = re.compile(r"\bNOW\(\)", re.IGNORECASE)
+
+@functools.lru_cache(maxsize=512)
+def translate(sql):
+    sql = sql.replace("`", '"').replace("%s", "?")
+    sql = _CURDATE.sub("DATE('now', 'localtime')", sql)
+    return _NOW.sub("DATETIME('now', 'localtime')", sql)
+
+# The schema has no REAL columns, so a float can only be an aggregate over DECIMALs
+def _row(row):
+    if row is None or not any(type(v) is float for v in row):
+        return row
+    return tuple(decimal.Decimal(repr(v)) if type(v) is float else v for v in row)
+
+
+class SQLiteCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(translate(sql), tuple(params or ()))
+
+    def executemany(self, sql, seq_of_params):
+        self._cursor.executemany(translate(sql), seq_of_params)
+
+    def fetchone(self):
+        return _row(self._cursor.fetchone())
+
+    def fetchmany(self, size=None):
+        rows = self._cursor.fetchmany(size) if size else self._cursor.fetchmany()
+        return [_row(r) for r in rows]
+
+    def fetchall(self):
+        return [_row(r) for r in self._cursor.fetchall()]
+
+    def __iter__(self):
+        return (_row(r) for r in self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class SQLiteConnection:
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self.reconnect()
+
+    def reconnect(self, attempts=1, delay=0):
+        self._conn = sqlite3.connect(
+            self.path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,  # pooled connections move between threads
+            timeout=10,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+
+    def is_connected(self):
+        try:
+            self._conn.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    @property
+    def in_transaction(self):
+        return self._conn.in_transaction
+
+    def cursor(self):
+        return SQLiteCursor(self._conn.cursor())
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        # Refresh planner statistics the connection noticed were stale
+        self._conn.execute("PRAGMA optimize")
+        self._conn.close()
+
+
+class SQLitePoolError(sqlite3.Error):
+    pass
+
+
+class SQLiteBackend:
+    name = "sqlite"
+    embedded = True
+    PoolError = SQLitePoolError
+
+    def connect(self):
+        return SQLiteConnection(DB_PATH)
+
+    def describe(self):
+        return f"sqlite:///{DB_PATH}"
+
+    # sqlite3 only opens a transaction before DML, and a SAVEPOINT outside one
+    # would commit on RELEASE, so a unit of work opens it explicitly
+    def begin(self, conn):
+        if not conn.in_transaction:
+            conn.cursor().execute("BEGIN")
+
+    # SQLite has no row locks: one writer holds the whole database. Taking the
+    # write lock up front (and a write that changes nothing inside an open
+    # transaction) means the checks that follow see every committed booking.
+    def lock_rows(self, cursor, table, column, value):
+        if not cursor.connection.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute(f"UPDATE {table} SET {column} = {column} WHERE {column} = %s", (value,))
+
+    def accumulate_sql(self, table, keys, values):
+        updates = ", ".join(f"{v} = {v} + excluded.{v}" for v in values)
+        return f"{_insert_sql(table, keys + values)} ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates}"
+
+
+BACKENDS = {"mysql": MySQLBackend, "sqlite": SQLiteBackend}
+
+def get_backend(name):
+    try:
+        return BACKENDS[name.lower()]()
+    except KeyError:
+        raise ValueError(f"Unknown database backend {name!r} (expected one of: {', '.join(BACKENDS)})")
@@ -0,0 +1,189 @@
+import datetime
+import threading
+import time
+from collections import defaultdict
+from db import db_cursor
+from availability import DAY_MINUTES, minutes_of
+from config import EVENT_INDEX_TTL
+
+# ------------------ EVENT CONFLICT INDEX ------------------
+# Answers "which events hold this location on date D between these times"
+# from memory. A date's events are loaded in one query the first time it is
+# asked about (and again after EVENT_INDEX_TTL, for bookings made by other
+# processes), then kept current by event_service. Each location and date has
+# its own interval tree, so a lookup never looks at other halls or days.
+
+def location_key(location):
+    return " ".join((location or "").split()).casefold()
+
+# TIME values in minutes; an end at or before the start runs to midnight
+def window(start_time, end_time):
+    start, end = minutes_of(start_time), minutes_of(end_time)
+    return start, end if end > start else DAY_MINUTES
+
+def window_text(start, end):
+    return f"{start // 60:02d}:{start % 60:02d}-{end // 60:02d}:{end % 60:02d}"
+
+
+# Intervals sorted by start, read as an implicit balanced tree (the middle of
+# each range is its root) where every node also keeps the latest end in its
+# subtree. A query skips subtrees that end before the window opens and stops
+# at nodes starting after it closes: O(log n + matches). Rebuilt on change,
+# which is cheap at the size of one hall's day.
+class IntervalTree:
+    def __init__(self, intervals):
+        self._items = sorted(intervals)      # [(start, end, key)]
+        self._max_end = [0] * len(self._items)
+        self._build(0, len(self._items) - 1)
+
+    def _build(self, lo, hi):
+        if lo > hi:
+            return 0
+        mid = (lo + hi) // 2
+        self._max_end[mid] = max(self._items[mid][1], self._build(lo, mid - 1), self._build(mid + 1, hi))
+        return self._max_end[mid]
+
+    def _search(self, lo, hi, start, end, found):
+        if lo > hi:
+            return
+        mid = (lo + hi) // 2
+        if self._max_end[mid] <= start:
+            return
+        self._search(lo, mid - 1, start, end, found)
+        s, e, key = self._items[mid]
+        if s >= end:
+            return
+        if e > start:
+            found.append((s, e, key))
+        self._search(mid + 1, hi, start, end, found)
+
+    # [(start, end, key)] for every interval overlapping [start, end)
+    def overlapping(self, start, end):
+        found = []
+        self._search(0, len(self._items) - 1, start, end, found)
+        return found
+
+
+class EventIndex:
+    def __init__(self, ttl=EVENT_INDEX_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._days = {}     # date -> (loaded_at, {location_key: {event_id: (start, end)}})
+        self._events = {}   # event_id -> (date, location_key, start, end, event_name)
+        self._trees = {}    # (date, location_key) -> IntervalTree, built on first lookup
+
+    # ---- loading ----
+    # One query for every stale date in the list; cursor reads inside the caller's transaction
+    def _load(self, days, cursor=None, force=False):
+        now = time.monotonic()
+        stale = sorted({d for d in days if force or d not in self._days or now - self._days[d][0] > self.ttl})
+        if not stale:
+            return
+        query = """
+            SELECT event_id, event_name, location, event_date, start_time, end_time
+            FROM Event
+            WHERE event_date BETWEEN %s AND %s
+        """
+        if cursor is not None:
+            cursor.execute(query, (stale[0], stale[-1]))
+            rows = cursor.fetchall()
+        else:
+            with db_cursor() as cursor:
+                cursor.execute(query, (stale[0], stale[-1]))
+                rows = cursor.fetchall()
+
+        # Everything between the first and last stale date was read, so all of it is current
+        first, last = stale[0], stale[-1]
+        for event_id in [eid for eid, (d, *_) in self._events.items() if first <= d <= last]:
+            del self._events[event_id]
+        for offset in range((last - first).days + 1):
+            day = first + datetime.timedelta(days=offset)
+            self._days[day] = (now, defaultdict(dict))
+        self._trees = {key: tree for key, tree in self._trees.items() if not first <= key[0] <= last}
+        for event_id, event_name, location, event_date, start_time, end_time in rows:
+            self._insert(event_id, event_name, location_key(location), event_date, *window(start_time, end_time))
+
+    def _insert(self, event_id, event_name, key, day, start, end):
+        self._days[day][1][key][event_id] = (start, end)
+        self._events[event_id] = (day, key, start, end, event_name)
+        self._trees.pop((day, key), None)
+
+    def _remove(self, event_id):
+        entry = self._events.pop(event_id, None)
+        if entry is None:
+            return
+        day, key = entry[:2]
+        if day in self._days:
+            self._days[day][1][key].pop(event_id, None)
+        self._trees.pop((day, key), None)
+
+    def _tree(self, day, key):
+        tree = self._trees.get((day, key))
+        if tree is None:
+            events = self._days[day][1].get(key, {})
+            tree = self._trees[(day, key)] = IntervalTree(
+                [(start, end, event_id) for event_id, (start, end) in events.items()]
+            )
+        return tree
+
+    def _overlapping(self, key, day, start, end, ignore=None):
+        return [
+            (event_id, self._events[event_id][4], s, e)
+            for s, e, event_id in self._tree(day, key).overlapping(start, end)
+            if event_id != ignore
+        ]
+
+    # ---- queries ----
+    # [(event_id, event_name, start_minute, end_minute)] holding the location during the window.
+    # With a cursor the date is re-read inside the caller's transaction first.
+    def conflicts(self, location, day, start_time, end_time, ignore_event=None, cursor=None):
+        start, end = window(start_time, end_time)
+        with self._lock:
+            self._load([day], cursor, force=cursor is not None)
+            return self._overlapping(location_key(location), day, start, end, ignore_event)
+
+    # bookings: [(location, date, start_time, end_time), ...], e.g. a season of
+    # recurring events. Every date is loaded in one query, and each booking is
+    # checked against existing events and against the other bookings in the list.
+    # Returns [(position, [(event_id or None, event_name, start_minute, end_minute)])]
+    # for the bookings that clash; event_id None is another booking of the list.
+    def check_bookings(self, bookings, cursor=None):
+        windows = [(location_key(loc), day, *window(s, e)) for loc, day, s, e in bookings]
+        batch = defaultdict(list)
+        for position, (key, day, start, end) in enumerate(windows):
+            batch[(key, day)].append((start, end, position))
+        batch_trees = {group: IntervalTree(intervals) for group, intervals in batch.items()}
+
+        clashes = []
+        with self._lock:
+            self._load([day for _, day, _, _ in windows], cursor, force=cursor is not None)
+            for position, (key, day, start, end) in enumerate(windows):
+                found = self._overlapping(key, day, start, end)
+                found += [
+                    (None, f"booking {other + 1} of this batch", s, e)
+                    for s, e, other in batch_trees[(key, day)].overlapping(start, end)
+                    if other != position
+                ]
+                if found:
+                    clashes.append((position, found))
+        return clashes
+
+    # ---- incremental maintenance (called after the write has committed) ----
+    def add(self, event_id, event_name, location, day, start_time, end_time):
+        with self._lock:
+            self._remove(event_id)
+            if day in self._days:
+                self._insert(event_id, event_name, location_key(location), day, *window(start_time, end_time))
+
+    def remove(self, event_id):
+        with self._lock:
+            self._remove(event_id)
+
+    def clear(self):
+        with self._lock:
+            self._days.clear()
+            self._events.clear()
+            self._trees.clear()
+
+
+event_index = EventIndex()
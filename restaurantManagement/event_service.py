@@ -0,0 +1,136 @@
+import datetime
+from db import db_cursor, backend
+from records import EventBooking, Event, EventDetail
+from customer_service import upsert_customer
+from event_index import event_index, window_text
+
+EVENT_BOOKINGS = """
+    SELECT e.event_name, e.location, e.event_date, e.start_time, e.end_time, c.name, eb.guest_count, s.name
+    FROM Event e
+    JOIN EventBooking eb ON e.event_id = eb.event_id
+    JOIN Customer c ON eb.customer_id = c.customer_id
+    LEFT JOIN Staff s ON e.created_by_staff_id = s.staff_id
+    WHERE e.event_date BETWEEN %s AND %s
+    ORDER BY e.event_date
+"""
+
+# (event_name, location, event_date, start_time, end_time, customer_name, guest_count, booked_by)
+def list_event_bookings(start_date, end_date=None):
+    with db_cursor() as cursor:
+        cursor.execute(EVENT_BOOKINGS, (start_date, end_date or start_date))
+        return EventBooking.from_rows(cursor.fetchall())
+
+def events_on(event_date):
+    with db_cursor() as cursor:
+        cursor.execute("""
+            SELECT event_id, event_name, location, start_time, end_time
+            FROM Event
+            WHERE event_date = %s
+        """, (event_date,))
+        return Event.from_rows(cursor.fetchall())
+
+def get_event(event_id):
+    with db_cursor() as cursor:
+        cursor.execute("""
+            SELECT event_name, location, start_time, end_time FROM Event WHERE event_id = %s
+        """, (event_id,))
+        row = cursor.fetchone()
+        return EventDetail.from_row(row) if row else None
+
+# ------------------ WRITES ------------------
+def clash_message(location, day, clashes):
+    held = ", ".join(f"{name} ({window_text(start, end)})" for _, name, start, end in clashes)
+    return f"{location} is already booked on {day}: {held}"
+
+def check_times(start_time, end_time):
+    if end_time <= start_time:
+        raise ValueError("Event must end after it starts")
+
+def insert_event(cursor, staff_id, customer_id, event_name, location, event_date, start_time, end_time, guest_count):
+    cursor.execute("""
+        INSERT INTO Event (event_name, event_date, start_time, end_time, location, created_by_staff_id)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """, (event_name, event_date, start_time.strftime("%H:%M:%S"), end_time.strftime("%H:%M:%S"), location, staff_id))
+    event_id = cursor.lastrowid
+
+    cursor.execute("""
+        INSERT INTO EventBooking (event_id, customer_id, booking_date, guest_count)
+        VALUES (%s, %s, CURDATE(), %s)
+    """, (event_id, customer_id, guest_count))
+    return event_id
+
+def book_event(staff_id, customer_name, phone, event_name, location, event_date, start_time, end_time, guest_count):
+    check_times(start_time, end_time)
+    with db_cursor() as cursor:
+        # Locations are free text with no row of their own, so the day's events
+        # are locked instead; held until commit, so two bookings cannot both pass the check
+        backend.lock_rows(cursor, "Event", "event_date", event_date)
+        clashes = event_index.conflicts(location, event_date, start_time, end_time, cursor=cursor)
+        if clashes:
+            raise ValueError(clash_message(location, event_date, clashes))
+        customer_id = upsert_customer(cursor, customer_name, phone)
+        event_id = insert_event(cursor, staff_id, customer_id, event_name, location, event_date,
+                                start_time, end_time, guest_count)
+    event_index.add(event_id, event_name, location, event_date, start_time, end_time)
+    return event_id
+
+def update_event(event_id, event_name, location, start_time, end_time):
+    check_times(start_time, end_time)
+    with db_cursor() as cursor:
+        cursor.execute("SELECT event_date FROM Event WHERE event_id = %s", (event_id,))
+        row = cursor.fetchone()
+        if row is None:
+            raise ValueError(f"Event #{event_id} does not exist")
+        event_date = row[0]
+        backend.lock_rows(cursor, "Event", "event_date", event_date)
+        clashes = event_index.conflicts(location, event_date, start_time, end_time, event_id, cursor=cursor)
+        if clashes:
+            raise ValueError(clash_message(location, event_date, clashes))
+        cursor.execute("""
+            UPDATE Event
+            SET event_name = %s, location = %s, start_time = %s, end_time = %s
+            WHERE event_id = %s
+        """, (event_name, location, start_time.strftime("%H:%M:%S"), end_time.strftime("%H:%M:%S"), event_id))
+    event_index.add(event_id, event_name, location, event_date, start_time, end_time)
+
+def delete_event(event_id):
+    with db_cursor() as cursor:
+        cursor.execute("DELETE FROM EventBooking WHERE event_id = %s", (event_id,))
+        cursor.execute("DELETE FROM Event WHERE event_id = %s", (event_id,))
+    event_index.remove(event_id)
+
+
+# ------------------ RECURRING SEASONS ------------------
+# Every date from first_date to last_date, every_weeks weeks apart
+def season_dates(first_date, last_date, every_weeks=1):
+    step = datetime.timedelta(weeks=every_weeks)
+    dates, day = [], first_date
+    while day <= last_date:
+        dates.append(day)
+        day += step
+    return dates
+
+# [(event_date, message)] for each date of the season that cannot be booked
+def check_season(location, dates, start_time, end_time, cursor=None):
+    clashes = event_index.check_bookings([(location, day, start_time, end_time) for day in dates], cursor)
+    return [(dates[position], clash_message(location, dates[position], found)) for position, found in clashes]
+
+# The same event on every date, booked all together or not at all
+def book_season(staff_id, customer_name, phone, event_name, location, dates, start_time, end_time, guest_count):
+    check_times(start_time, end_time)
+    if not dates:
+        raise ValueError("The season has no dates")
+    with db_cursor() as cursor:
+        for day in sorted(set(dates)):
+            backend.lock_rows(cursor, "Event", "event_date", day)
+        clashes = check_season(location, dates, start_time, end_time, cursor)
+        if clashes:
+            raise ValueError("; ".join(message for _, message in clashes))
+        customer_id = upsert_customer(cursor, customer_name, phone)
+        event_ids = [
+            insert_event(cursor, staff_id, customer_id, event_name, location, day, start_time, end_time, guest_count)
+            for day in dates
+        ]
+    for event_id, day in zip(event_ids, dates):
+        event_index.add(event_id, event_name, location, day, start_time, end_time)
+    return event_ids
@@ -0,0 +1,161 @@
+import argparse
+import csv
+import datetime
+import decimal
+import os
+import sys
+from db import db_cursor
+from utils import day_range
+from config import EXPORT_DIR, EXPORT_CHUNK_ROWS
+
+# ------------------ EXPORTS ------------------
+# Month-end (or multi-year) extracts of the order tables for accounting.
+# Rows are streamed: mysql.connector cursors are unbuffered unless asked
+# otherwise and SQLite cursors step through the result, so each fetchmany
+# pulls the next EXPORT_CHUNK_ROWS rows off the connection and they are
+# written out before the next chunk is read. Memory use is one chunk,
+# whatever the date range.
+#
+# Orders, their lines and invoices are selected by order time; payments by
+# the day they were received.
+
+ORDER_RANGE = "o.order_time >= %s AND o.order_time < %s"
+
+# name -> ([(column, kind)], query); kind picks the Parquet type
+EXPORTS = {
+    "orders": ([
+        ("order_id", "int"), ("order_time", "datetime"), ("status", "text"), ("staff_id", "int"),
+        ("customer_id", "int"), ("customer_name", "text"), ("customer_phone", "text"),
+    ], f"""
+        SELECT o.order_id, o.order_time, o.status, o.staff_id, o.customer_id, c.name, c.phone
+        FROM `Order` o
+        JOIN Customer c ON o.customer_id = c.customer_id
+        WHERE {ORDER_RANGE}
+        ORDER BY o.order_id
+    """),
+    "order_details": ([
+        ("order_detail_id", "int"), ("order_id", "int"), ("menu_item_id", "int"), ("item_name", "text"),
+        ("quantity", "int"), ("price", "money"),
+    ], f"""
+        SELECT od.order_detail_id, od.order_id, od.menu_item_id, m.name, od.quantity, od.price
+        FROM `Order` o
+        JOIN OrderDetail od ON od.order_id = o.order_id
+        JOIN MenuItem m ON m.menu_item_id = od.menu_item_id
+        WHERE {ORDER_RANGE}
+        ORDER BY od.order_id, od.order_detail_id
+    """),
+    "invoices": ([
+        ("invoice_id", "int"), ("order_id", "int"), ("total_amount", "money"), ("discount_id", "int"),
+        ("created_at", "datetime"),
+    ], f"""
+        SELECT i.invoice_id, i.order_id, i.total_amount, i.discount_id, i.created_at
+        FROM `Order` o
+        JOIN Invoice i ON i.order_id = o.order_id
+        WHERE {ORDER_RANGE}
+        ORDER BY i.invoice_id
+    """),
+    "payments": ([
+        ("payment_id", "int"), ("invoice_id", "int"), ("amount_paid", "money"), ("payment_method", "text"),
+        ("payment_date", "datetime"),
+    ], """
+        SELECT payment_id, invoice_id, amount_paid, payment_method, payment_date
+        FROM Payment
+        WHERE payment_date >= %s AND payment_date < %s
+        ORDER BY payment_id
+    """),
+}
+FORMATS = ["csv", "parquet"]
+
+
+def stream_rows(sql, params, chunk_size=EXPORT_CHUNK_ROWS):
+    with db_cursor() as cursor:
+        cursor.execute(sql, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    return
+                yield rows
+        finally:
+            # An unbuffered MySQL result has to be read to the end before the
+            # connection can be rolled back or reused, even if the export stopped early
+            while cursor.fetchmany(chunk_size):
+                pass
+
+
+# ---- writers: take the column list and an iterator of row chunks, return rows written ----
+def write_csv(path, columns, chunks):
+    written = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([name for name, _ in columns])
+        for rows in chunks:
+            writer.writerows(rows)
+            written += len(rows)
+    return written
+
+# pyarrow is only needed for Parquet, so it is imported here
+def write_parquet(path, columns, chunks):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow); CSV works without it")
+
+    types = {"int": pa.int64(), "text": pa.string(), "money": pa.decimal128(12, 2), "datetime": pa.timestamp("s")}
+    schema = pa.schema([(name, types[kind]) for name, kind in columns])
+    written = 0
+    # One row group per chunk; the writer holds nothing back between them
+    with pq.ParquetWriter(path, schema, compression="snappy") as writer:
+        for rows in chunks:
+            arrays = [
+                pa.array([_parquet_value(row[i], kind) for row in rows], types[kind])
+                for i, (_, kind) in enumerate(columns)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            written += len(rows)
+    return written
+
+def _parquet_value(value, kind):
+    if value is None:
+        return None
+    if kind == "money":
+        return decimal.Decimal(value).quantize(decimal.Decimal("0.01"))
+    if kind == "datetime" and not isinstance(value, datetime.datetime):
+        return datetime.datetime.combine(value, datetime.time.min)
+    return value
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet}
+
+
+# Writes one file per table to out_dir; returns [(name, path, rows)]
+def export(start_date, end_date, fmt="csv", names=None, out_dir=EXPORT_DIR, chunk_size=EXPORT_CHUNK_ROWS):
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format {fmt!r} (expected one of: {', '.join(FORMATS)})")
+    if end_date < start_date:
+        raise ValueError("End date is before start date")
+    os.makedirs(out_dir, exist_ok=True)
+    results = []
+    for name in names or list(EXPORTS):
+        columns, sql = EXPORTS[name]
+        path = os.path.join(out_dir, f"{name}_{start_date}_{end_date}.{fmt}")
+        written = WRITERS[fmt](path, columns, stream_rows(sql, day_range(start_date, end_date), chunk_size))
+        results.append((name, path, written))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export orders, order lines, invoices and payments for a date range")
+    parser.add_argument("--start", type=datetime.date.fromisoformat, required=True)
+    parser.add_argument("--end", type=datetime.date.fromisoformat, help="last day to export (default: --start)")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--only", nargs="+", choices=list(EXPORTS), help="tables to export (default: all)")
+    parser.add_argument("--out", default=EXPORT_DIR, help="directory for the exported files")
+    parser.add_argument("--chunk-rows", type=int, default=EXPORT_CHUNK_ROWS, help="rows fetched and written at a time")
+    args = parser.parse_args()
+    try:
+        results = export(args.start, args.end or args.start, args.format, args.only, args.out, args.chunk_rows)
+    except (RuntimeError, ValueError) as e:
+        sys.exit(str(e))
+    for name, path, written in results:
+        print(f"{name:<15} {written:>10} rows  {path}")
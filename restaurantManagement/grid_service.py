@@ -0,0 +1,185 @@
+import decimal
+from db import db_cursor, after_commit
+from reference_data import invalidate
+from low_stock import low_stock
+from menu_search import menu_search
+
+# ------------------ EDITABLE GRIDS ------------------
+# Backing for the manager screens that edit whole tables (staff, inventory,
+# suppliers, menu). Filtering and paging happen in SQL, so a screen only ever
+# holds one page of rows; saving compares the page as loaded with the page as
+# edited and writes just the changed rows, one executemany per statement, in a
+# single transaction.
+
+GRID_PAGE_SIZE = 50
+
+
+class Grid:
+    # columns: [(column, label, kind)] in display order; kind is "text",
+    # "number", "money" or "flag". Only those in editable are written back.
+    # filter_column: column offered as a dropdown filter (None for no filter).
+    def __init__(self, name, table, key, columns, editable, source, search_column, filter_column=None,
+                 can_delete=False, delete_first=(), referenced_by=(), on_save=None):
+        self.name = name
+        self.table = table
+        self.key = key
+        self.columns = columns
+        self.editable = editable
+        self.source = source                # "FROM ..." clause holding the key and every column
+        self.search_column = search_column
+        self.filter_column = filter_column
+        self.can_delete = can_delete
+        self.delete_first = delete_first    # statements run per deleted key before the row itself
+        self.referenced_by = referenced_by  # [(table, column, what)] history that blocks a delete
+        self.on_save = on_save              # called with (updated rows, deleted keys) after commit
+
+    def _where(self, search, choice):
+        clauses, params = [], []
+        if search:
+            clauses.append(f"{self.search_column} LIKE %s")
+            params.append(f"%{search}%")
+        if choice is not None and self.filter_column:
+            clauses.append(f"{self.filter_column} = %s")
+            params.append(choice)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def filter_choices(self):
+        if not self.filter_column:
+            return []
+        with db_cursor() as cursor:
+            cursor.execute(f"SELECT DISTINCT {self.filter_column} {self.source} ORDER BY {self.filter_column}")
+            return [row[0] for row in cursor.fetchall() if row[0] is not None]
+
+    def count(self, search=None, choice=None):
+        where, params = self._where(search, choice)
+        with db_cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) {self.source}{where}", tuple(params))
+            return cursor.fetchone()[0]
+
+    # [{key: ..., column: value, ...}] for one page, ordered by key
+    def page(self, search=None, choice=None, page=1, page_size=GRID_PAGE_SIZE):
+        where, params = self._where(search, choice)
+        selected = ", ".join([self.key] + [column for column, _, _ in self.columns])
+        with db_cursor() as cursor:
+            cursor.execute(f"""
+                SELECT {selected} {self.source}{where}
+                ORDER BY {self.key}
+                LIMIT %s OFFSET %s
+            """, (*params, page_size, (page - 1) * page_size))
+            rows = cursor.fetchall()
+        names = [self.key] + [column for column, _, _ in self.columns]
+        return [dict(zip(names, row)) for row in rows]
+
+    # Editor values (floats, bools) back to the column's type; Decimals compare by value
+    def _value(self, column, value):
+        kind = next(kind for c, _, kind in self.columns if c == column)
+        if value is None:
+            return None
+        if kind == "money":
+            return decimal.Decimal(str(value)).quantize(decimal.Decimal("0.01"))
+        if kind == "number":
+            return decimal.Decimal(str(value))
+        if kind == "flag":
+            return int(bool(value))
+        return str(value).strip()
+
+    # Rows of edited whose editable values differ from original, matched on the key
+    def changed_rows(self, original, edited):
+        before = {row[self.key]: row for row in original}
+        changed = []
+        for row in edited:
+            old = before.get(row[self.key])
+            if old is None:
+                continue
+            if any(self._value(c, row[c]) != self._value(c, old[c]) for c in self.editable):
+                changed.append({self.key: row[self.key], **{c: self._value(c, row[c]) for c in self.editable}})
+        return changed
+
+    # Raises ValueError naming the deleted keys that other rows still refer to
+    def _check_deletable(self, cursor, deleted):
+        placeholders = ", ".join(["%s"] * len(deleted))
+        blocked = {}
+        for table, column, what in self.referenced_by:
+            cursor.execute(f"SELECT DISTINCT {column} FROM {table} WHERE {column} IN ({placeholders})", tuple(deleted))
+            for (key,) in cursor.fetchall():
+                blocked.setdefault(key, []).append(what)
+        if blocked:
+            raise ValueError("; ".join(
+                f"{self.table} #{key} still has {', '.join(whats)} and cannot be deleted" for key, whats in sorted(blocked.items())
+            ))
+
+    # One executemany per statement, all in one transaction
+    def save(self, changed, deleted=()):
+        if not changed and not deleted:
+            return 0
+        with db_cursor() as cursor:
+            if deleted and self.referenced_by:
+                self._check_deletable(cursor, deleted)
+            if changed:
+                assignments = ", ".join(f"{column} = %s" for column in self.editable)
+                cursor.executemany(
+                    f"UPDATE {self.table} SET {assignments} WHERE {self.key} = %s",
+                    [(*(row[c] for c in self.editable), row[self.key]) for row in changed]
+                )
+            if deleted:
+                for sql in self.delete_first:
+                    cursor.executemany(sql, [(key,) for key in deleted])
+                cursor.executemany(f"DELETE FROM {self.table} WHERE {self.key} = %s", [(key,) for key in deleted])
+            if self.on_save is not None:
+                after_commit(lambda: self.on_save(changed, deleted))
+        return len(changed) + len(deleted)
+
+
+# ---- after-commit cache upkeep ----
+def _inventory_saved(changed, deleted):
+    invalidate("InventoryItem", "Recipe")
+    for row in changed:
+        low_stock.set_item(row["item_id"], row["item_name"], row["unit"], row["current_quantity"], row["par_level"])
+    for item_id in deleted:
+        low_stock.remove(item_id)
+
+def _suppliers_saved(changed, deleted):
+    invalidate("Supplier")
+
+def _menu_saved(changed, deleted):
+    invalidate("MenuItem")
+    menu_search.clear()
+
+
+GRIDS = {
+    "staff": Grid(
+        "staff", "Staff", "staff_id",
+        [("name", "Name", "text"), ("phone", "Phone", "text"), ("salary", "Salary", "money"), ("role_name", "Role", "text")],
+        ["name", "phone", "salary"],
+        "FROM Staff JOIN Role ON Staff.role_id = Role.role_id",
+        search_column="name", filter_column="role_name", can_delete=True,
+        referenced_by=[("ShiftSchedule", "staff_id", "shifts"), ("ShiftTemplateLine", "staff_id", "template shifts"),
+                       ("`Order`", "staff_id", "orders"), ("Purchase", "staff_id", "purchases"),
+                       ("Event", "created_by_staff_id", "events")],
+    ),
+    "inventory": Grid(
+        "inventory", "InventoryItem", "item_id",
+        [("item_name", "Item", "text"), ("unit", "Unit", "text"), ("current_quantity", "Quantity", "number"),
+         ("par_level", "Par Level", "number"), ("category", "Category", "text")],
+        ["item_name", "unit", "current_quantity", "par_level"],
+        "FROM InventoryItem",
+        search_column="item_name", filter_column="category", can_delete=True,
+        delete_first=["DELETE FROM Recipe WHERE item_id = %s"],
+        referenced_by=[("PurchaseDetail", "item_id", "purchases")], on_save=_inventory_saved,
+    ),
+    "suppliers": Grid(
+        "suppliers", "Supplier", "supplier_id",
+        [("name", "Supplier", "text"), ("phone", "Phone", "text"), ("category", "Category", "text")],
+        ["name", "phone", "category"],
+        "FROM Supplier",
+        search_column="name", filter_column="category", on_save=_suppliers_saved,
+    ),
+    "menu": Grid(
+        "menu", "MenuItem", "menu_item_id",
+        [("name", "Name", "text"), ("price", "Price", "money"), ("is_available", "Available", "flag"),
+         ("category_name", "Category", "text")],
+        ["name", "price", "is_available"],
+        "FROM MenuItem JOIN MenuCategory ON MenuItem.category_id = MenuCategory.category_id",
+        search_column="name", filter_column="category_name", on_save=_menu_saved,
+    ),
+}
@@ -0,0 +1,238 @@
+import argparse
+import csv
+import decimal
+import io
+import sys
+from db import db_cursor
+from reference_data import invalidate
+from low_stock import low_stock
+from menu_search import menu_search
+from config import IMPORT_BATCH_ROWS
+
+# ------------------ BULK CSV IMPORT ------------------
+# Loads a menu, inventory list or supplier catalog from CSV in one pass:
+# each row is validated as it is read, rows whose name already exists update
+# that record and the rest are inserted, in batches of IMPORT_BATCH_ROWS
+# (one multi-row INSERT and one executemany UPDATE each), all in a single
+# transaction. Existing names and menu category names are each read once up
+# front. Bad rows are skipped and reported with their line number; a dry run
+# validates and writes everything, then rolls it back.
+
+# ---- field parsers: raw text -> value, or ValueError with the reason ----
+def text(max_length, required=True):
+    def parse(raw):
+        value = (raw or "").strip()
+        if not value:
+            if required:
+                raise ValueError("is required")
+            return None
+        if len(value) > max_length:
+            raise ValueError(f"is longer than {max_length} characters")
+        return value
+    return parse
+
+def amount(places):
+    step = decimal.Decimal(1).scaleb(-places)
+    def parse(raw):
+        try:
+            value = decimal.Decimal((raw or "").strip().replace(",", ""))
+        except decimal.InvalidOperation:
+            raise ValueError(f"is not a number: {raw!r}")
+        if not value.is_finite() or value < 0:
+            raise ValueError(f"must be zero or more: {raw!r}")
+        return value.quantize(step)
+    return parse
+
+FLAGS = {"1": 1, "yes": 1, "y": 1, "true": 1, "available": 1, "0": 0, "no": 0, "n": 0, "false": 0, "unavailable": 0}
+
+def flag(raw):
+    value = (raw or "").strip().lower()
+    if value not in FLAGS:
+        raise ValueError(f"must be yes or no: {raw!r}")
+    return FLAGS[value]
+
+
+class ImportSpec:
+    # fields: [(csv column, parser, default)]; default None means the column is required.
+    # Defaults only fill blank cells of new rows; updated rows keep their current value.
+    # columns: the table columns the parsed fields are written to, in order
+    def __init__(self, table, key, name_column, fields, columns, after_commit):
+        self.table = table
+        self.key = key
+        self.name_column = name_column
+        self.fields = fields
+        self.columns = columns
+        self.after_commit = after_commit
+        self.defaults = {column: parse(default) for column, parse, default in fields if default is not None}
+
+
+def _menu_saved():
+    invalidate("MenuItem")
+    menu_search.clear()
+
+def _inventory_saved():
+    invalidate("InventoryItem", "Recipe")
+    low_stock.clear()
+
+def _suppliers_saved():
+    invalidate("Supplier")
+
+IMPORTS = {
+    "menu": ImportSpec(
+        "MenuItem", "menu_item_id", "name",
+        [("name", text(100), None), ("price", amount(2), None), ("category", text(50), None),
+         ("is_available", flag, "yes")],
+        ["name", "price", "category_id", "is_available"],
+        _menu_saved,
+    ),
+    "inventory": ImportSpec(
+        "InventoryItem", "item_id", "item_name",
+        [("item_name", text(100), None), ("unit", text(50), None), ("current_quantity", amount(2), "0"),
+         ("category", text(50), None), ("par_level", amount(2), "0")],
+        ["item_name", "unit", "current_quantity", "category", "par_level"],
+        _inventory_saved,
+    ),
+    "suppliers": ImportSpec(
+        "Supplier", "supplier_id", "name",
+        [("name", text(100), None), ("phone", text(20, required=False), ""), ("category", text(50), None)],
+        ["name", "phone", "category"],
+        _suppliers_saved,
+    ),
+}
+
+
+class _DryRun(Exception):
+    pass
+
+
+def _name_ids(cursor, spec):
+    cursor.execute(f"SELECT {spec.name_column}, {spec.key} FROM {spec.table}")
+    return {name.strip().casefold(): key for name, key in cursor.fetchall()}
+
+def _category_ids(cursor):
+    cursor.execute("SELECT category_name, category_id FROM MenuCategory")
+    return {name.strip().casefold(): category_id for name, category_id in cursor.fetchall()}
+
+# ({table column: value}, None) or (None, [(column, message)]);
+# blank optional cells are None, for the caller to default or leave alone
+def _parse_row(spec, row, categories):
+    values, problems = {}, []
+    for column, parse, default in spec.fields:
+        raw = row.get(column)
+        if default is not None and (raw is None or not raw.strip()):
+            values[column] = None
+            continue
+        try:
+            values[column] = parse(raw)
+        except ValueError as e:
+            problems.append((column, f"{column} {e}"))
+    if "category_id" in spec.columns and "category" in values:
+        category_id = categories.get(values["category"].casefold())
+        if category_id is None:
+            problems.append(("category", f"unknown menu category {values['category']!r}"))
+        values["category_id"] = category_id
+    if problems:
+        return None, problems
+    return values, None
+
+def _flush(cursor, spec, update_columns, inserts, updates):
+    if inserts:
+        cursor.executemany(
+            f"INSERT INTO {spec.table} ({', '.join(spec.columns)}) VALUES ({', '.join(['%s'] * len(spec.columns))})",
+            inserts
+        )
+    if updates:
+        assignments = ", ".join(
+            f"{column} = COALESCE(%s, {column})" if column in spec.defaults else f"{column} = %s"
+            for column in update_columns
+        )
+        cursor.executemany(f"UPDATE {spec.table} SET {assignments} WHERE {spec.key} = %s", updates)
+    inserted, updated = len(inserts), len(updates)
+    inserts.clear()
+    updates.clear()
+    return inserted, updated
+
+# source: a text file object (or any iterable of CSV lines).
+# Optional columns left out of the file, or left blank on a row, keep their
+# current values on updated rows and take their defaults on new ones.
+# Returns (inserted, updated, errors) with errors [(line, column, message)];
+# line 1 is the header.
+def import_csv(kind, source, dry_run=False, batch_rows=IMPORT_BATCH_ROWS):
+    spec = IMPORTS[kind]
+    reader = csv.DictReader(source)
+    if reader.fieldnames is None:
+        raise ValueError("The file is empty")
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+    missing = [column for column, _, default in spec.fields if default is None and column not in reader.fieldnames]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    given = set(reader.fieldnames) | ({"category_id"} if "category" in reader.fieldnames else set())
+    update_columns = [column for column in spec.columns if column in given]
+
+    inserted = updated = 0
+    errors = []
+    try:
+        with db_cursor() as cursor:
+            existing = _name_ids(cursor, spec)
+            categories = _category_ids(cursor) if "category_id" in spec.columns else {}
+            seen = {}      # casefolded name -> line it was first read on
+            inserts, updates = [], []
+            for row in reader:
+                line = reader.line_num
+                values, problems = _parse_row(spec, row, categories)
+                if problems:
+                    errors.extend((line, column, message) for column, message in problems)
+                    continue
+                name = values[spec.name_column].casefold()
+                if name in seen:
+                    errors.append((line, spec.name_column, f"duplicate of line {seen[name]}"))
+                    continue
+                seen[name] = line
+                if name in existing:
+                    updates.append((*(values[column] for column in update_columns), existing[name]))
+                else:
+                    inserts.append(tuple(
+                        spec.defaults[column] if values[column] is None and column in spec.defaults else values[column]
+                        for column in spec.columns
+                    ))
+                if len(inserts) + len(updates) >= batch_rows:
+                    counts = _flush(cursor, spec, update_columns, inserts, updates)
+                    inserted, updated = inserted + counts[0], updated + counts[1]
+            counts = _flush(cursor, spec, update_columns, inserts, updates)
+            inserted, updated = inserted + counts[0], updated + counts[1]
+            if dry_run:
+                raise _DryRun()
+    except _DryRun:
+        return inserted, updated, errors
+    spec.after_commit()
+    return inserted, updated, errors
+
+# The errors as a CSV document, for download next to the original file
+def error_report(errors):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["line", "column", "error"])
+    writer.writerows(errors)
+    return out.getvalue()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import menu items, inventory items or suppliers from a CSV file")
+    parser.add_argument("kind", choices=list(IMPORTS))
+    parser.add_argument("path", help="CSV file with a header row")
+    parser.add_argument("--dry-run", action="store_true", help="validate and report without saving anything")
+    parser.add_argument("--errors", help="write the row errors to this CSV file")
+    args = parser.parse_args()
+    try:
+        with open(args.path, newline="", encoding="utf-8-sig") as f:
+            inserted, updated, errors = import_csv(args.kind, f, args.dry_run)
+    except ValueError as e:
+        sys.exit(str(e))
+    print(f"{'Would insert' if args.dry_run else 'Inserted'} {inserted} and "
+          f"{'update' if args.dry_run else 'updated'} {updated} rows; {len(errors)} row errors")
+    if args.errors:
+        with open(args.errors, "w", newline="", encoding="utf-8") as f:
+            f.write(error_report(errors))
+    else:
+        for line, column, message in errors[:50]:
+            print(f"  line {line}: {message}")
@@ -0,0 +1,47 @@
+from db import db_cursor
+from records import StockLevel
+from reference_data import invalidate
+from low_stock import low_stock
+
+def inventory_categories():
+    with db_cursor() as cursor:
+        cursor.execute("SELECT DISTINCT category FROM InventoryItem")
+        return [row[0] for row in cursor.fetchall()]
+
+def items_in_category(category):
+    with db_cursor() as cursor:
+        cursor.execute("""
+            SELECT item_id, item_name, unit, current_quantity, par_level
+            FROM InventoryItem
+            WHERE category = %s
+        """, (category,))
+        return StockLevel.from_rows(cursor.fetchall())
+
+def update_item(item_id, item_name, unit, quantity, par_level=0):
+    with db_cursor() as cursor:
+        cursor.execute("""
+            UPDATE InventoryItem
+            SET item_name = %s, unit = %s, current_quantity = %s, par_level = %s
+            WHERE item_id = %s
+        """, (item_name, unit, quantity, par_level, item_id))
+    invalidate("InventoryItem", "Recipe")
+    low_stock.set_item(item_id, item_name, unit, quantity, par_level)
+
+# The item's recipe lines go with it
+def delete_item(item_id):
+    with db_cursor() as cursor:
+        cursor.execute("DELETE FROM Recipe WHERE item_id = %s", (item_id,))
+        cursor.execute("DELETE FROM InventoryItem WHERE item_id = %s", (item_id,))
+    invalidate("InventoryItem", "Recipe")
+    low_stock.remove(item_id)
+
+def add_item(item_name, unit, quantity, category, par_level=0):
+    with db_cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO InventoryItem (item_name, unit, current_quantity, category, par_level)
+            VALUES (%s, %s, %s, %s, %s)
+        """, (item_name, unit, quantity, category, par_level))
+        item_id = cursor.lastrowid
+    invalidate("InventoryItem")
+    low_stock.set_item(item_id, item_name, unit, quantity, par_level)
+    return item_id
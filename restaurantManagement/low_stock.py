@@ -0,0 +1,85 @@
+import decimal
+import threading
+import time
+from db import db_cursor
+from config import LOW_STOCK_TTL
+
+# ------------------ LOW-STOCK INDEX ------------------
+# Stock level and par of every inventory item, read in one query and then
+# kept current by the code paths that change stock (orders, manual edits).
+# Items under par sit in a separate set, so "what is running low" never has
+# to look at the rest of the inventory. Reloaded after LOW_STOCK_TTL to pick
+# up changes made by other processes.
+
+class LowStockIndex:
+    def __init__(self, ttl=LOW_STOCK_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._items = None      # item_id -> [item_name, unit, quantity, par_level]
+        self._low = set()       # item_ids with quantity < par_level
+        self._loaded_at = 0
+
+    def _load(self):
+        with db_cursor() as cursor:
+            cursor.execute("SELECT item_id, item_name, unit, current_quantity, par_level FROM InventoryItem")
+            rows = cursor.fetchall()
+        self._items = {item_id: [name, unit, qty, par] for item_id, name, unit, qty, par in rows}
+        self._low = {item_id for item_id, (_, _, qty, par) in self._items.items() if qty < par}
+        self._loaded_at = time.monotonic()
+
+    def _ensure(self):
+        if self._items is None or time.monotonic() - self._loaded_at > self.ttl:
+            self._load()
+
+    def _mark(self, item_id):
+        _, _, qty, par = self._items[item_id]
+        if qty < par:
+            self._low.add(item_id)
+        else:
+            self._low.discard(item_id)
+
+    # ---- queries ----
+    # [(item_id, item_name, unit, quantity, par_level)], furthest below par first
+    def low_items(self):
+        with self._lock:
+            self._ensure()
+            items = [(item_id, *self._items[item_id]) for item_id in self._low]
+        return sorted(items, key=lambda item: item[3] / item[4] if item[4] else 0)
+
+    def is_low(self, item_id):
+        with self._lock:
+            self._ensure()
+            return item_id in self._low
+
+    # ---- incremental maintenance (called after the write has committed) ----
+    # usage: {item_id: amount}; sign -1 for stock used, +1 for stock returned or received
+    def apply(self, usage, sign=-1):
+        with self._lock:
+            if self._items is None:
+                return
+            for item_id, amount in usage.items():
+                if item_id in self._items:
+                    self._items[item_id][2] += sign * amount
+                    self._mark(item_id)
+
+    def set_item(self, item_id, item_name, unit, quantity, par_level):
+        # Screens pass floats; keep Decimal like the database values
+        quantity, par_level = decimal.Decimal(str(quantity)), decimal.Decimal(str(par_level))
+        with self._lock:
+            if self._items is not None:
+                self._items[item_id] = [item_name, unit, quantity, par_level]
+                self._mark(item_id)
+
+    def remove(self, item_id):
+        with self._lock:
+            if self._items is not None:
+                self._items.pop(item_id, None)
+                self._low.discard(item_id)
+
+    def clear(self):
+        with self._lock:
+            self._items = None
+            self._low = set()
+
+
+low_stock = LowStockIndex()
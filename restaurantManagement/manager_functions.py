@@ -1,115 +1,124 @@
 import streamlit as st
 import datetime
-from db import db_cursor
-from db import get_db_connection
-from utils import safe_parse_time
-
-def parse_time_correctly(value):
-    if isinstance(value, datetime.timedelta):
-        return (datetime.datetime.min + value).time()
-    elif isinstance(value, datetime.time):
-        return value
-    elif isinstance(value, str):
-        try:
-            return datetime.datetime.strptime(value, "%H:%M:%S").time()
-        except Exception:
-            return datetime.time(0, 0)
-    else:
-        return datetime.time(0, 0)
-    
-
+import io
+import os
+from db import unit_of_work, pool_stats
+from reference_data import (
+    menu_categories, roles, suppliers, inventory_items_by_category, inventory_items, recipe, cache_stats, session_cache_stats
+)
+from recipe_service import set_ingredient, remove_ingredient
+from sales_service import daily_sales, item_sales, category_sales, payment_sales
+from low_stock import low_stock
+from metrics import query_stats, page_stats, recent_slow_queries
+from config import METRICS_SAMPLES, SLOW_QUERY_MS, EXPORT_DIR
+from export_service import EXPORTS, FORMATS, export
+from import_service import IMPORTS, import_csv, error_report
+from upi_qr import payment_qr_stats
+from order_service import ORDERS_PAGE_SIZE, count_orders, list_orders, fetch_order_items
+from event_service import list_event_bookings
+from inventory_service import add_item
+from staff_service import add_staff
+from supplier_service import add_supplier
+from menu_service import add_menu_item
+from grid_service import GRIDS, GRID_PAGE_SIZE
+from purchase_service import (
+    PURCHASE_STATUSES, PURCHASES_PAGE_SIZE, record_purchase, count_purchases, list_purchases,
+    fetch_purchase_details, update_purchase_status, receive_pending_purchases
+)
+from shift_service import (
+    staffed_roles, list_shifts, list_staff, shifts_for_staff, shifts_on, add_shift, update_shift, delete_shift,
+    WEEKDAYS, list_templates, template_lines, create_template, delete_template, add_template_shift,
+    remove_template_shift, apply_template
+)
 
 # ------------------ VIEW EVENTS ------------------
 def manager_view_upcoming_events():
     st.header("Upcoming Events (Manager View)")
     view_mode = st.radio("View By", ["Single Date", "Date Range"])
 
-    with db_cursor() as cursor:
-        if view_mode == "Single Date":
-            selected_date = st.date_input("Select Date")
-            cursor.execute("""
-                SELECT e.event_name, e.location, e.event_date, eb.guest_count, s.name, c.name
-                FROM Event e
-                JOIN EventBooking eb ON e.event_id = eb.event_id
-                JOIN Customer c ON eb.customer_id = c.customer_id
-                JOIN Staff s ON e.created_by_staff_id = s.staff_id
-                WHERE e.event_date = %s
-            """, (selected_date,))
-        else:
-            start_date = st.date_input("Start Date")
-            end_date = st.date_input("End Date")
-            cursor.execute("""
-                SELECT e.event_name, e.location, e.event_date, eb.guest_count, s.name, c.name
-                FROM Event e
-                JOIN EventBooking eb ON e.event_id = eb.event_id
-                JOIN Customer c ON eb.customer_id = c.customer_id
-                JOIN Staff s ON e.created_by_staff_id = s.staff_id
-                WHERE e.event_date BETWEEN %s AND %s
-                ORDER BY e.event_date
-            """, (start_date, end_date))
-
-        events = cursor.fetchall()
+    if view_mode == "Single Date":
+        selected_date = st.date_input("Select Date")
+        events = list_event_bookings(selected_date)
+    else:
+        start_date = st.date_input("Start Date")
+        end_date = st.date_input("End Date")
+        events = list_event_bookings(start_date, end_date)
 
     if events:
-        for event_name, location, event_date, guest_count, created_by, customer_name in events:
+        for event in events:
             st.write(f"""
-                **{event_date}**  
-                **Event:** {event_name}  
-                **Location:** {location}  
-                **Guests:** {guest_count}  
-                **Customer:** {customer_name}  
-                **Booked By Staff:** {created_by}
+                **{event.event_date}**  
+                **Event:** {event.event_name}  
+                **Location:** {event.location}  
+                **Guests:** {event.guest_count}  
+                **Customer:** {event.customer_name}  
+                **Booked By Staff:** {event.booked_by}
             """)
     else:
         st.info("No upcoming events found.")
 
 
 
+# ------------------ EDITABLE GRIDS ------------------
+# One filtered page of a table as a spreadsheet; Save writes only the changed rows.
+# Returns the rows shown, for screens that act on a selected row.
+def edit_grid(grid):
+    col1, col2 = st.columns(2)
+    search = col1.text_input("Search", key=f"grid_search_{grid.name}")
+    choice = col2.selectbox("Filter", ["All"] + grid.filter_choices(), key=f"grid_filter_{grid.name}")
+    choice = None if choice == "All" else choice
+
+    total = grid.count(search, choice)
+    page_count = max(1, -(-total // GRID_PAGE_SIZE))
+    page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, step=1,
+                           key=f"grid_page_{grid.name}")
+    rows = grid.page(search, choice, page)
+    if not rows:
+        st.info("No rows match the search.")
+        return rows
+    st.caption(f"Showing {len(rows)} of {total}")
+
+    # The editor works in floats and booleans; Grid.changed_rows converts back
+    kinds = {column: kind for column, _, kind in grid.columns}
+    shown = []
+    for row in rows:
+        shown_row = {
+            column: float(value) if kinds.get(column) in ("money", "number") and value is not None
+            else bool(value) if kinds.get(column) == "flag" else value
+            for column, value in row.items()
+        }
+        if grid.can_delete:
+            shown_row["delete"] = False
+        shown.append(shown_row)
+
+    # A new editor key after each save, so the saved edits are not replayed onto the reloaded page
+    version = st.session_state.setdefault(f"grid_version_{grid.name}", 0)
+    edited = st.data_editor(
+        shown,
+        key=f"grid_{grid.name}_{version}_{search}_{choice}_{page}",
+        hide_index=True,
+        disabled=[grid.key] + [column for column, _, _ in grid.columns if column not in grid.editable],
+        column_config={column: label for column, label, _ in grid.columns},
+    )
+
+    if st.button("Save Changes", key=f"grid_save_{grid.name}"):
+        deleted = [row[grid.key] for row in edited if row.get("delete")]
+        changed = [row for row in grid.changed_rows(rows, edited) if row[grid.key] not in deleted]
+        try:
+            saved = grid.save(changed, deleted)
+            st.session_state[f"grid_version_{grid.name}"] = version + 1
+            st.success(f"Saved {len(changed)} changed and {len(deleted)} deleted rows." if saved else "No changes to save.")
+            if saved:
+                st.rerun()
+        except Exception as e:
+            st.error(f"Nothing was saved: {e}")
+    return rows
+
+
 # ------------------ MANAGE STAFF ------------------
 def manager_staff_management():
     st.header("Manage Staff")
-    search_name = st.text_input("Search Staff by Name")
-    role_filter = st.selectbox("Filter by Role", ["All", "Admin", "Manager", "Chef"])
-
-    with db_cursor() as cursor:
-        query = """
-            SELECT s.staff_id, s.name, s.phone, s.salary, r.role_name
-            FROM Staff s
-            JOIN Role r ON s.role_id = r.role_id
-            WHERE 1=1
-        """
-        params = []
-        if search_name:
-            query += " AND s.name LIKE %s"
-            params.append(f"%{search_name}%")
-        if role_filter != "All":
-            query += " AND r.role_name = %s"
-            params.append(role_filter)
-
-        cursor.execute(query, tuple(params))
-        staff_list = cursor.fetchall()
-
-    if not staff_list:
-        st.info("No staff found.")
-    else:
-        for staff_id, name, phone, salary, role in staff_list:
-            with st.expander(f"{name} (Role: {role})"):
-                new_name = st.text_input("Name", value=name, key=f"name_{staff_id}")
-                new_phone = st.text_input("Phone", value=phone, key=f"phone_{staff_id}")
-                new_salary = st.number_input("Salary", value=float(salary), key=f"salary_{staff_id}")
-                if st.button("Update", key=f"update_{staff_id}"):
-                    with db_cursor() as cursor:
-                        cursor.execute("""
-                            UPDATE Staff
-                            SET name = %s, phone = %s, salary = %s
-                            WHERE staff_id = %s
-                        """, (new_name, new_phone, new_salary, staff_id))
-                        st.success("Staff updated.")
-
-                if st.button("Delete", key=f"delete_{staff_id}"):
-                    with db_cursor() as cursor:
-                        cursor.execute("DELETE FROM Staff WHERE staff_id = %s", (staff_id,))
-                        st.success("Staff deleted.")
+    edit_grid(GRIDS["staff"])
 
     st.markdown("---")
     st.subheader("Add New Staff")
@@ -117,24 +126,16 @@ def manager_staff_management():
     new_staff_name = st.text_input("Staff Name")
     new_staff_phone = st.text_input("Phone")
     new_staff_salary = st.number_input("Salary", min_value=0.0)
-    with db_cursor() as cursor:
-        cursor.execute("SELECT role_id, role_name FROM Role")
-        roles = cursor.fetchall()
-        role_map = {name: rid for rid, name in roles}
+    role_map = {name: rid for rid, name in roles()}
 
     new_role = st.selectbox("Select Role", list(role_map.keys()) + (["Chef"] if "Chef" not in role_map else []))
 
     if st.button("Add Staff"):
-        with db_cursor() as cursor:
-            role_id = role_map.get(new_role)
-            if not role_id:
-                cursor.execute("INSERT INTO Role (role_name) VALUES (%s)", (new_role,))
-                role_id = cursor.lastrowid
-            cursor.execute("""
-                INSERT INTO Staff (name, phone, role_id, salary)
-                VALUES (%s, %s, %s, %s)
-            """, (new_staff_name, new_staff_phone, role_id, new_staff_salary))
+        try:
+            add_staff(new_staff_name, new_staff_phone, new_role, new_staff_salary)
             st.success("Staff member added successfully.")
+        except ValueError as e:
+            st.warning(str(e))
 
 
 
@@ -143,270 +144,208 @@ def manager_dashboard_view_orders():
     st.header("View Orders and Invoices")
     view_mode = st.radio("Select View Mode", ["Single Date", "Date Range"])
 
-    with db_cursor() as cursor:
-        if view_mode == "Single Date":
-            selected_date = st.date_input("Select Date")
-            cursor.execute("""
-                SELECT o.order_id, c.name, o.order_time, o.status, SUM(od.quantity * od.price)
-                FROM `Order` o
-                JOIN Customer c ON o.customer_id = c.customer_id
-                JOIN OrderDetail od ON o.order_id = od.order_id
-                WHERE DATE(o.order_time) = %s
-                GROUP BY o.order_id
-            """, (selected_date,))
-        else:
-            start_date = st.date_input("Start Date")
-            end_date = st.date_input("End Date")
-            cursor.execute("""
-                SELECT o.order_id, c.name, o.order_time, o.status, SUM(od.quantity * od.price)
-                FROM `Order` o
-                JOIN Customer c ON o.customer_id = c.customer_id
-                JOIN OrderDetail od ON o.order_id = od.order_id
-                WHERE DATE(o.order_time) BETWEEN %s AND %s
-                GROUP BY o.order_id
-            """, (start_date, end_date))
+    if view_mode == "Single Date":
+        start_date = end_date = st.date_input("Select Date")
+    else:
+        start_date = st.date_input("Start Date")
+        end_date = st.date_input("End Date")
+
+    with unit_of_work():
+        total_orders = count_orders(start_date, end_date)
 
-        orders = cursor.fetchall()
+        page_count = max(1, -(-total_orders // ORDERS_PAGE_SIZE))
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, step=1)
+
+        orders = list_orders(start_date, end_date, page)
+        order_items = fetch_order_items([order.order_id for order in orders])
 
     if orders:
-        for oid, cname, otime, status, total in orders:
-            with st.expander(f"Order #{oid} - {cname} | {otime.strftime('%d-%m-%Y %H:%M')} | Status: {status} | Rs.{total:.2f}"):
-                with db_cursor() as cursor:
-                    cursor.execute("""
-                        SELECT m.name, od.quantity, od.price
-                        FROM OrderDetail od
-                        JOIN MenuItem m ON od.menu_item_id = m.menu_item_id
-                        WHERE od.order_id = %s
-                    """, (oid,))
-                    items = cursor.fetchall()
-                    for name, qty, price in items:
-                        st.write(f"{name} x {qty} = Rs.{qty * price:.2f}")
+        st.caption(f"Showing {len(orders)} of {total_orders} orders")
+        for order in orders:
+            with st.expander(f"Order #{order.order_id} - {order.customer_name} | {order.order_time.strftime('%d-%m-%Y %H:%M')} | "
+                             f"Status: {order.status} | Rs.{order.total:.2f}"):
+                for item in order_items[order.order_id]:
+                    st.write(f"{item.name} x {item.quantity} = Rs.{item.quantity * item.price:.2f}")
     else:
         st.info("No orders found.")
 
 
 
+# ------------------ SALES REPORTS ------------------
+# Reads the daily rollup tables only, so a year costs the same whatever the order volume
+def manager_sales_reports():
+    st.header("Sales Reports")
+    today = datetime.date.today()
+    start_date = st.date_input("From", value=today - datetime.timedelta(days=364))
+    end_date = st.date_input("To", value=today)
+
+    days = daily_sales(start_date, end_date)
+    if not days:
+        st.info("No sales in this period.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Orders", sum(d.orders for d in days))
+    col2.metric("Items sold", sum(d.items_sold for d in days))
+    col3.metric("Net revenue", f"Rs.{sum(d.net_amount for d in days):,.2f}")
+
+    st.subheader("Revenue per day")
+    st.line_chart({"date": [d.sales_date for d in days], "net revenue": [float(d.net_amount) for d in days]}, x="date")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("By category")
+        categories = category_sales(start_date, end_date)
+        st.bar_chart({"category": [c.name for c in categories], "revenue": [float(c.gross_amount) for c in categories]}, x="category")
+    with col2:
+        st.subheader("By payment method")
+        st.dataframe([{"method": p.payment_method, "payments": p.payments, "amount": float(p.amount)} for p in payment_sales(start_date, end_date)])
+
+    st.subheader("Top menu items")
+    st.dataframe([{"item": i.name, "quantity": i.quantity, "revenue": float(i.gross_amount)} for i in item_sales(start_date, end_date)])
+
+
 # ------------------ MANAGE PURCHASES ------------------
 def manager_manage_purchases():
     st.header("Purchase Management")
-    conn = get_db_connection()
-    cursor = conn.cursor()
     view_mode = st.radio("View", ["Add New", "View By Date"])
 
     if view_mode == "Add New":
-            cursor.execute("SELECT supplier_id, name, category FROM Supplier")
-            suppliers = cursor.fetchall()
-            supplier_map = {f"{name} ({category})": (sid, category) for sid, name, category in suppliers}
-            selected_supplier = st.selectbox("Select Supplier", list(supplier_map.keys()))
-            supplier_id, supplier_category = supplier_map[selected_supplier]
+        supplier_map = {f"{name} ({category})": (sid, category) for sid, name, category in suppliers()}
+        selected_supplier = st.selectbox("Select Supplier", list(supplier_map.keys()))
+        supplier_id, supplier_category = supplier_map[selected_supplier]
 
-            purchase_date = st.date_input("Purchase Date")
-            status = st.selectbox("Purchase Status", ["Ordered", "Received", "Cancelled"])
+        purchase_date = st.date_input("Purchase Date")
+        status = st.selectbox("Purchase Status", PURCHASE_STATUSES)
 
-            # ---- Select items from Inventory ----
-            cursor.execute("SELECT item_id, item_name FROM InventoryItem WHERE category = %s", (supplier_category,))
-            inventory_items = cursor.fetchall()
-            item_map = {f"{name} (ID:{iid})": iid for iid, name in inventory_items}
-            selected_items = st.multiselect("Select Items to Purchase", list(item_map.keys()))
+        # ---- Select items from Inventory ----
+        inventory_items = inventory_items_by_category(supplier_category)
+        item_map = {f"{name} (ID:{iid})": iid for iid, name in inventory_items}
+        selected_items = st.multiselect("Select Items to Purchase", list(item_map.keys()))
 
-            items_to_purchase = []
+        items_to_purchase = []
 
-            if selected_items:
-                st.subheader("Enter Quantity and Price for Each Selected Item")
-                for item_label in selected_items:
-                    item_id = item_map[item_label]
-                    quantity = st.number_input(f"Quantity for {item_label}", min_value=0.0, step=0.1, key=f"qty_{item_id}")
-                    price_per_unit = st.number_input(f"Price per Unit for {item_label}", min_value=0.0, step=0.1, key=f"price_{item_id}")
-                    items_to_purchase.append((item_id, quantity, price_per_unit))
+        if selected_items:
+            st.subheader("Enter Quantity and Price for Each Selected Item")
+            for item_label in selected_items:
+                item_id = item_map[item_label]
+                quantity = st.number_input(f"Quantity for {item_label}", min_value=0.0, step=0.1, key=f"qty_{item_id}")
+                price_per_unit = st.number_input(f"Price per Unit for {item_label}", min_value=0.0, step=0.1, key=f"price_{item_id}")
+                items_to_purchase.append((item_id, quantity, price_per_unit))
 
-            total_amount = sum(qty * price for (_, qty, price) in items_to_purchase)
+        total_amount = sum(qty * price for (_, qty, price) in items_to_purchase)
 
-            st.markdown(f"### Estimated Total Amount: Rs.{total_amount:.2f}")
+        st.markdown(f"### Estimated Total Amount: Rs.{total_amount:.2f}")
 
-            if st.button("Record Purchase and Purchase Details"):
-                staff_id = st.session_state.user_id
-                try:
-                    # Insert into Purchase table first
-                    cursor.execute("""
-                        INSERT INTO Purchase (supplier_id, staff_id, purchase_date, status, total_amount)
-                        VALUES (%s, %s, %s, %s, %s)
-                    """, (supplier_id, staff_id, purchase_date, status, total_amount))
-                    purchase_id = cursor.lastrowid
-
-                    # Insert each item into PurchaseDetail
-                    for item_id, qty, price in items_to_purchase:
-                        cursor.execute("""
-                            INSERT INTO PurchaseDetail (purchase_id, item_id, quantity, price_per_unit)
-                            VALUES (%s, %s, %s, %s)
-                        """, (purchase_id, item_id, qty, price))
-
-                    conn.commit()
-                    st.success("Purchase and purchase details recorded successfully!")
+        if st.button("Record Purchase and Purchase Details"):
+            try:
+                record_purchase(supplier_id, st.session_state.user_id, purchase_date, status, items_to_purchase)
+                st.success("Purchase and purchase details recorded successfully!")
+            except Exception as e:
+                st.error(f"Failed to record purchase: {e}")
+
+    elif view_mode == "View By Date":
+        start_date = st.date_input("Start Date")
+        end_date = st.date_input("End Date")
+
+        total_purchases = count_purchases(start_date, end_date)
+        page_count = max(1, -(-total_purchases // PURCHASES_PAGE_SIZE))
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, step=1)
+
+        purchases = list_purchases(start_date, end_date, page)
+
+        if not purchases:
+            st.info("No purchases found for the selected dates.")
+        else:
+            st.caption(f"Showing {len(purchases)} of {total_purchases} purchases")
 
+            if st.button("Receive all Ordered purchases in this range"):
+                try:
+                    received = receive_pending_purchases(start_date, end_date)
+                    st.success(f"Received {received} purchases into stock.")
+                    st.rerun()
                 except Exception as e:
-                    conn.rollback()
-                    st.error(f"Failed to record purchase: {e}")
+                    st.error(f"Failed to receive purchases: {e}")
 
-    elif view_mode == "View By Date":
-            start_date = st.date_input("Start Date")
-            end_date = st.date_input("End Date")
+            # Details are only loaded for purchases whose "Show items" toggle is on,
+            # and all of those in one query
+            opened = [p.purchase_id for p in purchases if st.session_state.get(f"purchase_items_{p.purchase_id}")]
+            details_by_purchase = fetch_purchase_details(opened)
+
+            for pid, supname, pdate, status, total in purchases:
+                with st.expander(f"Purchase #{pid} | Supplier: {supname} | Date: {pdate}"):
+                    st.write(f"**Status:** {status}")
+                    st.write(f"**Total Amount:** Rs.{total:.2f}")
+
+                    if st.checkbox("Show items", key=f"purchase_items_{pid}"):
+                        if pid not in details_by_purchase:
+                            details_by_purchase.update(fetch_purchase_details([pid]))
+                        for line in details_by_purchase[pid]:
+                            st.write(f"🛒 {line.item_name}: {line.quantity} units at Rs.{line.price_per_unit}/unit")
+
+                    new_status = st.selectbox("Update Status", PURCHASE_STATUSES, index=PURCHASE_STATUSES.index(status), key=f"status_{pid}")
+
+                    if new_status != status:
+                        if st.button(f"Update Status for Purchase #{pid}", key=f"update_{pid}"):
+                            try:
+                                update_purchase_status(pid, new_status)
+                                st.success(f"Status updated to {new_status} for Purchase #{pid}")
+                                st.rerun()
+                            except Exception as e:
+                                st.error(f"Failed to update status: {e}")
 
-            cursor.execute("""
-                SELECT p.purchase_id, s.name, p.purchase_date, p.status, p.total_amount
-                FROM Purchase p
-                JOIN Supplier s ON p.supplier_id = s.supplier_id
-                WHERE p.purchase_date BETWEEN %s AND %s
-                ORDER BY p.purchase_date
-            """, (start_date, end_date))
-            purchases = cursor.fetchall()
-
-            if not purchases:
-                st.info("No purchases found for the selected dates.")
-            else:
-                for pid, supname, pdate, status, total in purchases:
-                    with st.expander(f"Purchase #{pid} | Supplier: {supname} | Date: {pdate}"):
-                        st.write(f"**Status:** {status}")
-                        st.write(f"**Total Amount:** Rs.{total:.2f}")
-
-                        cursor.execute("""
-                            SELECT ii.item_name, pd.quantity, pd.price_per_unit
-                            FROM PurchaseDetail pd
-                            JOIN InventoryItem ii ON pd.item_id = ii.item_id
-                            WHERE pd.purchase_id = %s
-                        """, (pid,))
-                        details = cursor.fetchall()
-                        for item_name, qty, price_per_unit in details:
-                            st.write(f"🛒 {item_name}: {qty} units at Rs.{price_per_unit}/unit")
-
-                        new_status = st.selectbox("Update Status", ["Ordered", "Received", "Cancelled"], index=["Ordered", "Received", "Cancelled"].index(status), key=f"status_{pid}")
-
-                        if new_status != status:
-                            if st.button(f"Update Status for Purchase #{pid}", key=f"update_{pid}"):
-                                try:
-                                    cursor.execute("UPDATE Purchase SET status = %s WHERE purchase_id = %s", (new_status, pid))
-                                    conn.commit()
-                                    st.success(f"Status updated to {new_status} for Purchase #{pid}")
-                                    st.rerun()
-                                except Exception as e:
-                                    conn.rollback()
-                                    st.error(f"Failed to update status: {e}")
-
-            cursor.close()
-            conn.close()
-
-            
 
 # ------------------ MANAGE SHIFTS ------------------
 def manager_manage_shifts():
     st.header("Shift Schedule Management")
-    mode = st.radio("Select Mode", ["View Shifts", "Manage Shifts"])
-
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    mode = st.radio("Select Mode", ["View Shifts", "Manage Shifts", "Weekly Templates"])
 
     if mode == "View Shifts":
-            view_mode = st.radio("View Shifts By", ["Single Date", "Date Range", "Staff Name/ID"])
-
-            cursor.execute("SELECT DISTINCT r.role_name FROM Role r JOIN Staff s ON r.role_id = s.role_id")
-            roles = [r[0] for r in cursor.fetchall()]
-            roles.insert(0, "All")  # Add "All" option
-            selected_role = st.selectbox("Select Role", roles,key="view_shifts_role")
-
-            if view_mode == "Single Date":
-                date = st.date_input("Select Shift Date")
-
-                if selected_role == "All":
-                    cursor.execute("""
-                        SELECT s.name, r.role_name, ss.start_time, ss.end_time
-                        FROM ShiftSchedule ss
-                        JOIN Staff s ON ss.staff_id = s.staff_id
-                        JOIN Role r ON s.role_id = r.role_id
-                        WHERE ss.shift_date = %s
-                    """, (date,))
-                else:
-                    cursor.execute("""
-                        SELECT s.name, r.role_name, ss.start_time, ss.end_time
-                        FROM ShiftSchedule ss
-                        JOIN Staff s ON ss.staff_id = s.staff_id
-                        JOIN Role r ON s.role_id = r.role_id
-                        WHERE ss.shift_date = %s AND r.role_name = %s
-                    """, (date, selected_role))
-
-                shifts = cursor.fetchall()
-                if shifts:
-                    for name, role, start, end in shifts:
-                        st.write(f"👤 {name} ({role}) : {start} to {end}")
-                else:
-                    st.info("No shifts found for selected criteria.")
-
-            elif view_mode == "Date Range":
-                start_date = st.date_input("Start Date")
-                end_date = st.date_input("End Date")
-
-                if selected_role == "All":
-                    cursor.execute("""
-                        SELECT s.name, r.role_name, ss.shift_date, ss.start_time, ss.end_time
-                        FROM ShiftSchedule ss
-                        JOIN Staff s ON ss.staff_id = s.staff_id
-                        JOIN Role r ON s.role_id = r.role_id
-                        WHERE ss.shift_date BETWEEN %s AND %s
-                        ORDER BY ss.shift_date
-                    """, (start_date, end_date))
-                else:
-                    cursor.execute("""
-                        SELECT s.name, r.role_name, ss.shift_date, ss.start_time, ss.end_time
-                        FROM ShiftSchedule ss
-                        JOIN Staff s ON ss.staff_id = s.staff_id
-                        JOIN Role r ON s.role_id = r.role_id
-                        WHERE ss.shift_date BETWEEN %s AND %s
-                        AND r.role_name = %s
-                        ORDER BY ss.shift_date
-                    """, (start_date, end_date, selected_role))
-
-                shifts = cursor.fetchall()
-                if shifts:
-                    for name, role, shift_date, start, end in shifts:
-                        st.write(f" {shift_date} - {name} ({role}): {start} to {end}")
-                else:
-                    st.info("No shifts found for selected criteria.")
+        view_mode = st.radio("View Shifts By", ["Single Date", "Date Range", "Staff Name/ID"])
 
-            
+        role_names = staffed_roles()
+        role_names.insert(0, "All")  # Add "All" option
+        selected_role = st.selectbox("Select Role", role_names,key="view_shifts_role")
+        role = None if selected_role == "All" else selected_role
 
-            elif view_mode == "Staff Name/ID":
-                if selected_role == "All":
-                    cursor.execute("""
-                        SELECT staff_id, name
-                        FROM Staff
-                    """)
-                else:
-                    cursor.execute("""
-                        SELECT s.staff_id, s.name
-                        FROM Staff s
-                        JOIN Role r ON s.role_id = r.role_id
-                        WHERE r.role_name = %s
-                    """, (selected_role,))
-                staff_list = cursor.fetchall()
-
-                if not staff_list:
-                    st.info("No staff found for selected role.")
-                else:
-                    staff_map = {f"{name} (ID: {sid})": sid for sid, name in staff_list}
-                    selected_staff = st.selectbox("Select Staff", list(staff_map.keys()))
-                    staff_id = staff_map[selected_staff]
+        if view_mode == "Single Date":
+            date = st.date_input("Select Shift Date")
+
+            shifts = list_shifts(date, role=role)
+            if shifts:
+                for shift in shifts:
+                    st.write(f"👤 {shift.name} ({shift.role_name}) : {shift.start_time} to {shift.end_time}")
+            else:
+                st.info("No shifts found for selected criteria.")
+
+        elif view_mode == "Date Range":
+            start_date = st.date_input("Start Date")
+            end_date = st.date_input("End Date")
 
-                    cursor.execute("""
-                        SELECT ss.shift_date, ss.start_time, ss.end_time 
-                        FROM ShiftSchedule ss
-                        WHERE ss.staff_id = %s
-                        ORDER BY ss.shift_date
-                    """, (staff_id,))
-                    shifts = cursor.fetchall()
+            shifts = list_shifts(start_date, end_date, role=role)
+            if shifts:
+                for shift in shifts:
+                    st.write(f" {shift.shift_date} - {shift.name} ({shift.role_name}): {shift.start_time} to {shift.end_time}")
+            else:
+                st.info("No shifts found for selected criteria.")
 
-                    if shifts:
-                        for s in shifts:
-                            st.write(f" {s[0]}: {s[1]} to {s[2]}")
-                    else:
-                        st.info("No shifts for selected staff.")
+        elif view_mode == "Staff Name/ID":
+            staff_list = list_staff(role)
+
+            if not staff_list:
+                st.info("No staff found for selected role.")
+            else:
+                staff_map = {f"{s.name} (ID: {s.staff_id})": s.staff_id for s in staff_list}
+                selected_staff = st.selectbox("Select Staff", list(staff_map.keys()))
+                staff_id = staff_map[selected_staff]
+
+                shifts = shifts_for_staff(staff_id)
+
+                if shifts:
+                    for shift in shifts:
+                        st.write(f" {shift.shift_date}: {shift.start_time} to {shift.end_time}")
+                else:
+                    st.info("No shifts for selected staff.")
 
 
     elif mode == "Manage Shifts":
@@ -414,40 +353,20 @@ def manager_manage_shifts():
 
         date = st.date_input("Select Date for Managing Shifts")
 
-        with db_cursor() as cursor:
-            cursor.execute("SELECT staff_id, name FROM Staff")
-            staff_data = cursor.fetchall()
-
-            cursor.execute("""
-                SELECT s.name, ss.shift_id, ss.staff_id, ss.start_time, ss.end_time
-                FROM ShiftSchedule ss
-                JOIN Staff s ON ss.staff_id = s.staff_id
-                WHERE ss.shift_date = %s
-            """, (date,))
-            shifts = cursor.fetchall()
+        staff_data = list_staff()
+        shifts = shifts_on(date)
 
         st.subheader(f"Shifts on {date}")
 
         # ------------------ Existing Shifts ------------------
-        for name, shift_id, sid, start, end in shifts:
-            try:
-                start_time_obj = parse_time_correctly(start)
-                end_time_obj = parse_time_correctly(end)
-            except Exception as e:
-                st.error(f"Error parsing shift times: {e}")
-                continue
-
-            with st.expander(f"{name} | {start_time_obj.strftime('%H:%M')} - {end_time_obj.strftime('%H:%M')}"):
-                new_start = st.time_input("Start Time", value=start_time_obj, key=f"start_{shift_id}")
-                new_end = st.time_input("End Time", value=end_time_obj, key=f"end_{shift_id}")
+        for name, shift_id, _, start_time, end_time in shifts:
+            with st.expander(f"{name} | {start_time.strftime('%H:%M')} - {end_time.strftime('%H:%M')}"):
+                new_start = st.time_input("Start Time", value=start_time, key=f"start_{shift_id}")
+                new_end = st.time_input("End Time", value=end_time, key=f"end_{shift_id}")
 
                 if st.button("Update Shift", key=f"update_shift_{shift_id}"):
                     try:
-                        with db_cursor() as cursor:
-                            cursor.execute(
-                                "UPDATE ShiftSchedule SET start_time = %s, end_time = %s WHERE shift_id = %s",
-                                (new_start.strftime("%H:%M:%S"), new_end.strftime("%H:%M:%S"), shift_id)
-                            )
+                        update_shift(shift_id, new_start, new_end)
                         st.success(f"Shift for {name} updated successfully!")
                         st.rerun()
                     except Exception as e:
@@ -455,8 +374,7 @@ def manager_manage_shifts():
 
                 if st.button("Delete Shift", key=f"delete_shift_{shift_id}"):
                     try:
-                        with db_cursor() as cursor:
-                            cursor.execute("DELETE FROM ShiftSchedule WHERE shift_id = %s", (shift_id,))
+                        delete_shift(shift_id)
                         st.success(f"Shift for {name} deleted successfully!")
                         st.rerun()
                     except Exception as e:
@@ -466,7 +384,7 @@ def manager_manage_shifts():
         st.markdown("---")
         st.header("Add New Shift")
 
-        staff_map = {f"{name} (ID: {sid})": sid for sid, name in staff_data}
+        staff_map = {f"{s.name} (ID: {s.staff_id})": s.staff_id for s in staff_data}
         selected_staff = st.selectbox("Select Staff to Add Shift", list(staff_map.keys()))
         staff_id = staff_map[selected_staff]
 
@@ -475,99 +393,140 @@ def manager_manage_shifts():
 
         if st.button("Add New Shift"):
             try:
-                with db_cursor() as cursor:
-                    cursor.execute(
-                        "INSERT INTO ShiftSchedule (staff_id, shift_date, start_time, end_time) VALUES (%s, %s, %s, %s)",
-                        (staff_id, date, start_time_new.strftime("%H:%M:%S"), end_time_new.strftime("%H:%M:%S"))
-                    )
+                add_shift(staff_id, date, start_time_new, end_time_new)
                 st.success("New shift added successfully!")
                 st.rerun()
             except Exception as e:
                 st.error(f"Error adding new shift: {e}")
 
+    elif mode == "Weekly Templates":
+        manage_shift_templates()
+
+
+# ------------------ WEEKLY SHIFT TEMPLATES ------------------
+def manage_shift_templates():
+    st.subheader("Weekly Shift Templates")
+
+    templates = {t.template_name: t.template_id for t in list_templates()}
+    with st.expander("New Template"):
+        new_name = st.text_input("Template Name")
+        if st.button("Create Template"):
+            try:
+                create_template(new_name)
+                st.success(f"Template '{new_name}' created.")
+                st.rerun()
+            except Exception as e:
+                st.error(f"Error creating template: {e}")
+
+    if not templates:
+        st.info("No shift templates yet.")
+        return
+
+    selected = st.selectbox("Template", list(templates.keys()))
+    template_id = templates[selected]
+
+    lines = template_lines(template_id)
+    for day_index, day_name in enumerate(WEEKDAYS):
+        day_lines = [line for line in lines if line.weekday == day_index]
+        if not day_lines:
+            continue
+        st.markdown(f"**{day_name}**")
+        for line in day_lines:
+            col1, col2 = st.columns([4, 1])
+            col1.write(f"{line.staff_name}: {line.start_time.strftime('%H:%M')} - {line.end_time.strftime('%H:%M')}")
+            if col2.button("Remove", key=f"template_line_rm_{line.template_line_id}"):
+                remove_template_shift(line.template_line_id)
+                st.rerun()
+
+    st.markdown("---")
+    st.markdown("**Add shift to template**")
+    staff_map = {f"{s.name} (ID: {s.staff_id})": s.staff_id for s in list_staff()}
+    selected_staff = st.selectbox("Staff", list(staff_map.keys()), key="template_staff")
+    weekdays = st.multiselect("Days", WEEKDAYS, default=WEEKDAYS[:5], key="template_days")
+    start_time = st.time_input("Start Time", key="template_start")
+    end_time = st.time_input("End Time", key="template_end")
+    if st.button("Add to Template"):
+        try:
+            add_template_shift(template_id, staff_map[selected_staff], [WEEKDAYS.index(day) for day in weekdays],
+                               start_time, end_time)
+            st.rerun()
+        except Exception as e:
+            st.error(f"Error adding template shift: {e}")
+
+    st.markdown("---")
+    st.markdown("**Apply to dates**")
+    start_date = st.date_input("From", key="template_from")
+    end_date = st.date_input("To", value=start_date + datetime.timedelta(days=6), key="template_to")
+    skip_conflicts = st.checkbox("Skip shifts that overlap existing ones instead of refusing the roster")
+    if st.button("Apply Template"):
+        try:
+            written, conflicts = apply_template(template_id, start_date, end_date, skip_conflicts)
+            st.success(f"Added {written} shifts from '{selected}'.")
+            for message in conflicts:
+                st.warning(f"Skipped: {message}")
+        except ValueError as e:
+            st.error("Roster not applied, these shifts overlap:")
+            for message in str(e).split("; "):
+                st.write(f"- {message}")
+
+    if st.button("Delete Template"):
+        delete_template(template_id)
+        st.success(f"Template '{selected}' deleted.")
+        st.rerun()
+
 
 # ------------------ MANAGE INVENTORY ------------------
 def manager_manage_inventory():
     st.header("Manage Inventory Items")
-    with db_cursor() as cursor:
-        cursor.execute("SELECT DISTINCT category FROM InventoryItem")
-        categories = [row[0] for row in cursor.fetchall()]
-        selected_category = st.selectbox("Select Category", categories)
-
-        cursor.execute("""
-            SELECT item_id, item_name, unit, current_quantity 
-            FROM InventoryItem 
-            WHERE category = %s
-        """, (selected_category,))
-        items = cursor.fetchall()
-
-    if items:
-        for item_id, name, unit, qty in items:
-            with st.expander(f"{name} ({qty} {unit})"):
-                new_name = st.text_input("Item Name", value=name, key=f"invname_{item_id}")
-                new_unit = st.text_input("Unit", value=unit, key=f"invunit_{item_id}")
-                new_qty = st.number_input("Quantity", value=float(qty), min_value=0.0, step=0.1, key=f"invqty_{item_id}")
-                if st.button("Update Item", key=f"update_item_{item_id}"):
-                    with db_cursor() as cursor:
-                        cursor.execute("""
-                            UPDATE InventoryItem 
-                            SET item_name = %s, unit = %s, current_quantity = %s 
-                            WHERE item_id = %s
-                        """, (new_name, new_unit, new_qty, item_id))
-                        st.success("Inventory item updated.")
-
-                if st.button("Delete Item", key=f"delete_item_{item_id}"):
-                    with db_cursor() as cursor:
-                        cursor.execute("DELETE FROM InventoryItem WHERE item_id = %s", (item_id,))
-                        st.success("Inventory item deleted.")
-    else:
-        st.info("No items found in selected category.")
+
+    running_low = low_stock.low_items()
+    if running_low:
+        st.warning("Below par: " + ", ".join(f"{name} ({qty} / {par} {unit})" for _, name, unit, qty, par in running_low))
+
+    edit_grid(GRIDS["inventory"])
 
     st.markdown("---")
     st.subheader("Add New Inventory Item")
     new_item_name = st.text_input("New Item Name")
     new_item_unit = st.text_input("New Unit")
     new_item_qty = st.number_input("New Quantity", min_value=0.0, step=0.1)
+    new_item_par = st.number_input("New Par Level", min_value=0.0, step=0.1)
     new_item_category = st.text_input("New Category")
 
     if st.button("Add New Item"):
-        with db_cursor() as cursor:
-            cursor.execute("""
-                INSERT INTO InventoryItem (item_name, unit, current_quantity, category)
-                VALUES (%s, %s, %s, %s)
-            """, (new_item_name, new_item_unit, new_item_qty, new_item_category))
-            st.success("New inventory item added.")
+        add_item(new_item_name, new_item_unit, new_item_qty, new_item_category, new_item_par)
+        st.success("New inventory item added.")
+
+
+# ------------------ RECIPES ------------------
+# Ingredients used per portion; stock is deducted when an order is placed
+def manage_recipe(menu_item_id):
+    st.markdown("**Recipe (per portion)**")
+    for ing_id, ing_name, unit, qty in recipe(menu_item_id):
+        col1, col2 = st.columns([4, 1])
+        col1.write(f"{ing_name}: {qty} {unit}")
+        if col2.button("Remove", key=f"recipe_rm_{menu_item_id}_{ing_id}"):
+            remove_ingredient(menu_item_id, ing_id)
+            st.rerun()
+
+    item_map = {f"{name} ({unit})": iid for iid, name, unit in inventory_items()}
+    if item_map:
+        col1, col2, col3 = st.columns([3, 2, 1])
+        ingredient = col1.selectbox("Ingredient", list(item_map.keys()), key=f"recipe_item_{menu_item_id}")
+        amount = col2.number_input("Quantity", min_value=0.0, step=0.01, format="%.3f", key=f"recipe_qty_{menu_item_id}")
+        if col3.button("Set", key=f"recipe_set_{menu_item_id}"):
+            try:
+                set_ingredient(menu_item_id, item_map[ingredient], amount)
+                st.rerun()
+            except ValueError as e:
+                st.error(str(e))
 
 
 # ------------------ MANAGE SUPPLIERS ------------------
 def manager_manage_suppliers():
     st.header("Manage Suppliers")
 
-    with db_cursor() as cursor:
-        cursor.execute("SELECT supplier_id, name, phone, category FROM Supplier")
-        suppliers = cursor.fetchall()
-
-    if suppliers:
-        for supplier_id, name, phone, category in suppliers:
-            with st.expander(f"{name} ({category})"):
-                new_name = st.text_input("Supplier Name", value=name, key=f"sup_name_{supplier_id}")
-                new_phone = st.text_input("Phone", value=phone, key=f"sup_phone_{supplier_id}")
-                new_category = st.text_input("Category", value=category, key=f"sup_category_{supplier_id}")
-
-                if st.button("Update Supplier", key=f"update_sup_{supplier_id}"):
-                    try:
-                        with db_cursor() as cursor:
-                            cursor.execute("""
-                                UPDATE Supplier
-                                SET name = %s, phone = %s, category = %s
-                                WHERE supplier_id = %s
-                            """, (new_name, new_phone, new_category, supplier_id))
-                        st.success("Supplier updated successfully!")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"Failed to update supplier: {e}")
-    else:
-        st.info("No suppliers found.")
+    edit_grid(GRIDS["suppliers"])
 
     st.markdown("---")
     st.subheader("Add New Supplier")
@@ -579,11 +538,7 @@ def manager_manage_suppliers():
     if st.button("Add Supplier"):
         if new_sup_name and new_sup_category:
             try:
-                with db_cursor() as cursor:
-                    cursor.execute("""
-                        INSERT INTO Supplier (name, phone, category)
-                        VALUES (%s, %s, %s)
-                    """, (new_sup_name, new_sup_phone, new_sup_category))
+                add_supplier(new_sup_name, new_sup_phone, new_sup_category)
                 st.success("New supplier added successfully!")
                 st.rerun()
             except Exception as e:
@@ -595,70 +550,151 @@ def manager_manage_suppliers():
 def manager_manage_menu_items():
     st.header("Manage Menu Items")
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
-        # Fetch existing menu items
-        cursor.execute("SELECT menu_item_id, name, price, is_available FROM MenuItem")
-        menu_items = cursor.fetchall()
-
-        if menu_items:
-            for item_id, name, price, available in menu_items:
-                with st.expander(f"{name} (Rs.{price:.2f}) - {'Available' if available else 'Unavailable'}"):
-                    new_name = st.text_input("New Name", value=name, key=f"menuname_{item_id}")
-                    new_price = st.number_input("New Price", min_value=0.0, value=float(price), key=f"menuprice_{item_id}")
-                    new_availability = st.checkbox("Available", value=bool(available), key=f"menuavail_{item_id}")
-
-                    if st.button("Update Menu Item", key=f"update_menu_{item_id}"):
-                        try:
-                            cursor.execute("""
-                                UPDATE MenuItem
-                                SET name = %s, price = %s, is_available = %s
-                                WHERE menu_item_id = %s
-                            """, (new_name, new_price, int(new_availability), item_id))
-                            conn.commit()
-                            st.success(f"Menu item '{new_name}' updated successfully!")
-                            st.rerun()
-                        except Exception as e:
-                            conn.rollback()
-                            st.error(f"Failed to update menu item: {e}")
-        else:
-            st.info("No menu items found.")
+    shown = edit_grid(GRIDS["menu"])
 
+    if shown:
         st.markdown("---")
-        st.subheader("Add New Menu Item")
+        st.subheader("Recipe")
+        item_map = {f"{row['name']} (#{row['menu_item_id']})": row["menu_item_id"] for row in shown}
+        selected_item = st.selectbox("Menu item on this page", list(item_map.keys()))
+        manage_recipe(item_map[selected_item])
 
-        # Fetch categories for new item
-        cursor.execute("SELECT category_id, category_name FROM MenuCategory")
-        categories = cursor.fetchall()
-        category_map = {name: cid for cid, name in categories}
+    st.markdown("---")
+    st.subheader("Add New Menu Item")
 
-        new_item_name = st.text_input("Item Name")
-        new_item_price = st.number_input("Price", min_value=0.0)
-        new_item_category = st.selectbox("Category", list(category_map.keys()))
+    # Fetch categories for new item
+    category_map = {name: cid for cid, name in menu_categories()}
 
-        if st.button("Add Menu Item"):
-            if new_item_name and new_item_category:
-                try:
-                    cursor.execute("""
-                        INSERT INTO MenuItem (name, price, category_id, is_available)
-                        VALUES (%s, %s, %s, 1)
-                    """, (new_item_name, new_item_price, category_map[new_item_category]))
-                    conn.commit()
-                    st.success(f"Menu item '{new_item_name}' added successfully!")
-                    st.rerun()
-                except Exception as e:
-                    conn.rollback()
-                    st.error(f"Failed to add new menu item: {e}")
-            else:
-                st.warning("Please fill all fields before adding a menu item.")
+    new_item_name = st.text_input("Item Name")
+    new_item_price = st.number_input("Price", min_value=0.0)
+    new_item_category = st.selectbox("Category", list(category_map.keys()))
+
+    if st.button("Add Menu Item"):
+        if new_item_name and new_item_category:
+            try:
+                add_menu_item(new_item_name, new_item_price, category_map[new_item_category])
+                st.success(f"Menu item '{new_item_name}' added successfully!")
+                st.rerun()
+            except Exception as e:
+                st.error(f"Failed to add new menu item: {e}")
+        else:
+            st.warning("Please fill all fields before adding a menu item.")
+
+
+# ------------------ EXPORT DATA ------------------
+# Files are streamed to EXPORT_DIR on the server; small ones can also be downloaded here
+DOWNLOAD_LIMIT_BYTES = 100 * 1024 * 1024
+
+def manager_export_data():
+    st.header("Export Orders, Invoices and Payments")
+    st.caption(f"Files are written to {os.path.abspath(EXPORT_DIR)}. Orders, order lines and invoices are "
+               "selected by order time, payments by the day they were received.")
+
+    today = datetime.date.today()
+    start_date = st.date_input("From", value=today.replace(day=1), key="export_from")
+    end_date = st.date_input("To", value=today, key="export_to")
+    names = st.multiselect("Tables", list(EXPORTS), default=list(EXPORTS))
+    fmt = st.radio("Format", FORMATS, horizontal=True)
+
+    if st.button("Export"):
+        try:
+            st.session_state.export_results = export(start_date, end_date, fmt, names)
+        except (RuntimeError, ValueError) as e:
+            st.error(str(e))
+
+    for name, path, written in st.session_state.get("export_results", []):
+        if not os.path.exists(path):
+            continue
+        size = os.path.getsize(path)
+        col1, col2 = st.columns([3, 1])
+        col1.write(f"**{name}**: {written} rows, {size / 1024:.0f} KB - `{path}`")
+        if size <= DOWNLOAD_LIMIT_BYTES:
+            with open(path, "rb") as f:
+                col2.download_button("Download", f, file_name=os.path.basename(path), key=f"export_dl_{name}")
+        else:
+            col2.write("Too large to download here; copy it from the server.")
+
+
+# ------------------ IMPORT DATA ------------------
+IMPORT_LABELS = {"menu": "Menu Items", "inventory": "Inventory Items", "suppliers": "Suppliers"}
+
+def manager_import_data():
+    st.header("Import from CSV")
+    kind = st.radio("Import", list(IMPORTS), format_func=IMPORT_LABELS.get, horizontal=True)
+    columns = [f"{column}{'' if default is None else ' (optional)'}" for column, _, default in IMPORTS[kind].fields]
+    st.caption(f"Columns: {', '.join(columns)}. Rows whose name already exists update that record; "
+               "the rest are added. Rows with errors are skipped.")
+
+    uploaded = st.file_uploader("CSV file", type=["csv"], key=f"import_file_{kind}")
+    dry_run = st.checkbox("Check only (don't save)", value=True)
+    if uploaded is not None and st.button("Import"):
+        try:
+            inserted, updated, errors = import_csv(
+                kind, io.TextIOWrapper(uploaded, encoding="utf-8-sig", newline=""), dry_run
+            )
+        except (ValueError, UnicodeDecodeError) as e:
+            st.error(f"Could not read the file: {e}")
+            return
+        except Exception as e:
+            st.error(f"Import failed, nothing was saved: {e}")
+            return
+        if dry_run:
+            st.info(f"Would add {inserted} and update {updated} rows; {len(errors)} row errors.")
+        else:
+            st.success(f"Added {inserted} and updated {updated} rows; {len(errors)} row errors.")
+        if errors:
+            st.dataframe([{"Line": line, "Column": column, "Error": message} for line, column, message in errors[:200]])
+            st.download_button("Download error report", error_report(errors), file_name=f"{kind}_import_errors.csv")
+
+
+# ------------------ DIAGNOSTICS ------------------
+def manager_diagnostics():
+    st.header("Diagnostics")
+    st.caption(f"Since process start. Percentiles cover the latest {METRICS_SAMPLES} timings per row; "
+               f"statements over {SLOW_QUERY_MS:g} ms are logged as slow.")
+
+    st.subheader("Pages")
+    page_rows = page_stats.summary()
+    if page_rows:
+        st.dataframe([{k: v for k, v in row.items() if k not in ("rows_per_call", "detail")} for row in page_rows])
+    else:
+        st.info("No pages timed yet.")
+
+    st.subheader("Queries")
+    query_rows = query_stats.summary()
+    if query_rows:
+        st.dataframe(query_rows)
+    else:
+        st.info("No queries timed yet.")
+
+    st.subheader("Recent slow queries")
+    if recent_slow_queries:
+        st.dataframe([
+            {"at": at, "call_site": label, "ms": ms, "rows": rows, "sql": sql}
+            for at, label, ms, rows, sql in reversed(recent_slow_queries)
+        ])
+    else:
+        st.info("No slow queries.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Connection pool")
+        st.json(pool_stats())
+    with col2:
+        st.subheader("Reference cache")
+        st.caption("This session")
+        st.json(session_cache_stats(st.session_state.get("cache_stats", {})))
+        st.caption("Whole process")
+        st.json(cache_stats())
+        st.subheader("Payment QR cache")
+        st.json(payment_qr_stats()._asdict())
+
+    if st.button("Reset timings"):
+        query_stats.reset()
+        page_stats.reset()
+        recent_slow_queries.clear()
+        st.rerun()
 
-    except Exception as e:
-        st.error(f"An error occurred while managing menu items: {e}")
-    finally:
-        cursor.close()
-        conn.close()
 
 # ------------------ MANAGER DASHBOARD ------------------
 def manager_dashboard():
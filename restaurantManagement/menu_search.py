@@ -0,0 +1,110 @@
+import heapq
+import re
+import threading
+import time
+from collections import defaultdict
+from db import db_cursor
+from config import MENU_SEARCH_TTL
+
+# ------------------ MENU SEARCH INDEX ------------------
+# Type-ahead search over every available dish, whatever its category. Built
+# from MenuItem in one query and then answered from memory:
+#   - word prefixes ("chi" -> Chicken Biryani, Chilli Paneer) for the
+#     cashier who types the start of each word, ranked first;
+#   - trigrams of each word for misspellings ("biriyani", "panner"),
+#     ranked by how many trigrams the query shares with the name.
+# Dropped by manager edits and rebuilt on the next search, or after
+# MENU_SEARCH_TTL to pick up edits made by other processes.
+
+MAX_PREFIX = 8          # longer query words are checked against the words themselves
+MIN_SIMILARITY = 0.5    # share of the query's trigrams a fuzzy match must contain
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+def words(text):
+    return _WORD.findall(text.lower())
+
+def trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class MenuSearchIndex:
+    def __init__(self, ttl=MENU_SEARCH_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._items = None                  # menu_item_id -> (name, price, words)
+        self._prefixes = defaultdict(set)   # word prefix -> menu_item_ids
+        self._trigrams = defaultdict(set)   # trigram -> menu_item_ids
+        self._loaded_at = 0
+
+    def _load(self):
+        with db_cursor() as cursor:
+            cursor.execute("SELECT menu_item_id, name, price FROM MenuItem WHERE is_available = 1")
+            rows = cursor.fetchall()
+        items, prefixes, grams = {}, defaultdict(set), defaultdict(set)
+        for item_id, name, price in rows:
+            name_words = words(name)
+            items[item_id] = (name, price, name_words)
+            for word in name_words:
+                for size in range(1, min(len(word), MAX_PREFIX) + 1):
+                    prefixes[word[:size]].add(item_id)
+                for gram in trigrams(word):
+                    grams[gram].add(item_id)
+        self._items, self._prefixes, self._trigrams = items, prefixes, grams
+        self._loaded_at = time.monotonic()
+
+    def _ensure(self):
+        if self._items is None or time.monotonic() - self._loaded_at > self.ttl:
+            self._load()
+
+    # Every query word starts some word of the name
+    def _prefix_matches(self, query_words):
+        matches = None
+        for word in query_words:
+            ids = self._prefixes.get(word[:MAX_PREFIX], set())
+            if len(word) > MAX_PREFIX:
+                ids = {i for i in ids if any(w.startswith(word) for w in self._items[i][2])}
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return set()
+        return matches
+
+    def _fuzzy_matches(self, query_words):
+        query_grams = set().union(*(trigrams(word) for word in query_words))
+        shared = defaultdict(int)
+        for gram in query_grams:
+            for item_id in self._trigrams.get(gram, ()):
+                shared[item_id] += 1
+        needed = len(query_grams)
+        return {item_id: count / needed for item_id, count in shared.items() if count / needed >= MIN_SIMILARITY}
+
+    # [(menu_item_id, name, price)], best match first
+    def search(self, query, limit=10):
+        query_words = words(query)
+        if not query_words:
+            return []
+        with self._lock:
+            self._ensure()
+            items = self._items
+            prefix = self._prefix_matches(query_words)
+            fuzzy = self._fuzzy_matches(query_words) if len(prefix) < limit else {}
+
+        def rank(i):
+            name, _, name_words = items[i]
+            in_order = len(name_words) >= len(query_words) and all(
+                w.startswith(q) for q, w in zip(query_words, name_words)
+            )
+            # prefix matches first, names starting with the query words in order first
+            # among those, then closest spelling, then shortest name
+            return (i not in prefix, not in_order, -fuzzy.get(i, 1.0), len(name), name)
+
+        best = heapq.nsmallest(limit, prefix | fuzzy.keys(), key=rank)
+        return [(i, items[i][0], items[i][1]) for i in best]
+
+    def clear(self):
+        with self._lock:
+            self._items = None
+
+
+menu_search = MenuSearchIndex()
@@ -0,0 +1,19 @@
+from db import db_cursor
+from reference_data import invalidate
+from menu_search import menu_search
+
+# New dishes go on the menu as available. Returns the new menu_item_id.
+def add_menu_item(name, price, category_id):
+    if not name:
+        raise ValueError("A menu item needs a name")
+    if price < 0:
+        raise ValueError("Price cannot be negative")
+    with db_cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO MenuItem (name, price, category_id, is_available)
+            VALUES (%s, %s, %s, 1)
+        """, (name, price, category_id))
+        menu_item_id = cursor.lastrowid
+    invalidate("MenuItem")
+    menu_search.clear()
+    return menu_item_id
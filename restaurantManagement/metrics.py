@@ -0,0 +1,196 @@
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from config import METRICS_SAMPLES, SLOW_QUERY_MS, SLOW_QUERY_LOG
+
+# ------------------ LATENCY METRICS ------------------
+# Process-wide timings for every SQL statement (keyed by call site) and every
+# page render (keyed by role and page name). Counts and totals cover the whole process
+# lifetime; percentiles are taken over the last METRICS_SAMPLES timings per key.
+
+slow_log = logging.getLogger("restaurant.slow_queries")
+_slow_log_lock = threading.Lock()
+_slow_log_ready = False
+
+# The file handler is attached on the first slow statement, so importing
+# this module (tests, scripts) never creates the log file
+def _slow_log():
+    global _slow_log_ready
+    with _slow_log_lock:
+        if not _slow_log_ready and SLOW_QUERY_LOG:
+            handler = logging.FileHandler(SLOW_QUERY_LOG)
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            slow_log.addHandler(handler)
+            slow_log.setLevel(logging.INFO)
+        _slow_log_ready = True
+    return slow_log
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+class LatencyStats:
+    def __init__(self, samples=METRICS_SAMPLES):
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._entries = {}   # key -> {"count", "total_ms", "rows", "errors", "detail", "timings"}
+
+    def record(self, key, elapsed_ms, rows=0, error=False, detail=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = {
+                    "count": 0, "total_ms": 0.0, "rows": 0, "errors": 0,
+                    "detail": detail, "timings": deque(maxlen=self.samples),
+                }
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["rows"] += rows
+            entry["errors"] += error
+            entry["timings"].append(elapsed_ms)
+
+    # One row per key, slowest p95 first
+    def summary(self):
+        with self._lock:
+            snapshot = [(key, dict(entry, timings=sorted(entry["timings"]))) for key, entry in self._entries.items()]
+        rows = []
+        for key, entry in snapshot:
+            timings = entry["timings"]
+            rows.append({
+                "name": key,
+                "count": entry["count"],
+                "mean_ms": round(entry["total_ms"] / entry["count"], 2),
+                "p50_ms": round(percentile(timings, 50), 2),
+                "p95_ms": round(percentile(timings, 95), 2),
+                "p99_ms": round(percentile(timings, 99), 2),
+                "max_ms": round(timings[-1], 2) if timings else 0.0,
+                "rows_per_call": round(entry["rows"] / entry["count"], 1),
+                "errors": entry["errors"],
+                "detail": entry["detail"],
+            })
+        return sorted(rows, key=lambda row: row["p95_ms"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+
+
+query_stats = LatencyStats()
+page_stats = LatencyStats()
+recent_slow_queries = deque(maxlen=50)
+
+
+# "order_service.list_orders:84" for the first frame outside the db layer
+_DB_LAYER = ("db.py", "db_backends.py", "contextlib.py", "metrics.py")
+
+def call_site():
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename.endswith(_DB_LAYER):
+        frame = frame.f_back
+    if frame is None:
+        return "unknown"
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+
+def compact_sql(sql, limit=300):
+    text = " ".join(sql.split())
+    return text if len(text) <= limit else text[:limit] + " ..."
+
+def record_query(label, sql, elapsed_ms, rows, error=False):
+    query_stats.record(label, elapsed_ms, rows, error, compact_sql(sql))
+    if elapsed_ms >= SLOW_QUERY_MS:
+        text = compact_sql(sql)
+        recent_slow_queries.append((time.strftime("%Y-%m-%d %H:%M:%S"), label, round(elapsed_ms, 1), rows, text))
+        (slow_log if _slow_log_ready else _slow_log()).warning("slow query %.1fms rows=%d at %s: %s", elapsed_ms, rows, label, text)
+
+
+# Cursor wrapper used by db: times execute plus the fetches that follow it, so
+# lazily-fetched results are charged to the statement that produced them
+class TimedCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._label = None
+        self._sql = None
+        self._elapsed = 0.0
+        self._affected = 0
+        self._fetched = 0
+        self._error = False
+
+    def _finish(self):
+        if self._label is not None:
+            record_query(self._label, self._sql, self._elapsed, self._fetched or self._affected, self._error)
+            self._label = None
+
+    def _run(self, method, sql, params):
+        self._finish()
+        self._label, self._sql = call_site(), sql
+        self._elapsed, self._affected, self._fetched, self._error = 0.0, 0, 0, False
+        started = time.perf_counter()
+        try:
+            return method(sql, params)
+        except Exception:
+            self._error = True
+            raise
+        finally:
+            self._elapsed = (time.perf_counter() - started) * 1000
+            self._affected = max(self._cursor.rowcount or 0, 0)
+
+    def execute(self, sql, params=()):
+        return self._run(self._cursor.execute, sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self._run(self._cursor.executemany, sql, seq_of_params)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._elapsed += (time.perf_counter() - started) * 1000
+        self._fetched += row is not None
+        return row
+
+    def fetchmany(self, *args):
+        started = time.perf_counter()
+        rows = self._cursor.fetchmany(*args)
+        self._elapsed += (time.perf_counter() - started) * 1000
+        self._fetched += len(rows)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._elapsed += (time.perf_counter() - started) * 1000
+        self._fetched += len(rows)
+        return rows
+
+    def __iter__(self):
+        row = self.fetchone()
+        while row is not None:
+            yield row
+            row = self.fetchone()
+
+    def close(self):
+        self._finish()
+        self._cursor.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+@contextmanager
+def timed_page(name):
+    started = time.perf_counter()
+    error = False
+    try:
+        yield
+    except Exception:
+        error = True
+        raise
+    finally:
+        page_stats.record(name, (time.perf_counter() - started) * 1000, error=error)
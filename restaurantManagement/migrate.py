@@ -0,0 +1,73 @@
+import os
+from db import db_cursor, backend
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+# migrations/<backend>/NAME.sql replaces NAME.sql where the dialects differ,
+# and can add backend-only steps (the SQLite base schema is 000_schema.sql)
+DIALECT_DIR = os.path.join(MIGRATIONS_DIR, backend.name)
+
+def migration_files():
+    files = {name: os.path.join(MIGRATIONS_DIR, name) for name in os.listdir(MIGRATIONS_DIR)}
+    if os.path.isdir(DIALECT_DIR):
+        files.update((name, os.path.join(DIALECT_DIR, name)) for name in os.listdir(DIALECT_DIR))
+    return sorted((name, path) for name, path in files.items() if name.endswith(".sql"))
+
+def split_statements(sql):
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [stmt.strip() for stmt in "\n".join(lines).split(";") if stmt.strip()]
+
+def applied_migrations(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS SchemaMigration (
+            name VARCHAR(255) PRIMARY KEY,
+            applied_at DATETIME NOT NULL
+        )
+    """)
+    cursor.execute("SELECT name FROM SchemaMigration")
+    return {row[0] for row in cursor.fetchall()}
+
+# {(name, step)} for the statements of partly applied files that already ran
+def applied_steps(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS SchemaMigrationStep (
+            name VARCHAR(255) NOT NULL,
+            step INT NOT NULL,
+            PRIMARY KEY (name, step)
+        )
+    """)
+    cursor.execute("SELECT name, step FROM SchemaMigrationStep")
+    return set(cursor.fetchall())
+
+# pool: the connection pool to migrate through, before get_pool() publishes it
+def run_migrations(pool=None):
+    with db_cursor(pool) as cursor:
+        done = applied_migrations(cursor)
+        steps = applied_steps(cursor)
+
+    applied = []
+    for name, path in migration_files():
+        if name in done:
+            continue
+        with open(path) as f:
+            statements = split_statements(f.read())
+        # MySQL commits DDL implicitly, so a file that fails partway cannot be
+        # rolled back: each statement is recorded as it completes, and a rerun
+        # resumes after the last one instead of repeating a CREATE INDEX or ADD COLUMN
+        for step, stmt in enumerate(statements):
+            if (name, step) in steps:
+                continue
+            with db_cursor(pool) as cursor:
+                cursor.execute(stmt)
+                cursor.execute("INSERT INTO SchemaMigrationStep (name, step) VALUES (%s, %s)", (name, step))
+        with db_cursor(pool) as cursor:
+            cursor.execute("INSERT INTO SchemaMigration (name, applied_at) VALUES (%s, NOW())", (name,))
+            cursor.execute("DELETE FROM SchemaMigrationStep WHERE name = %s", (name,))
+        applied.append(name)
+    return applied
+
+if __name__ == "__main__":
+    applied = run_migrations()
+    for name in applied:
+        print(f"Applied {name}")
+    if not applied:
+        print("Schema is up to date.")
@@ -0,0 +1,6 @@
+-- Indexes behind the date filters used by the admin and manager screens
+CREATE INDEX idx_order_order_time ON `Order` (order_time);
+CREATE INDEX idx_orderdetail_order_id ON OrderDetail (order_id);
+CREATE INDEX idx_reservation_date ON Reservation (reservation_date);
+CREATE INDEX idx_event_date ON Event (event_date);
+CREATE INDEX idx_shiftschedule_date ON ShiftSchedule (shift_date);
@@ -0,0 +1,16 @@
+-- Store reservation slots as real TIME columns instead of "HH:MM-HH:MM" strings
+ALTER TABLE Reservation ADD COLUMN start_time TIME NULL, ADD COLUMN end_time TIME NULL;
+
+UPDATE Reservation
+SET start_time = STR_TO_DATE(TRIM(SUBSTRING_INDEX(time_slot, '-', 1)), '%H:%i'),
+    end_time = STR_TO_DATE(TRIM(SUBSTRING_INDEX(time_slot, '-', -1)), '%H:%i')
+WHERE time_slot REGEXP '^ *[0-9]{1,2}:[0-9]{2} *- *[0-9]{1,2}:[0-9]{2} *$';
+
+-- Unreadable slots block the whole day rather than risk a double booking
+UPDATE Reservation
+SET start_time = '00:00:00', end_time = '24:00:00'
+WHERE start_time IS NULL OR end_time IS NULL OR end_time <= start_time;
+
+ALTER TABLE Reservation MODIFY start_time TIME NOT NULL, MODIFY end_time TIME NOT NULL;
+
+CREATE INDEX idx_reservation_table_slot ON Reservation (table_id, reservation_date, start_time, end_time);
@@ -0,0 +1,14 @@
+-- Bill of materials: how much of each inventory item one portion of a dish uses
+CREATE TABLE Recipe (
+    menu_item_id INT NOT NULL,
+    item_id INT NOT NULL,
+    quantity DECIMAL(10,3) NOT NULL,
+    PRIMARY KEY (menu_item_id, item_id),
+    FOREIGN KEY (menu_item_id) REFERENCES MenuItem(menu_item_id),
+    FOREIGN KEY (item_id) REFERENCES InventoryItem(item_id)
+);
+
+CREATE INDEX idx_recipe_item ON Recipe (item_id);
+
+-- Items whose stock falls below par are flagged as low
+ALTER TABLE InventoryItem ADD COLUMN par_level DECIMAL(10,2) NOT NULL DEFAULT 0;
@@ -0,0 +1,33 @@
+-- Daily sales totals, kept current by order and payment writes (sales_service)
+-- and rebuilt from the base tables with: python sales_service.py --rebuild
+CREATE TABLE DailySales (
+    sales_date DATE NOT NULL PRIMARY KEY,
+    orders INT NOT NULL DEFAULT 0,
+    items_sold INT NOT NULL DEFAULT 0,
+    gross_amount DECIMAL(12,2) NOT NULL DEFAULT 0,
+    net_amount DECIMAL(12,2) NOT NULL DEFAULT 0
+);
+
+CREATE TABLE DailyItemSales (
+    sales_date DATE NOT NULL,
+    menu_item_id INT NOT NULL,
+    quantity INT NOT NULL DEFAULT 0,
+    gross_amount DECIMAL(12,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (sales_date, menu_item_id)
+);
+
+CREATE TABLE DailyCategorySales (
+    sales_date DATE NOT NULL,
+    category_id INT NOT NULL,
+    quantity INT NOT NULL DEFAULT 0,
+    gross_amount DECIMAL(12,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (sales_date, category_id)
+);
+
+CREATE TABLE DailyPaymentSales (
+    sales_date DATE NOT NULL,
+    payment_method VARCHAR(10) NOT NULL,
+    payments INT NOT NULL DEFAULT 0,
+    amount DECIMAL(12,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (sales_date, payment_method)
+);
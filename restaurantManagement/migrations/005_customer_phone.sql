@@ -0,0 +1,6 @@
+-- One customer per phone number: lookups match on the digits-only phone_key.
+-- Existing rows are filled in (and duplicates merged) by
+-- python customer_service.py --merge-duplicates
+ALTER TABLE Customer ADD COLUMN phone_key VARCHAR(20);
+
+CREATE INDEX idx_customer_phone_key ON Customer (phone_key);
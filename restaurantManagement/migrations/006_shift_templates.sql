@@ -0,0 +1,20 @@
+-- Reusable weekly rosters: each line is one staff member's shift on one
+-- weekday (0 = Monday ... 6 = Sunday), applied over a date range by shift_service
+CREATE TABLE ShiftTemplate (
+    template_id INT AUTO_INCREMENT PRIMARY KEY,
+    template_name VARCHAR(100) NOT NULL UNIQUE
+);
+
+CREATE TABLE ShiftTemplateLine (
+    template_line_id INT AUTO_INCREMENT PRIMARY KEY,
+    template_id INT NOT NULL,
+    staff_id INT NOT NULL,
+    weekday INT NOT NULL,
+    start_time TIME NOT NULL,
+    end_time TIME NOT NULL,
+    FOREIGN KEY (template_id) REFERENCES ShiftTemplate(template_id),
+    FOREIGN KEY (staff_id) REFERENCES Staff(staff_id)
+);
+
+-- Overlap checks read a staff member's shifts around the dates being written
+CREATE INDEX idx_shiftschedule_staff_date ON ShiftSchedule (staff_id, shift_date);
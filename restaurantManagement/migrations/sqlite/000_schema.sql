@@ -0,0 +1,210 @@
+-- Base schema for the embedded SQLite backend (the MySQL database is created
+-- by hand from the project schema). Later migrations run on top of this one.
+CREATE TABLE Role (
+    role_id INTEGER PRIMARY KEY,
+    role_name VARCHAR(50) NOT NULL UNIQUE
+);
+
+CREATE TABLE user (
+    user_id INTEGER PRIMARY KEY,
+    username VARCHAR(50) NOT NULL,
+    password VARCHAR(255) NOT NULL,
+    role_id INT NOT NULL REFERENCES Role(role_id)
+);
+
+CREATE TABLE Staff (
+    staff_id INTEGER PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    phone VARCHAR(20),
+    role_id INT NOT NULL REFERENCES Role(role_id),
+    salary DECIMAL(10,2) DEFAULT 0
+);
+
+CREATE TABLE Customer (
+    customer_id INTEGER PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    phone VARCHAR(20)
+);
+
+CREATE TABLE `Table` (
+    table_id INTEGER PRIMARY KEY,
+    table_number INT NOT NULL UNIQUE,
+    seating_capacity INT NOT NULL,
+    status VARCHAR(20) DEFAULT 'Available' CHECK (status IN ('Available', 'Reserved'))
+);
+
+CREATE TABLE Reservation (
+    reservation_id INTEGER PRIMARY KEY,
+    customer_id INT NOT NULL REFERENCES Customer(customer_id),
+    table_id INT NOT NULL REFERENCES `Table`(table_id),
+    reservation_date DATE NOT NULL,
+    time_slot VARCHAR(50) NOT NULL,
+    guest_count INT NOT NULL,
+    status VARCHAR(20) DEFAULT 'Reserved' CHECK (status IN ('Reserved', 'Cancelled'))
+);
+
+CREATE TABLE MenuCategory (
+    category_id INTEGER PRIMARY KEY,
+    category_name VARCHAR(50) NOT NULL UNIQUE
+);
+
+CREATE TABLE MenuItem (
+    menu_item_id INTEGER PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    price DECIMAL(10,2) NOT NULL,
+    category_id INT NOT NULL REFERENCES MenuCategory(category_id),
+    is_available BOOLEAN DEFAULT 1
+);
+
+CREATE TABLE `Order` (
+    order_id INTEGER PRIMARY KEY,
+    staff_id INT REFERENCES Staff(staff_id),
+    customer_id INT NOT NULL REFERENCES Customer(customer_id),
+    order_time DATETIME DEFAULT (DATETIME('now', 'localtime')),
+    status VARCHAR(20) DEFAULT 'Placed' CHECK (status IN ('Placed', 'Cancelled'))
+);
+
+CREATE TABLE OrderDetail (
+    order_detail_id INTEGER PRIMARY KEY,
+    order_id INT NOT NULL REFERENCES `Order`(order_id),
+    menu_item_id INT NOT NULL REFERENCES MenuItem(menu_item_id),
+    quantity INT NOT NULL,
+    price DECIMAL(10,2) NOT NULL
+);
+
+CREATE TABLE Discount (
+    discount_id INTEGER PRIMARY KEY,
+    discount_code VARCHAR(50) UNIQUE NOT NULL,
+    discount_percentage DECIMAL(5,2) NOT NULL
+);
+
+CREATE TABLE Invoice (
+    invoice_id INTEGER PRIMARY KEY,
+    order_id INT REFERENCES `Order`(order_id),
+    total_amount DECIMAL(10,2) NOT NULL,
+    discount_id INT REFERENCES Discount(discount_id),
+    created_at DATETIME DEFAULT (DATETIME('now', 'localtime'))
+);
+
+CREATE TABLE Payment (
+    payment_id INTEGER PRIMARY KEY,
+    invoice_id INT NOT NULL REFERENCES Invoice(invoice_id),
+    amount_paid DECIMAL(10,2) NOT NULL,
+    payment_method VARCHAR(10) DEFAULT 'Cash' CHECK (payment_method IN ('Cash', 'UPI')),
+    payment_date DATETIME DEFAULT (DATETIME('now', 'localtime'))
+);
+
+CREATE TABLE InventoryItem (
+    item_id INTEGER PRIMARY KEY,
+    item_name VARCHAR(100) NOT NULL,
+    unit VARCHAR(50),
+    current_quantity DECIMAL(10,2) DEFAULT 0,
+    category VARCHAR(50) NOT NULL
+);
+
+CREATE TABLE Supplier (
+    supplier_id INTEGER PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    phone VARCHAR(20),
+    category VARCHAR(50) NOT NULL
+);
+
+CREATE TABLE Purchase (
+    purchase_id INTEGER PRIMARY KEY,
+    supplier_id INT NOT NULL REFERENCES Supplier(supplier_id),
+    staff_id INT NOT NULL REFERENCES Staff(staff_id),
+    purchase_date DATE NOT NULL,
+    status VARCHAR(20) DEFAULT 'Ordered' CHECK (status IN ('Ordered', 'Received', 'Cancelled')),
+    total_amount DECIMAL(10,2) DEFAULT 0
+);
+
+CREATE TABLE PurchaseDetail (
+    purchase_detail_id INTEGER PRIMARY KEY,
+    purchase_id INT NOT NULL REFERENCES Purchase(purchase_id),
+    item_id INT NOT NULL REFERENCES InventoryItem(item_id),
+    quantity DECIMAL(10,2) NOT NULL,
+    price_per_unit DECIMAL(10,2) NOT NULL
+);
+
+CREATE TABLE Event (
+    event_id INTEGER PRIMARY KEY,
+    event_name VARCHAR(100) NOT NULL,
+    event_date DATE NOT NULL,
+    start_time TIME NOT NULL,
+    end_time TIME NOT NULL,
+    location VARCHAR(100) NOT NULL,
+    created_by_staff_id INT NOT NULL REFERENCES Staff(staff_id)
+);
+
+CREATE TABLE EventBooking (
+    event_booking_id INTEGER PRIMARY KEY,
+    event_id INT NOT NULL REFERENCES Event(event_id),
+    customer_id INT NOT NULL REFERENCES Customer(customer_id),
+    booking_date DATE,
+    guest_count INT NOT NULL
+);
+
+CREATE TABLE ShiftSchedule (
+    shift_id INTEGER PRIMARY KEY,
+    staff_id INT NOT NULL REFERENCES Staff(staff_id),
+    shift_date DATE NOT NULL,
+    start_time TIME NOT NULL,
+    end_time TIME NOT NULL
+);
+
+-- InnoDB indexes foreign key columns automatically; SQLite needs them spelled out
+CREATE INDEX idx_user_role ON user (role_id);
+CREATE INDEX idx_staff_role ON Staff (role_id);
+CREATE INDEX idx_reservation_customer ON Reservation (customer_id);
+CREATE INDEX idx_reservation_table ON Reservation (table_id);
+CREATE INDEX idx_menuitem_category ON MenuItem (category_id);
+CREATE INDEX idx_order_staff ON `Order` (staff_id);
+CREATE INDEX idx_order_customer ON `Order` (customer_id);
+CREATE INDEX idx_orderdetail_menu_item ON OrderDetail (menu_item_id);
+CREATE INDEX idx_invoice_order ON Invoice (order_id);
+CREATE INDEX idx_invoice_discount ON Invoice (discount_id);
+CREATE INDEX idx_payment_invoice ON Payment (invoice_id);
+CREATE INDEX idx_purchase_supplier ON Purchase (supplier_id);
+CREATE INDEX idx_purchase_staff ON Purchase (staff_id);
+CREATE INDEX idx_purchasedetail_purchase ON PurchaseDetail (purchase_id);
+CREATE INDEX idx_purchasedetail_item ON PurchaseDetail (item_id);
+CREATE INDEX idx_event_staff ON Event (created_by_staff_id);
+CREATE INDEX idx_eventbooking_event ON EventBooking (event_id);
+CREATE INDEX idx_eventbooking_customer ON EventBooking (customer_id);
+CREATE INDEX idx_shiftschedule_staff ON ShiftSchedule (staff_id);
+
+-- Starter reference data so a fresh database can be logged into and used
+INSERT INTO Role (role_name) VALUES ('Admin'), ('Manager'), ('chef');
+
+INSERT INTO user (username, password, role_id) VALUES
+('admin1', 'adm123', 1),
+('manager1', 'manager123', 2);
+
+INSERT INTO Staff (name, phone, role_id, salary) VALUES
+('John Admin', '9876543210', 1, 50000),
+('Sara Manager', '9876543211', 2, 40000),
+('Mike Staff', '9876543212', 3, 25000);
+
+INSERT INTO `Table` (table_number, seating_capacity) VALUES (1, 4), (2, 6), (3, 2);
+
+INSERT INTO MenuCategory (category_name) VALUES ('Tiffins'), ('Lunch'), ('Snacks'), ('Drinks');
+
+INSERT INTO MenuItem (name, price, category_id) VALUES
+('Idli', 50, 1),
+('Dosa', 70, 1),
+('Veg Thali', 150, 2),
+('Chicken Biryani', 200, 2),
+('French Fries', 90, 3),
+('Coke', 60, 4);
+
+INSERT INTO Discount (discount_code, discount_percentage) VALUES ('NEWUSER10', 10.00), ('SUMMER20', 20.00);
+
+INSERT INTO InventoryItem (item_name, unit, current_quantity, category) VALUES
+('Rice', 'kg', 100, 'Grocery'),
+('Chicken', 'kg', 50, 'Meat'),
+('Coke Bottles', 'bottle', 200, 'Drinks');
+
+INSERT INTO Supplier (name, phone, category) VALUES
+('FreshFoods', '9999999990', 'Grocery'),
+('MeatMaster', '9999999991', 'Meat'),
+('CoolDrinks Co.', '9999999992', 'Drinks');
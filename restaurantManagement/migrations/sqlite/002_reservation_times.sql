@@ -0,0 +1,15 @@
+-- SQLite version of 002: no MODIFY COLUMN, so the columns are added NOT NULL
+-- with the "whole day" default and readable "HH:MM-HH:MM" slots are backfilled
+ALTER TABLE Reservation ADD COLUMN start_time TIME NOT NULL DEFAULT '00:00:00';
+ALTER TABLE Reservation ADD COLUMN end_time TIME NOT NULL DEFAULT '24:00:00';
+
+UPDATE Reservation
+SET start_time = substr(time_slot, 1, 5) || ':00',
+    end_time = substr(time_slot, 7, 5) || ':00'
+WHERE time_slot GLOB '[0-9][0-9]:[0-9][0-9]-[0-9][0-9]:[0-9][0-9]';
+
+UPDATE Reservation
+SET start_time = '00:00:00', end_time = '24:00:00'
+WHERE end_time <= start_time;
+
+CREATE INDEX idx_reservation_table_slot ON Reservation (table_id, reservation_date, start_time, end_time);
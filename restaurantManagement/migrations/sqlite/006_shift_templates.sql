@@ -0,0 +1,21 @@
+-- SQLite version of 006: INTEGER PRIMARY KEY instead of AUTO_INCREMENT, and
+-- the foreign key columns indexed explicitly
+CREATE TABLE ShiftTemplate (
+    template_id INTEGER PRIMARY KEY,
+    template_name VARCHAR(100) NOT NULL UNIQUE
+);
+
+CREATE TABLE ShiftTemplateLine (
+    template_line_id INTEGER PRIMARY KEY,
+    template_id INT NOT NULL REFERENCES ShiftTemplate(template_id),
+    staff_id INT NOT NULL REFERENCES Staff(staff_id),
+    weekday INT NOT NULL,
+    start_time TIME NOT NULL,
+    end_time TIME NOT NULL
+);
+
+CREATE INDEX idx_shifttemplateline_template ON ShiftTemplateLine (template_id);
+CREATE INDEX idx_shifttemplateline_staff ON ShiftTemplateLine (staff_id);
+
+-- Overlap checks read a staff member's shifts around the dates being written
+CREATE INDEX idx_shiftschedule_staff_date ON ShiftSchedule (staff_id, shift_date);
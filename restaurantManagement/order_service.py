@@ -0,0 +1,192 @@
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from db import db_cursor
+from utils import day_range
+from records import OrderSummary, OrderLine, InvoiceHeader
+from recipe_service import deplete_stock, restock, stock_usage
+from low_stock import low_stock
+from sales_service import add_order_sales, add_payment_sales
+from customer_service import upsert_customer
+
+# Order write path with no Streamlit dependency, so it can be driven
+# directly by benchmarks, load tests and other clients.
+
+def order_total(lines, discount_percent=0):
+    total = sum(qty * price for _, qty, price in lines)
+    if discount_percent:
+        total *= 1 - Decimal(str(discount_percent)) / 100
+    return total
+
+def insert_order(cursor, staff_id, customer_id, lines, total, discount_id=None, order_time=None):
+    cursor.execute("""
+        INSERT INTO `Order` (staff_id, customer_id, order_time, status)
+        VALUES (%s, %s, %s, 'Placed')
+    """, (staff_id, customer_id, order_time or datetime.now()))
+    order_id = cursor.lastrowid
+
+    # executemany on a single INSERT ... VALUES is sent as one multi-row insert
+    cursor.executemany("""
+        INSERT INTO OrderDetail (order_id, menu_item_id, quantity, price)
+        VALUES (%s, %s, %s, %s)
+    """, [(order_id, item_id, qty, price) for item_id, qty, price in lines])
+
+    cursor.execute("""
+        INSERT INTO Invoice (order_id, total_amount, discount_id, created_at)
+        VALUES (%s, %s, %s, NOW())
+    """, (order_id, total, discount_id))
+    return order_id, cursor.lastrowid
+
+def insert_payment(cursor, invoice_id, amount, method):
+    paid_at = datetime.now()
+    cursor.execute("""
+        INSERT INTO Payment (invoice_id, amount_paid, payment_method, payment_date)
+        VALUES (%s, %s, %s, %s)
+    """, (invoice_id, amount, method, paid_at))
+    add_payment_sales(cursor, paid_at.date(), method, amount)
+
+# lines: [(menu_item_id, quantity), ...] -> [(menu_item_id, quantity, price), ...]
+# at the current menu price; unknown or unavailable dishes are refused
+def priced_lines(cursor, lines):
+    if any(qty <= 0 for _, qty in lines):
+        raise ValueError("Quantities must be positive")
+    item_ids = sorted({item_id for item_id, _ in lines})
+    placeholders = ", ".join(["%s"] * len(item_ids))
+    cursor.execute(f"""
+        SELECT menu_item_id, price FROM MenuItem
+        WHERE menu_item_id IN ({placeholders}) AND is_available = 1
+    """, tuple(item_ids))
+    prices = dict(cursor.fetchall())
+    missing = [item_id for item_id in item_ids if item_id not in prices]
+    if missing:
+        raise ValueError(f"Not on the menu: {', '.join(f'#{item_id}' for item_id in missing)}")
+    return [(item_id, qty, prices[item_id]) for item_id, qty in lines]
+
+# lines: [(menu_item_id, quantity), ...]; prices are read from MenuItem, never
+# taken from the caller.
+# Customer, Order, OrderDetail, Invoice (and Payment when payment_method is
+# given) are written, recipe stock deducted and the sales rollups updated,
+# in one transaction.
+# Returns (order_id, invoice_id, total).
+def place_order(staff_id, customer_name, phone, lines, discount_id=None, discount_percent=0, payment_method=None):
+    if not lines:
+        raise ValueError("Cannot place an order with no items")
+    order_time = datetime.now()
+    with db_cursor() as cursor:
+        lines = priced_lines(cursor, lines)
+        total = order_total(lines, discount_percent)
+        customer_id = upsert_customer(cursor, customer_name, phone)
+        order_id, invoice_id = insert_order(cursor, staff_id, customer_id, lines, total, discount_id, order_time)
+        deplete_stock(cursor, order_id)
+        add_order_sales(cursor, order_time.date(), lines, total)
+        if payment_method:
+            insert_payment(cursor, invoice_id, total, payment_method)
+    low_stock.apply(stock_usage(lines), -1)
+    return order_id, invoice_id, total
+
+def record_payment(invoice_id, amount, method):
+    with db_cursor() as cursor:
+        insert_payment(cursor, invoice_id, amount, method)
+
+# Only a placed order is cancelled, so its stock and sales are reversed exactly once
+def cancel_order(order_id):
+    with db_cursor() as cursor:
+        cursor.execute("UPDATE `Order` SET status = 'Cancelled' WHERE order_id = %s AND status = 'Placed'", (order_id,))
+        if cursor.rowcount == 0:
+            return False
+        restock(cursor, order_id)
+        cursor.execute("SELECT menu_item_id, quantity, price FROM OrderDetail WHERE order_id = %s", (order_id,))
+        lines = cursor.fetchall()
+        cursor.execute("""
+            SELECT o.order_time, i.total_amount
+            FROM `Order` o
+            JOIN Invoice i ON i.order_id = o.order_id
+            WHERE o.order_id = %s
+        """, (order_id,))
+        order_time, total = cursor.fetchone()
+        add_order_sales(cursor, order_time.date(), lines, total, sign=-1)
+    low_stock.apply(stock_usage(lines), +1)
+    return True
+
+
+# ------------------ ORDER HISTORY ------------------
+ORDERS_PAGE_SIZE = 25
+
+# Half-open range on the raw column so the order_time index can be used
+ORDER_RANGE = "o.order_time >= %s AND o.order_time < %s"
+
+# The screen queries are module constants so check_query_plans.py explains
+# exactly what runs here
+ORDERS_PAGE = f"""
+    SELECT o.order_id, c.name, o.order_time, o.status, SUM(od.quantity * od.price)
+    FROM `Order` o
+    JOIN Customer c ON o.customer_id = c.customer_id
+    JOIN OrderDetail od ON o.order_id = od.order_id
+    WHERE {ORDER_RANGE}
+    GROUP BY o.order_id
+    ORDER BY o.order_time, o.order_id
+    LIMIT %s OFFSET %s
+"""
+
+# {placeholders}: one %s per order id
+ORDER_ITEMS = """
+    SELECT od.order_id, m.name, od.quantity, od.price
+    FROM OrderDetail od
+    JOIN MenuItem m ON od.menu_item_id = m.menu_item_id
+    WHERE od.order_id IN ({placeholders})
+"""
+
+def count_orders(start_date, end_date):
+    with db_cursor() as cursor:
+        cursor.execute(f"""
+            SELECT COUNT(DISTINCT o.order_id)
+            FROM `Order` o
+            JOIN OrderDetail od ON o.order_id = od.order_id
+            WHERE {ORDER_RANGE}
+        """, day_range(start_date, end_date))
+        return cursor.fetchone()[0]
+
+# (order_id, customer_name, order_time, status, total) for one page of the range
+def list_orders(start_date, end_date, page=1, page_size=ORDERS_PAGE_SIZE):
+    with db_cursor() as cursor:
+        cursor.execute(ORDERS_PAGE, day_range(start_date, end_date) + (page_size, (page - 1) * page_size))
+        return OrderSummary.from_rows(cursor.fetchall())
+
+# One query for the line items of every requested order, grouped by order_id
+def fetch_order_items(order_ids):
+    items = defaultdict(list)
+    if not order_ids:
+        return items
+    placeholders = ", ".join(["%s"] * len(order_ids))
+    with db_cursor() as cursor:
+        cursor.execute(ORDER_ITEMS.format(placeholders=placeholders), tuple(order_ids))
+        for row in cursor.fetchall():
+            items[row[0]].append(OrderLine.from_row(row[1:]))
+    return items
+
+def invoice_details(invoice_id):
+    with db_cursor() as cursor:
+        cursor.execute("""
+            SELECT o.order_id, c.name, o.order_time
+            FROM `Order` o
+            JOIN Invoice i ON o.order_id = i.order_id
+            JOIN Customer c ON o.customer_id = c.customer_id
+            WHERE i.invoice_id = %s
+        """, (invoice_id,))
+        row = cursor.fetchone()
+        order_info = InvoiceHeader.from_row(row) if row else None
+
+        cursor.execute("""
+            SELECT m.name, od.quantity, od.price
+            FROM OrderDetail od
+            JOIN MenuItem m ON od.menu_item_id = m.menu_item_id
+            JOIN Invoice i ON od.order_id = i.order_id
+            WHERE i.invoice_id = %s
+        """, (invoice_id,))
+        items = OrderLine.from_rows(cursor.fetchall())
+    return order_info, items
+
+def find_discount(discount_code):
+    with db_cursor() as cursor:
+        cursor.execute("SELECT discount_id, discount_percentage FROM Discount WHERE discount_code = %s", (discount_code,))
+        return cursor.fetchone()
@@ -0,0 +1,156 @@
+from collections import defaultdict
+from db import db_cursor
+from low_stock import low_stock
+from records import PurchaseSummary, PurchaseLine
+
+PURCHASE_STATUSES = ["Ordered", "Received", "Cancelled"]
+PURCHASES_PAGE_SIZE = 25
+
+# ------------------ RECEIVING STOCK ------------------
+# A purchase's quantities are in stock exactly while its status is Received:
+# they are added when it moves to Received and taken back if it moves away.
+# Each move is a conditional UPDATE on the status, so a resubmitted or
+# concurrent request finds nothing left to change and applies nothing.
+
+# Same correlated form as recipe_service.ORDER_STOCK_UPDATE, portable to SQLite
+PURCHASE_STOCK_UPDATE = """
+    UPDATE InventoryItem
+    SET current_quantity = current_quantity {sign} (
+        SELECT SUM(pd.quantity)
+        FROM PurchaseDetail pd
+        WHERE pd.purchase_id IN ({ids}) AND pd.item_id = InventoryItem.item_id
+    )
+    WHERE item_id IN (
+        SELECT pd.item_id FROM PurchaseDetail pd WHERE pd.purchase_id IN ({ids})
+    )
+"""
+
+# Adds (sign "+") or removes (sign "-") the purchases' stock; returns {item_id: quantity}
+def apply_purchase_stock(cursor, purchase_ids, sign):
+    if not purchase_ids:
+        return {}
+    ids = ", ".join(["%s"] * len(purchase_ids))
+    cursor.execute(f"""
+        SELECT item_id, SUM(quantity) FROM PurchaseDetail
+        WHERE purchase_id IN ({ids})
+        GROUP BY item_id
+    """, tuple(purchase_ids))
+    received = dict(cursor.fetchall())
+    cursor.execute(PURCHASE_STOCK_UPDATE.format(sign=sign, ids=ids), tuple(purchase_ids) * 2)
+    return received
+
+# items: [(item_id, quantity, price_per_unit), ...]
+# Returns (purchase_id, total_amount)
+def record_purchase(supplier_id, staff_id, purchase_date, status, items):
+    total_amount = sum(qty * price for _, qty, price in items)
+    received = {}
+    with db_cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO Purchase (supplier_id, staff_id, purchase_date, status, total_amount)
+            VALUES (%s, %s, %s, %s, %s)
+        """, (supplier_id, staff_id, purchase_date, status, total_amount))
+        purchase_id = cursor.lastrowid
+
+        if items:
+            cursor.executemany("""
+                INSERT INTO PurchaseDetail (purchase_id, item_id, quantity, price_per_unit)
+                VALUES (%s, %s, %s, %s)
+            """, [(purchase_id, item_id, qty, price) for item_id, qty, price in items])
+        if status == "Received":
+            received = apply_purchase_stock(cursor, [purchase_id], "+")
+    low_stock.apply(received, +1)
+    return purchase_id, total_amount
+
+def count_purchases(start_date, end_date):
+    with db_cursor() as cursor:
+        cursor.execute("""
+            SELECT COUNT(*) FROM Purchase
+            WHERE purchase_date BETWEEN %s AND %s
+        """, (start_date, end_date))
+        return cursor.fetchone()[0]
+
+def list_purchases(start_date, end_date, page=1, page_size=PURCHASES_PAGE_SIZE):
+    with db_cursor() as cursor:
+        cursor.execute("""
+            SELECT p.purchase_id, s.name, p.purchase_date, p.status, p.total_amount
+            FROM Purchase p
+            JOIN Supplier s ON p.supplier_id = s.supplier_id
+            WHERE p.purchase_date BETWEEN %s AND %s
+            ORDER BY p.purchase_date, p.purchase_id
+            LIMIT %s OFFSET %s
+        """, (start_date, end_date, page_size, (page - 1) * page_size))
+        return PurchaseSummary.from_rows(cursor.fetchall())
+
+# One query for the details of every requested purchase, grouped by purchase_id
+def fetch_purchase_details(purchase_ids):
+    details = defaultdict(list)
+    if not purchase_ids:
+        return details
+    placeholders = ", ".join(["%s"] * len(purchase_ids))
+    with db_cursor() as cursor:
+        cursor.execute(f"""
+            SELECT pd.purchase_id, ii.item_name, pd.quantity, pd.price_per_unit
+            FROM PurchaseDetail pd
+            JOIN InventoryItem ii ON pd.item_id = ii.item_id
+            WHERE pd.purchase_id IN ({placeholders})
+        """, tuple(purchase_ids))
+        for row in cursor.fetchall():
+            details[row[0]].append(PurchaseLine.from_row(row[1:]))
+    return details
+
+def update_purchase_status(purchase_id, status):
+    if status not in PURCHASE_STATUSES:
+        raise ValueError(f"Unknown purchase status: {status}")
+    sign = +1
+    changed = {}
+    with db_cursor() as cursor:
+        if status == "Received":
+            cursor.execute("""
+                UPDATE Purchase SET status = 'Received'
+                WHERE purchase_id = %s AND status <> 'Received'
+            """, (purchase_id,))
+            if cursor.rowcount:
+                changed = apply_purchase_stock(cursor, [purchase_id], "+")
+        else:
+            cursor.execute("""
+                UPDATE Purchase SET status = %s
+                WHERE purchase_id = %s AND status = 'Received'
+            """, (status, purchase_id))
+            if cursor.rowcount:
+                sign = -1
+                changed = apply_purchase_stock(cursor, [purchase_id], "-")
+            else:
+                cursor.execute("UPDATE Purchase SET status = %s WHERE purchase_id = %s", (status, purchase_id))
+    low_stock.apply(changed, sign)
+
+class _ReceiveConflict(Exception):
+    pass
+
+# Receives every purchase still Ordered in the date range in one transaction:
+# one status UPDATE and one stock UPDATE, whatever the number of purchases.
+# Returns the number of purchases received.
+def receive_pending_purchases(start_date, end_date, attempts=3):
+    for _ in range(attempts):
+        try:
+            with db_cursor() as cursor:
+                cursor.execute("""
+                    SELECT purchase_id FROM Purchase
+                    WHERE purchase_date BETWEEN %s AND %s AND status = 'Ordered'
+                """, (start_date, end_date))
+                purchase_ids = [row[0] for row in cursor.fetchall()]
+                if not purchase_ids:
+                    return 0
+                ids = ", ".join(["%s"] * len(purchase_ids))
+                cursor.execute(f"""
+                    UPDATE Purchase SET status = 'Received'
+                    WHERE purchase_id IN ({ids}) AND status = 'Ordered'
+                """, tuple(purchase_ids))
+                # Another session changed some of them since the SELECT: roll back and start over
+                if cursor.rowcount != len(purchase_ids):
+                    raise _ReceiveConflict()
+                received = apply_purchase_stock(cursor, purchase_ids, "+")
+        except _ReceiveConflict:
+            continue
+        low_stock.apply(received, +1)
+        return len(purchase_ids)
+    raise RuntimeError("Purchases kept changing while being received; try again")
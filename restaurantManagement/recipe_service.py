@@ -0,0 +1,67 @@
+from collections import defaultdict
+from db import db_cursor
+from reference_data import recipe, invalidate
+
+# Stock an order's dishes use, applied as one set-based statement per order.
+# The correlated form runs unchanged on MySQL and SQLite (neither UPDATE ... JOIN
+# nor UPDATE ... FROM is portable), and never reads InventoryItem in a subquery.
+ORDER_STOCK_UPDATE = """
+    UPDATE InventoryItem
+    SET current_quantity = current_quantity {sign} (
+        SELECT SUM(r.quantity * od.quantity)
+        FROM OrderDetail od
+        JOIN Recipe r ON r.menu_item_id = od.menu_item_id
+        WHERE od.order_id = %s AND r.item_id = InventoryItem.item_id
+    )
+    WHERE item_id IN (
+        SELECT r.item_id
+        FROM OrderDetail od
+        JOIN Recipe r ON r.menu_item_id = od.menu_item_id
+        WHERE od.order_id = %s
+    )
+"""
+
+def deplete_stock(cursor, order_id):
+    cursor.execute(ORDER_STOCK_UPDATE.format(sign="-"), (order_id, order_id))
+
+def restock(cursor, order_id):
+    cursor.execute(ORDER_STOCK_UPDATE.format(sign="+"), (order_id, order_id))
+
+# lines: [(menu_item_id, quantity, price), ...] -> {item_id: amount used}, from cached recipes
+def stock_usage(lines):
+    usage = defaultdict(int)
+    for menu_item_id, qty, _ in lines:
+        for item_id, _, _, per_portion in recipe(menu_item_id):
+            usage[item_id] += per_portion * qty
+    return usage
+
+
+# ------------------ RECIPE EDITING ------------------
+def set_ingredient(menu_item_id, item_id, quantity):
+    if quantity <= 0:
+        raise ValueError("Ingredient quantity must be positive")
+    with db_cursor() as cursor:
+        cursor.execute("DELETE FROM Recipe WHERE menu_item_id = %s AND item_id = %s", (menu_item_id, item_id))
+        cursor.execute("""
+            INSERT INTO Recipe (menu_item_id, item_id, quantity)
+            VALUES (%s, %s, %s)
+        """, (menu_item_id, item_id, quantity))
+    invalidate("Recipe")
+
+def remove_ingredient(menu_item_id, item_id):
+    with db_cursor() as cursor:
+        cursor.execute("DELETE FROM Recipe WHERE menu_item_id = %s AND item_id = %s", (menu_item_id, item_id))
+    invalidate("Recipe")
+
+# ingredients: [(item_id, quantity), ...] replaces the dish's whole recipe
+def set_recipe(menu_item_id, ingredients):
+    if any(qty <= 0 for _, qty in ingredients):
+        raise ValueError("Ingredient quantities must be positive")
+    with db_cursor() as cursor:
+        cursor.execute("DELETE FROM Recipe WHERE menu_item_id = %s", (menu_item_id,))
+        if ingredients:
+            cursor.executemany("""
+                INSERT INTO Recipe (menu_item_id, item_id, quantity)
+                VALUES (%s, %s, %s)
+            """, [(menu_item_id, item_id, qty) for item_id, qty in ingredients])
+    invalidate("Recipe")
@@ -0,0 +1,265 @@
+import dataclasses
+import datetime
+import functools
+from decimal import Decimal
+
+# ------------------ ROW MODELS ------------------
+# Query results as slotted records with named fields instead of bare tuples.
+# Each model is a dataclass whose annotations say what the columns hold;
+# fields typed datetime.time or Decimal are decoded once, when the row is
+# read, by the converters below, so pages never re-parse TIME values
+# themselves. Records still unpack like the tuples they replace.
+
+CENT = Decimal("0.01")
+
+# TIME '24:00:00' (a slot running to midnight, e.g. the whole-day reservations
+# written by migration 002) has no datetime.time of its own; it reads as
+# time.max, which availability.slot_text and minutes_of turn back into 24:00
+END_OF_DAY = datetime.time.max
+DAY_SECONDS = 24 * 3600
+
+def _time_of_seconds(seconds, value):
+    if seconds == DAY_SECONDS:
+        return END_OF_DAY
+    if not 0 <= seconds < DAY_SECONDS:
+        raise ValueError(f"Not a time of day: {value!r}")
+    return datetime.time(seconds // 3600, seconds % 3600 // 60, seconds % 60)
+
+# mysql.connector returns TIME as timedelta (and so does the SQLite backend);
+# older rows and API input may be "H", "HH:MM" or "HH:MM:SS" strings.
+# The same few values repeat across a result set, so conversions are cached.
+@functools.lru_cache(maxsize=2048)
+def _decode_time(value):
+    if isinstance(value, datetime.timedelta):
+        return _time_of_seconds(int(value.total_seconds()), value)
+    if isinstance(value, datetime.datetime):
+        return value.time()
+    if isinstance(value, str):
+        parts = value.strip().split(":")
+        if 1 <= len(parts) <= 3 and all(part.isdigit() for part in parts):
+            hours, minutes, seconds = (list(map(int, parts)) + [0, 0])[:3]
+            if minutes < 60 and seconds < 60:
+                return _time_of_seconds(hours * 3600 + minutes * 60 + seconds, value)
+    raise ValueError(f"Not a time of day: {value!r}")
+
+def to_time(value):
+    if value is None or type(value) is datetime.time:
+        return value
+    return _decode_time(value)
+
+# DECIMAL columns arrive as Decimal, computed sums as float on SQLite
+def to_money(value):
+    if value is None:
+        return None
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return value.quantize(CENT)
+
+CONVERTERS = {datetime.time: to_time, Decimal: to_money}
+
+
+# Makes cls a slotted dataclass with from_row / from_rows loaders that apply
+# the converters for its typed fields
+def record(cls):
+    cls = dataclasses.dataclass(slots=True)(cls)
+    steps = tuple(
+        (position, CONVERTERS[field.type])
+        for position, field in enumerate(dataclasses.fields(cls)) if field.type in CONVERTERS
+    )
+    names = tuple(field.name for field in dataclasses.fields(cls))
+
+    if steps:
+        def from_row(row):
+            values = list(row)
+            for position, convert in steps:
+                values[position] = convert(values[position])
+            return cls(*values)
+    else:
+        def from_row(row):
+            return cls(*row)
+
+    def from_rows(rows):
+        return [from_row(row) for row in rows]
+
+    def __iter__(self):
+        return (getattr(self, name) for name in names)
+
+    cls.from_row = staticmethod(from_row)
+    cls.from_rows = staticmethod(from_rows)
+    cls.__iter__ = __iter__
+    return cls
+
+
+# ---- orders ----
+@record
+class OrderSummary:
+    order_id: int
+    customer_name: str
+    order_time: datetime.datetime
+    status: str
+    total: Decimal
+
+@record
+class OrderLine:
+    name: str
+    quantity: int
+    price: Decimal
+
+@record
+class InvoiceHeader:
+    order_id: int
+    customer_name: str
+    order_time: datetime.datetime
+
+
+# ---- reservations ----
+@record
+class Reservation:
+    reservation_id: int
+    customer_name: str
+    table_number: int
+    reservation_date: datetime.date
+    start_time: datetime.time
+    end_time: datetime.time
+    guest_count: int
+    status: str
+
+
+# ---- events ----
+@record
+class EventBooking:
+    event_name: str
+    location: str
+    event_date: datetime.date
+    start_time: datetime.time
+    end_time: datetime.time
+    customer_name: str
+    guest_count: int
+    booked_by: str
+
+@record
+class Event:
+    event_id: int
+    event_name: str
+    location: str
+    start_time: datetime.time
+    end_time: datetime.time
+
+@record
+class EventDetail:
+    event_name: str
+    location: str
+    start_time: datetime.time
+    end_time: datetime.time
+
+
+# ---- shifts ----
+@record
+class Shift:
+    name: str
+    role_name: str
+    shift_date: datetime.date
+    start_time: datetime.time
+    end_time: datetime.time
+
+@record
+class StaffShift:
+    shift_date: datetime.date
+    start_time: datetime.time
+    end_time: datetime.time
+
+@record
+class DayShift:
+    name: str
+    shift_id: int
+    staff_id: int
+    start_time: datetime.time
+    end_time: datetime.time
+
+@record
+class TemplateLine:
+    template_line_id: int
+    staff_id: int
+    staff_name: str
+    weekday: int
+    start_time: datetime.time
+    end_time: datetime.time
+
+@record
+class StaffMember:
+    staff_id: int
+    name: str
+
+@record
+class ScheduledShift:
+    shift_id: int
+    staff_id: int
+    shift_date: datetime.date
+    start_time: datetime.time
+    end_time: datetime.time
+
+@record
+class ShiftTemplate:
+    template_id: int
+    template_name: str
+
+
+# ---- reservation checks ----
+@record
+class ReservationSlot:
+    reservation_id: int
+    start_time: datetime.time
+    end_time: datetime.time
+
+@record
+class DoubleBooking:
+    table_id: int
+    reservation_date: datetime.date
+    reservation_id: int
+    conflicting_reservation_id: int
+
+
+# ---- inventory and purchases ----
+@record
+class StockLevel:
+    item_id: int
+    item_name: str
+    unit: str
+    current_quantity: Decimal
+    par_level: Decimal
+
+@record
+class PurchaseSummary:
+    purchase_id: int
+    supplier_name: str
+    purchase_date: datetime.date
+    status: str
+    total_amount: Decimal
+
+@record
+class PurchaseLine:
+    item_name: str
+    quantity: Decimal
+    price_per_unit: Decimal
+
+
+# ---- sales reports ----
+@record
+class DaySales:
+    sales_date: datetime.date
+    orders: int
+    items_sold: int
+    gross_amount: Decimal
+    net_amount: Decimal
+
+@record
+class GroupSales:
+    name: str
+    quantity: int
+    gross_amount: Decimal
+
+@record
+class PaymentSales:
+    payment_method: str
+    payments: int
+    amount: Decimal
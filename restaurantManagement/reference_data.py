@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import OrderedDict
+from db import db_cursor
+from config import REFERENCE_CACHE_TTL, REFERENCE_CACHE_SIZE
+
+# ------------------ TTL CACHE ------------------
+# Keys are tuples whose first element is the table they were read from,
+# so a write to a table can drop every cached query that depends on it.
+# Each table also has a generation, bumped on every invalidation: a load that
+# was running when its table was invalidated may have read the old rows, so
+# its result is returned but not cached.
+class TTLCache:
+    def __init__(self, maxsize=REFERENCE_CACHE_SIZE, ttl=REFERENCE_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+        self._session = threading.local()
+        self._generations = {}   # table -> invalidation count
+        self._clears = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self._count("hits")
+                return True, entry[1]
+            if entry is not None:
+                del self._data[key]
+            self._count("misses")
+            return False, None
+
+    # Lookups on this thread are also counted into stats, a dict the caller
+    # keeps per user session; the counters above are for the whole process
+    def bind_session(self, stats):
+        self._session.stats = stats
+
+    def _count(self, name):
+        self._stats[name] += 1
+        session = getattr(self._session, "stats", None)
+        if session is not None:
+            session[name] = session.get(name, 0) + 1
+
+    def set(self, key, value):
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def get_or_load(self, key, loader):
+        hit, value = self.get(key)
+        if not hit:
+            with self._lock:
+                generation = self._generation(key)
+            value = loader()
+            with self._lock:
+                if self._generation(key) == generation:
+                    self._store(key, value)
+        return value
+
+    # Changes whenever key's table is invalidated or the cache cleared; call with the lock held
+    def _generation(self, key):
+        return self._clears, self._generations.get(key[0], 0)
+
+    def invalidate(self, *tables):
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [key for key in self._data if key[0] in tables]
+            for key in stale:
+                del self._data[key]
+            self._stats["invalidations"] += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._clears += 1
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._data)
+        # Every hit is a database round-trip that did not happen
+        stats["round_trips_saved"] = stats["hits"]
+        return stats
+
+
+reference_cache = TTLCache()
+
+def _query(sql, params=()):
+    with db_cursor() as cursor:
+        cursor.execute(sql, params)
+        return tuple(cursor.fetchall())
+
+def invalidate(*tables):
+    reference_cache.invalidate(*tables)
+
+def cache_stats():
+    return reference_cache.stats()
+
+# The app binds a dict from st.session_state at the start of every script run
+def bind_session_stats(stats):
+    reference_cache.bind_session(stats)
+
+def session_cache_stats(stats):
+    hits, misses = stats.get("hits", 0), stats.get("misses", 0)
+    return {"hits": hits, "misses": misses, "round_trips_saved": hits}
+
+
+# ------------------ REFERENCE DATA ------------------
+def menu_categories():
+    return reference_cache.get_or_load(
+        ("MenuCategory",),
+        lambda: _query("SELECT category_id, category_name FROM MenuCategory")
+    )
+
+def available_menu_items(category_id):
+    return reference_cache.get_or_load(
+        ("MenuItem", "available", category_id),
+        lambda: _query(
+            "SELECT menu_item_id, name, price FROM MenuItem WHERE category_id = %s AND is_available = 1",
+            (category_id,)
+        )
+    )
+
+def menu_items():
+    return reference_cache.get_or_load(
+        ("MenuItem", "all"),
+        lambda: _query("SELECT menu_item_id, name, category_id FROM MenuItem")
+    )
+
+def roles():
+    return reference_cache.get_or_load(
+        ("Role",),
+        lambda: _query("SELECT role_id, role_name FROM Role")
+    )
+
+def suppliers():
+    return reference_cache.get_or_load(
+        ("Supplier",),
+        lambda: _query("SELECT supplier_id, name, category FROM Supplier")
+    )
+
+def inventory_items_by_category(category):
+    return reference_cache.get_or_load(
+        ("InventoryItem", category),
+        lambda: _query("SELECT item_id, item_name FROM InventoryItem WHERE category = %s", (category,))
+    )
+
+def inventory_items():
+    return reference_cache.get_or_load(
+        ("InventoryItem", "all"),
+        lambda: _query("SELECT item_id, item_name, unit FROM InventoryItem ORDER BY item_name")
+    )
+
+def recipe(menu_item_id):
+    return reference_cache.get_or_load(
+        ("Recipe", menu_item_id),
+        lambda: _query("""
+            SELECT r.item_id, i.item_name, i.unit, r.quantity
+            FROM Recipe r
+            JOIN InventoryItem i ON r.item_id = i.item_id
+            WHERE r.menu_item_id = %s
+        """, (menu_item_id,))
+    )
@@ -0,0 +1,129 @@
+from db import db_cursor, backend
+from records import Reservation, ReservationSlot, DoubleBooking
+from customer_service import upsert_customer
+from availability import availability, parse_slot
+
+RESERVATION_COLUMNS = """
+    SELECT r.reservation_id, c.name, t.table_number, r.reservation_date, r.start_time, r.end_time, r.guest_count, r.status
+    FROM Reservation r
+    JOIN Customer c ON r.customer_id = c.customer_id
+    JOIN `Table` t ON r.table_id = t.table_id
+"""
+RESERVATIONS_ON = RESERVATION_COLUMNS + " WHERE r.reservation_date = %s"
+RESERVATIONS_BETWEEN = RESERVATION_COLUMNS + " WHERE r.reservation_date BETWEEN %s AND %s"
+
+TIME_SLOTS = [
+    "09:00-10:00", "10:00-11:00", "11:00-12:00",
+    "12:00-13:00", "13:00-14:00", "14:00-15:00",
+    "15:00-16:00", "16:00-17:00", "17:00-18:00",
+    "18:00-19:00", "19:00-20:00", "20:00-21:00",
+    "21:00-22:00", "22:00-23:00"
+]
+
+# "HH:MM-HH:MM" -> ("HH:MM:00", "HH:MM:00") for the start_time/end_time columns
+def slot_bounds(time_slot):
+    start, end = parse_slot(time_slot)
+    return f"{start // 60:02d}:{start % 60:02d}:00", f"{end // 60:02d}:{end % 60:02d}:00"
+
+# With no dates every reservation is returned; with only start_date a single day.
+# (reservation_id, customer, table_number, date, start_time, end_time, guest_count, status)
+def list_reservations(start_date=None, end_date=None):
+    with db_cursor() as cursor:
+        if start_date is None:
+            cursor.execute(RESERVATION_COLUMNS)
+        elif end_date is None:
+            cursor.execute(RESERVATIONS_ON, (start_date,))
+        else:
+            cursor.execute(RESERVATIONS_BETWEEN, (start_date, end_date))
+        return Reservation.from_rows(cursor.fetchall())
+
+# Tables not booked for that date and slot, answered from the in-memory index
+def available_tables(reservation_date, time_slot, min_seats=1):
+    return availability.free_tables(reservation_date, time_slot, min_seats)
+
+
+# ------------------ OVERLAP QUERIES ------------------
+# Two intervals overlap when each starts before the other ends. Both
+# predicates are ranges on the (table_id, reservation_date, start_time,
+# end_time) index, so this never scans other tables or days.
+# Parameters: table_id, reservation_date, slot end, slot start
+OVERLAP_QUERY = """
+    SELECT reservation_id, start_time, end_time
+    FROM Reservation
+    WHERE table_id = %s AND reservation_date = %s
+      AND start_time < %s AND end_time > %s
+      AND status <> 'Cancelled'
+"""
+
+def overlapping_reservations(table_id, reservation_date, time_slot, exclude_reservation=None, cursor=None):
+    start, end = slot_bounds(time_slot)
+    query = OVERLAP_QUERY
+    params = [table_id, reservation_date, end, start]
+    if exclude_reservation is not None:
+        query += " AND reservation_id <> %s"
+        params.append(exclude_reservation)
+    if cursor is not None:
+        cursor.execute(query, tuple(params))
+        return ReservationSlot.from_rows(cursor.fetchall())
+    with db_cursor() as cursor:
+        cursor.execute(query, tuple(params))
+        return ReservationSlot.from_rows(cursor.fetchall())
+
+# Every pair of active reservations sharing a table with overlapping times
+# (table_id, reservation_date, first_reservation_id, second_reservation_id)
+def find_double_bookings(start_date, end_date):
+    with db_cursor() as cursor:
+        cursor.execute("""
+            SELECT a.table_id, a.reservation_date, a.reservation_id, b.reservation_id
+            FROM Reservation a
+            JOIN Reservation b
+              ON b.table_id = a.table_id
+             AND b.reservation_date = a.reservation_date
+             AND b.start_time < a.end_time AND b.end_time > a.start_time
+             AND b.reservation_id > a.reservation_id
+            WHERE a.reservation_date BETWEEN %s AND %s
+              AND a.status <> 'Cancelled' AND b.status <> 'Cancelled'
+            ORDER BY a.reservation_date, a.table_id
+        """, (start_date, end_date))
+        return DoubleBooking.from_rows(cursor.fetchall())
+
+
+# ------------------ WRITES ------------------
+def create_reservation(customer_name, phone, table_id, reservation_date, time_slot, guest_count):
+    start, end = slot_bounds(time_slot)
+    with db_cursor() as cursor:
+        # held until commit, so two bookings of one table cannot both pass the check
+        backend.lock_rows(cursor, "`Table`", "table_id", table_id)
+        if overlapping_reservations(table_id, reservation_date, time_slot, cursor=cursor):
+            raise ValueError("Table is already reserved for that date and time slot")
+        customer_id = upsert_customer(cursor, customer_name, phone)
+        cursor.execute("""
+            INSERT INTO Reservation (customer_id, table_id, reservation_date, time_slot, start_time, end_time, guest_count, status)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, 'Reserved')
+        """, (customer_id, table_id, reservation_date, time_slot, start, end, guest_count))
+        reservation_id = cursor.lastrowid
+    availability.add(reservation_id, table_id, reservation_date, time_slot)
+    return reservation_id
+
+def update_reservation(reservation_id, reservation_date, time_slot, guest_count):
+    start, end = slot_bounds(time_slot)
+    with db_cursor() as cursor:
+        cursor.execute("SELECT table_id FROM Reservation WHERE reservation_id = %s", (reservation_id,))
+        row = cursor.fetchone()
+        if row is None:
+            raise ValueError(f"Reservation #{reservation_id} does not exist")
+        table_id = row[0]
+        backend.lock_rows(cursor, "`Table`", "table_id", table_id)
+        if overlapping_reservations(table_id, reservation_date, time_slot, reservation_id, cursor=cursor):
+            raise ValueError("Table is already reserved for that date and time slot")
+        cursor.execute("""
+            UPDATE Reservation
+            SET reservation_date = %s, time_slot = %s, start_time = %s, end_time = %s, guest_count = %s
+            WHERE reservation_id = %s
+        """, (reservation_date, time_slot, start, end, guest_count, reservation_id))
+    availability.add(reservation_id, table_id, reservation_date, time_slot)
+
+def cancel_reservation(reservation_id):
+    with db_cursor() as cursor:
+        cursor.execute("UPDATE Reservation SET status = 'Cancelled' WHERE reservation_id = %s", (reservation_id,))
+    availability.remove(reservation_id)
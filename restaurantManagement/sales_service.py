@@ -0,0 +1,176 @@
+import argparse
+import datetime
+from collections import defaultdict
+from db import db_cursor, backend
+from reference_data import menu_items, menu_categories
+from utils import day_range
+from records import DaySales, GroupSales, PaymentSales
+
+# ------------------ SALES ROLLUPS ------------------
+# DailySales / DailyItemSales / DailyCategorySales / DailyPaymentSales hold one
+# row per day (and item, category, payment method). Order and payment writes
+# add to them inside their own transaction, so reports read a few hundred
+# rows for a year instead of aggregating every OrderDetail line.
+# Only Placed orders count; cancelling an order subtracts it again.
+
+ADD_DAILY = backend.accumulate_sql("DailySales", ["sales_date"], ["orders", "items_sold", "gross_amount", "net_amount"])
+ADD_ITEM = backend.accumulate_sql("DailyItemSales", ["sales_date", "menu_item_id"], ["quantity", "gross_amount"])
+ADD_CATEGORY = backend.accumulate_sql("DailyCategorySales", ["sales_date", "category_id"], ["quantity", "gross_amount"])
+ADD_PAYMENT = backend.accumulate_sql("DailyPaymentSales", ["sales_date", "payment_method"], ["payments", "amount"])
+
+# lines: [(menu_item_id, quantity, price), ...]; net_amount is the invoice total
+# after discount. sign is -1 to take a cancelled order back out.
+def add_order_sales(cursor, sales_date, lines, net_amount, sign=1):
+    category_of = {mid: cid for mid, _, cid in menu_items()}
+    missing = sorted({mid for mid, _, _ in lines if mid not in category_of})
+    if missing:
+        # dishes added since the menu was cached, possibly by another process
+        placeholders = ", ".join(["%s"] * len(missing))
+        cursor.execute(f"SELECT menu_item_id, category_id FROM MenuItem WHERE menu_item_id IN ({placeholders})",
+                       tuple(missing))
+        category_of.update(cursor.fetchall())
+    items = defaultdict(lambda: [0, 0])
+    categories = defaultdict(lambda: [0, 0])
+    for menu_item_id, qty, price in lines:
+        for totals in (items[menu_item_id], categories[category_of.get(menu_item_id)]):
+            totals[0] += sign * qty
+            totals[1] += sign * qty * price
+
+    gross = sum(amount for _, amount in items.values())
+    cursor.execute(ADD_DAILY, (sales_date, sign, sum(q for q, _ in items.values()), gross, sign * net_amount))
+    cursor.executemany(ADD_ITEM, [(sales_date, mid, q, amount) for mid, (q, amount) in items.items()])
+    cursor.executemany(ADD_CATEGORY, [
+        (sales_date, cid, q, amount) for cid, (q, amount) in categories.items() if cid is not None
+    ])
+
+def add_payment_sales(cursor, sales_date, method, amount):
+    cursor.execute(ADD_PAYMENT, (sales_date, method, 1, amount))
+
+
+# ------------------ REBUILD ------------------
+ROLLUP_TABLES = ["DailySales", "DailyItemSales", "DailyCategorySales", "DailyPaymentSales"]
+
+REBUILD_STATEMENTS = [
+    """
+    INSERT INTO DailySales (sales_date, orders, items_sold, gross_amount, net_amount)
+    SELECT DATE(o.order_time), COUNT(*), SUM(lines.items_sold), SUM(lines.gross_amount), SUM(i.total_amount)
+    FROM `Order` o
+    JOIN (
+        SELECT order_id, SUM(quantity) AS items_sold, SUM(quantity * price) AS gross_amount
+        FROM OrderDetail GROUP BY order_id
+    ) lines ON lines.order_id = o.order_id
+    JOIN Invoice i ON i.order_id = o.order_id
+    WHERE o.status = 'Placed' AND o.order_time >= %s AND o.order_time < %s
+    GROUP BY DATE(o.order_time)
+    """,
+    """
+    INSERT INTO DailyItemSales (sales_date, menu_item_id, quantity, gross_amount)
+    SELECT DATE(o.order_time), od.menu_item_id, SUM(od.quantity), SUM(od.quantity * od.price)
+    FROM `Order` o
+    JOIN OrderDetail od ON od.order_id = o.order_id
+    WHERE o.status = 'Placed' AND o.order_time >= %s AND o.order_time < %s
+    GROUP BY DATE(o.order_time), od.menu_item_id
+    """,
+    """
+    INSERT INTO DailyCategorySales (sales_date, category_id, quantity, gross_amount)
+    SELECT DATE(o.order_time), m.category_id, SUM(od.quantity), SUM(od.quantity * od.price)
+    FROM `Order` o
+    JOIN OrderDetail od ON od.order_id = o.order_id
+    JOIN MenuItem m ON m.menu_item_id = od.menu_item_id
+    WHERE o.status = 'Placed' AND o.order_time >= %s AND o.order_time < %s
+    GROUP BY DATE(o.order_time), m.category_id
+    """,
+    """
+    INSERT INTO DailyPaymentSales (sales_date, payment_method, payments, amount)
+    SELECT DATE(payment_date), payment_method, COUNT(*), SUM(amount_paid)
+    FROM Payment
+    WHERE payment_date >= %s AND payment_date < %s
+    GROUP BY DATE(payment_date), payment_method
+    """,
+]
+
+# Recomputes every rollup row for the dates in range from the base tables,
+# in one transaction. Without dates, the whole history is rebuilt.
+def rebuild_sales(start_date=None, end_date=None):
+    with db_cursor() as cursor:
+        if start_date is None or end_date is None:
+            cursor.execute("SELECT MIN(order_time), MAX(order_time) FROM `Order`")
+            first, last = cursor.fetchone()
+            cursor.execute("SELECT MIN(payment_date), MAX(payment_date) FROM Payment")
+            dates = [d for d in (first, last, *cursor.fetchone()) if d is not None]
+            if not dates:
+                return None
+            # MIN/MAX come back untyped from SQLite
+            dates = [datetime.datetime.fromisoformat(str(d)).date() for d in dates]
+            start_date, end_date = min(dates), max(dates)
+        start, end = day_range(start_date, end_date)
+        for table in ROLLUP_TABLES:
+            cursor.execute(f"DELETE FROM {table} WHERE sales_date BETWEEN %s AND %s", (start_date, end_date))
+        for sql in REBUILD_STATEMENTS:
+            cursor.execute(sql, (start, end))
+    return start_date, end_date
+
+
+# ------------------ REPORTS ------------------
+# All read only the rollup tables: cost grows with days in range, not orders
+
+# [(sales_date, orders, items_sold, gross_amount, net_amount)]
+def daily_sales(start_date, end_date):
+    with db_cursor() as cursor:
+        cursor.execute("""
+            SELECT sales_date, orders, items_sold, gross_amount, net_amount
+            FROM DailySales
+            WHERE sales_date BETWEEN %s AND %s
+            ORDER BY sales_date
+        """, (start_date, end_date))
+        return DaySales.from_rows(cursor.fetchall())
+
+# [(name, quantity, gross_amount)], best sellers first
+def item_sales(start_date, end_date, limit=20):
+    with db_cursor() as cursor:
+        cursor.execute("""
+            SELECT menu_item_id, SUM(quantity), SUM(gross_amount)
+            FROM DailyItemSales
+            WHERE sales_date BETWEEN %s AND %s
+            GROUP BY menu_item_id
+            ORDER BY SUM(gross_amount) DESC
+            LIMIT %s
+        """, (start_date, end_date, limit))
+        rows = cursor.fetchall()
+    names = {mid: name for mid, name, _ in menu_items()}
+    return [GroupSales.from_row((names.get(mid, f"#{mid}"), qty, amount)) for mid, qty, amount in rows]
+
+# [(category_name, quantity, gross_amount)]
+def category_sales(start_date, end_date):
+    with db_cursor() as cursor:
+        cursor.execute("""
+            SELECT category_id, SUM(quantity), SUM(gross_amount)
+            FROM DailyCategorySales
+            WHERE sales_date BETWEEN %s AND %s
+            GROUP BY category_id
+            ORDER BY SUM(gross_amount) DESC
+        """, (start_date, end_date))
+        rows = cursor.fetchall()
+    names = dict(menu_categories())
+    return [GroupSales.from_row((names.get(cid, f"#{cid}"), qty, amount)) for cid, qty, amount in rows]
+
+# [(payment_method, payments, amount)]
+def payment_sales(start_date, end_date):
+    with db_cursor() as cursor:
+        cursor.execute("""
+            SELECT payment_method, SUM(payments), SUM(amount)
+            FROM DailyPaymentSales
+            WHERE sales_date BETWEEN %s AND %s
+            GROUP BY payment_method
+        """, (start_date, end_date))
+        return PaymentSales.from_rows(cursor.fetchall())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the daily sales rollup tables from orders and payments")
+    parser.add_argument("--rebuild", action="store_true", required=True)
+    parser.add_argument("--start", type=datetime.date.fromisoformat, help="first day to rebuild (default: all history)")
+    parser.add_argument("--end", type=datetime.date.fromisoformat, help="last day to rebuild")
+    args = parser.parse_args()
+    rebuilt = rebuild_sales(args.start, args.end or args.start)
+    print(f"Rebuilt sales rollups for {rebuilt[0]} to {rebuilt[1]}" if rebuilt else "No orders or payments to roll up.")
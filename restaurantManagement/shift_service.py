@@ -0,0 +1,272 @@
+import datetime
+import heapq
+from collections import defaultdict
+from db import db_cursor, backend
+from records import Shift, StaffShift, DayShift, TemplateLine, StaffMember, ScheduledShift, ShiftTemplate
+from availability import DAY_MINUTES, minutes_of
+
+SHIFT_COLUMNS = """
+    SELECT s.name, r.role_name, ss.shift_date, ss.start_time, ss.end_time
+    FROM ShiftSchedule ss
+    JOIN Staff s ON ss.staff_id = s.staff_id
+    JOIN Role r ON s.role_id = r.role_id
+"""
+
+def staffed_roles():
+    with db_cursor() as cursor:
+        cursor.execute("SELECT DISTINCT r.role_name FROM Role r JOIN Staff s ON r.role_id = s.role_id")
+        return [row[0] for row in cursor.fetchall()]
+
+# Parameters: first date, last date, then the role name if by_role
+def shifts_query(by_role):
+    return (SHIFT_COLUMNS + " WHERE ss.shift_date BETWEEN %s AND %s"
+            + (" AND r.role_name = %s" if by_role else "") + " ORDER BY ss.shift_date")
+
+# (name, role_name, shift_date, start_time, end_time); role None means every role
+def list_shifts(start_date, end_date=None, role=None):
+    params = [start_date, end_date or start_date]
+    if role is not None:
+        params.append(role)
+    with db_cursor() as cursor:
+        cursor.execute(shifts_query(role is not None), tuple(params))
+        return Shift.from_rows(cursor.fetchall())
+
+def list_staff(role=None):
+    with db_cursor() as cursor:
+        if role is None:
+            cursor.execute("SELECT staff_id, name FROM Staff")
+        else:
+            cursor.execute("""
+                SELECT s.staff_id, s.name
+                FROM Staff s
+                JOIN Role r ON s.role_id = r.role_id
+                WHERE r.role_name = %s
+            """, (role,))
+        return StaffMember.from_rows(cursor.fetchall())
+
+def shifts_for_staff(staff_id):
+    with db_cursor() as cursor:
+        cursor.execute("""
+            SELECT ss.shift_date, ss.start_time, ss.end_time
+            FROM ShiftSchedule ss
+            WHERE ss.staff_id = %s
+            ORDER BY ss.shift_date
+        """, (staff_id,))
+        return StaffShift.from_rows(cursor.fetchall())
+
+# (name, shift_id, staff_id, start_time, end_time) for the manage screen
+def shifts_on(shift_date):
+    with db_cursor() as cursor:
+        cursor.execute("""
+            SELECT s.name, ss.shift_id, ss.staff_id, ss.start_time, ss.end_time
+            FROM ShiftSchedule ss
+            JOIN Staff s ON ss.staff_id = s.staff_id
+            WHERE ss.shift_date = %s
+        """, (shift_date,))
+        return DayShift.from_rows(cursor.fetchall())
+
+# ------------------ OVERLAP DETECTION ------------------
+# A shift is the span [shift_date + start, shift_date + end); one that ends at
+# or before its start runs past midnight into the next day.
+def shift_span(shift_date, start_time, end_time):
+    day = datetime.datetime.combine(shift_date, datetime.time.min)
+    start, end = minutes_of(start_time), minutes_of(end_time)
+    if end <= start:
+        end += DAY_MINUTES
+    return day + datetime.timedelta(minutes=start), day + datetime.timedelta(minutes=end)
+
+# Sweep line over one staff member's spans: sorted by start, with the spans
+# still running kept in a heap by end time. Every span still running when the
+# next one starts overlaps it. spans: [(start, end, key)] -> [(key, key), ...]
+def sweep_overlaps(spans):
+    pairs, running = [], []
+    for start, end, key in sorted(spans, key=lambda span: span[:2]):
+        while running and running[0][0] <= start:
+            heapq.heappop(running)
+        pairs.extend((other, key) for _, _, other in running)
+        heapq.heappush(running, (end, id(key), key))
+    return pairs
+
+def existing_spans(cursor, staff_ids, first_date, last_date):
+    if not staff_ids:
+        return []
+    # A day either side, for shifts running past midnight into the range or out of it
+    placeholders = ", ".join(["%s"] * len(staff_ids))
+    cursor.execute(f"""
+        SELECT shift_id, staff_id, shift_date, start_time, end_time
+        FROM ShiftSchedule
+        WHERE staff_id IN ({placeholders}) AND shift_date BETWEEN %s AND %s
+    """, (*staff_ids, first_date - datetime.timedelta(days=1), last_date + datetime.timedelta(days=1)))
+    return ScheduledShift.from_rows(cursor.fetchall())
+
+# shifts: [(staff_id, shift_date, start_time, end_time), ...] about to be written.
+# Returns [(position, other)] for every clash, where other is the position of
+# another new shift or ("shift", shift_id) for one already scheduled; shifts
+# in ignore (shift_ids) are left out, so an edited shift does not clash with itself.
+def find_conflicts(cursor, shifts, ignore=()):
+    if not shifts:
+        return []
+    spans = defaultdict(list)
+    for position, (staff_id, shift_date, start_time, end_time) in enumerate(shifts):
+        spans[staff_id].append((*shift_span(shift_date, start_time, end_time), position))
+    dates = [shift[1] for shift in shifts]
+    for shift in existing_spans(cursor, list(spans), min(dates), max(dates)):
+        if shift.shift_id not in ignore:
+            spans[shift.staff_id].append((*shift_span(shift.shift_date, shift.start_time, shift.end_time), ("shift", shift.shift_id)))
+
+    conflicts = []
+    for staff_spans in spans.values():
+        for first, second in sweep_overlaps(staff_spans):
+            if isinstance(first, int):
+                conflicts.append((first, second))
+            if isinstance(second, int):
+                conflicts.append((second, first))
+    return sorted(conflicts, key=lambda conflict: conflict[0])
+
+def conflict_message(shifts, conflict, names):
+    position, other = conflict
+    staff_id, shift_date, start_time, end_time = shifts[position]
+    start, end = shift_span(shift_date, start_time, end_time)
+    clash = f"shift #{other[1]}" if isinstance(other, tuple) else "another shift in this roster"
+    return f"{names.get(staff_id, f'Staff #{staff_id}')}: {start:%a %d %b %H:%M}-{end:%H:%M} overlaps {clash}"
+
+def staff_names():
+    return {s.staff_id: s.name for s in list_staff()}
+
+SHIFT_INSERT = "INSERT INTO ShiftSchedule (staff_id, shift_date, start_time, end_time) VALUES (%s, %s, %s, %s)"
+
+def shift_params(staff_id, day, start, end):
+    return (staff_id, day, start.strftime("%H:%M:%S"), end.strftime("%H:%M:%S"))
+
+def insert_shifts(cursor, shifts):
+    cursor.executemany(SHIFT_INSERT, [shift_params(*shift) for shift in shifts])
+
+
+# ------------------ WRITES ------------------
+def add_shift(staff_id, shift_date, start_time, end_time):
+    shift = [(staff_id, shift_date, start_time, end_time)]
+    with db_cursor() as cursor:
+        # held until commit, so two shifts for one person cannot both pass the check
+        backend.lock_rows(cursor, "Staff", "staff_id", staff_id)
+        conflicts = find_conflicts(cursor, shift)
+        if conflicts:
+            raise ValueError(conflict_message(shift, conflicts[0], staff_names()))
+        # a single execute, since lastrowid is not set after executemany on every driver
+        cursor.execute(SHIFT_INSERT, shift_params(*shift[0]))
+        return cursor.lastrowid
+
+def update_shift(shift_id, start_time, end_time):
+    with db_cursor() as cursor:
+        cursor.execute("SELECT staff_id, shift_date FROM ShiftSchedule WHERE shift_id = %s", (shift_id,))
+        row = cursor.fetchone()
+        if row is None:
+            raise ValueError(f"Shift #{shift_id} does not exist")
+        shift = [(row[0], row[1], start_time, end_time)]
+        backend.lock_rows(cursor, "Staff", "staff_id", row[0])
+        conflicts = find_conflicts(cursor, shift, ignore={shift_id})
+        if conflicts:
+            raise ValueError(conflict_message(shift, conflicts[0], staff_names()))
+        cursor.execute(
+            "UPDATE ShiftSchedule SET start_time = %s, end_time = %s WHERE shift_id = %s",
+            (start_time.strftime("%H:%M:%S"), end_time.strftime("%H:%M:%S"), shift_id)
+        )
+
+def delete_shift(shift_id):
+    with db_cursor() as cursor:
+        cursor.execute("DELETE FROM ShiftSchedule WHERE shift_id = %s", (shift_id,))
+
+
+# ------------------ WEEKLY TEMPLATES ------------------
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+def list_templates():
+    with db_cursor() as cursor:
+        cursor.execute("SELECT template_id, template_name FROM ShiftTemplate ORDER BY template_name")
+        return ShiftTemplate.from_rows(cursor.fetchall())
+
+# (template_line_id, staff_id, staff_name, weekday, start_time, end_time)
+def template_lines(template_id):
+    with db_cursor() as cursor:
+        cursor.execute("""
+            SELECT tl.template_line_id, tl.staff_id, s.name, tl.weekday, tl.start_time, tl.end_time
+            FROM ShiftTemplateLine tl
+            JOIN Staff s ON tl.staff_id = s.staff_id
+            WHERE tl.template_id = %s
+            ORDER BY tl.weekday, tl.start_time, s.name
+        """, (template_id,))
+        return TemplateLine.from_rows(cursor.fetchall())
+
+def create_template(template_name):
+    if not template_name.strip():
+        raise ValueError("Template name is required")
+    with db_cursor() as cursor:
+        cursor.execute("INSERT INTO ShiftTemplate (template_name) VALUES (%s)", (template_name.strip(),))
+        return cursor.lastrowid
+
+def delete_template(template_id):
+    with db_cursor() as cursor:
+        cursor.execute("DELETE FROM ShiftTemplateLine WHERE template_id = %s", (template_id,))
+        cursor.execute("DELETE FROM ShiftTemplate WHERE template_id = %s", (template_id,))
+
+# The template laid out on the week of 2024-01-01 (a Monday), for checking it against itself
+TEMPLATE_WEEK = datetime.date(2024, 1, 1)
+
+# One line per weekday given; refused if it overlaps the staff member's other template shifts
+def add_template_shift(template_id, staff_id, weekdays, start_time, end_time):
+    with db_cursor() as cursor:
+        # held until commit, so two additions for one person cannot both pass the check
+        backend.lock_rows(cursor, "Staff", "staff_id", staff_id)
+        _check_template_shift(template_id, staff_id, weekdays, start_time, end_time)
+        cursor.executemany("""
+            INSERT INTO ShiftTemplateLine (template_id, staff_id, weekday, start_time, end_time)
+            VALUES (%s, %s, %s, %s, %s)
+        """, [(template_id, staff_id, wd, start_time.strftime("%H:%M:%S"), end_time.strftime("%H:%M:%S")) for wd in weekdays])
+
+def _check_template_shift(template_id, staff_id, weekdays, start_time, end_time):
+    existing = [(sid, TEMPLATE_WEEK + datetime.timedelta(days=wd), s, e) for _, sid, _, wd, s, e in template_lines(template_id)]
+    new = [(staff_id, TEMPLATE_WEEK + datetime.timedelta(days=wd), start_time, end_time) for wd in weekdays]
+    week = existing + new
+    spans = [(*shift_span(day, s, e), position) for position, (sid, day, s, e) in enumerate(week) if sid == staff_id]
+    # Sunday night shifts run into the next Monday
+    spans += [(start + datetime.timedelta(weeks=1), end + datetime.timedelta(weeks=1), position) for start, end, position in spans]
+    clashes = [pair for pair in sweep_overlaps(spans) if max(pair) >= len(existing)]
+    if clashes:
+        day = week[max(clashes[0])][1]
+        raise ValueError(f"{staff_names().get(staff_id, f'Staff #{staff_id}')} already has an overlapping "
+                         f"template shift on {WEEKDAYS[day.weekday()]}")
+
+def remove_template_shift(template_line_id):
+    with db_cursor() as cursor:
+        cursor.execute("DELETE FROM ShiftTemplateLine WHERE template_line_id = %s", (template_line_id,))
+
+# [(staff_id, shift_date, start_time, end_time)] for every template line on every matching date
+def roster_from_template(template_id, start_date, end_date):
+    lines = template_lines(template_id)
+    roster = []
+    for offset in range((end_date - start_date).days + 1):
+        day = start_date + datetime.timedelta(days=offset)
+        roster.extend((staff_id, day, start, end) for _, staff_id, _, weekday, start, end in lines if weekday == day.weekday())
+    return roster
+
+# Checks the whole roster against itself and the shifts already scheduled,
+# then writes it in one batched insert. Conflicting shifts reject the whole
+# roster, or with skip_conflicts are left out and reported.
+# Returns (shifts written, [conflict messages]).
+def apply_template(template_id, start_date, end_date, skip_conflicts=False):
+    if end_date < start_date:
+        raise ValueError("End date is before start date")
+    roster = roster_from_template(template_id, start_date, end_date)
+    with db_cursor() as cursor:
+        # in a fixed order, so two rosters cannot deadlock
+        for staff_id in sorted({shift[0] for shift in roster}):
+            backend.lock_rows(cursor, "Staff", "staff_id", staff_id)
+        conflicts = find_conflicts(cursor, roster)
+        names = staff_names() if conflicts else {}
+        messages = [conflict_message(roster, conflict, names) for conflict in conflicts]
+        if conflicts and not skip_conflicts:
+            raise ValueError("; ".join(messages))
+        clashing = {position for position, _ in conflicts}
+        shifts = [shift for position, shift in enumerate(roster) if position not in clashing]
+        if shifts:
+            insert_shifts(cursor, shifts)
+    return len(shifts), messages
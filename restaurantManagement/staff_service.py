@@ -0,0 +1,24 @@
+from db import db_cursor
+from reference_data import invalidate
+
+# A role that does not exist yet is created with the staff member.
+# Returns the new staff_id.
+def add_staff(name, phone, role_name, salary=0):
+    if not name or not role_name:
+        raise ValueError("A staff member needs a name and a role")
+    with db_cursor() as cursor:
+        cursor.execute("SELECT role_id FROM Role WHERE role_name = %s", (role_name,))
+        row = cursor.fetchone()
+        if row is None:
+            cursor.execute("INSERT INTO Role (role_name) VALUES (%s)", (role_name,))
+            role_id = cursor.lastrowid
+        else:
+            role_id = row[0]
+        cursor.execute("""
+            INSERT INTO Staff (name, phone, role_id, salary)
+            VALUES (%s, %s, %s, %s)
+        """, (name, phone, role_id, salary))
+        staff_id = cursor.lastrowid
+    if row is None:
+        invalidate("Role")
+    return staff_id
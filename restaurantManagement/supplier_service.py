@@ -0,0 +1,15 @@
+from db import db_cursor
+from reference_data import invalidate
+
+# Returns the new supplier_id
+def add_supplier(name, phone, category):
+    if not name or not category:
+        raise ValueError("A supplier needs a name and a category")
+    with db_cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO Supplier (name, phone, category)
+            VALUES (%s, %s, %s)
+        """, (name, phone, category))
+        supplier_id = cursor.lastrowid
+    invalidate("Supplier")
+    return supplier_id
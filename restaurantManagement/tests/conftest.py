@@ -0,0 +1,66 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# The modules import each other flat (from db import ...), and config reads
+# the environment at import time, so both are set up before any test imports them.
+# Tests run against a throwaway embedded database, migrated on first use.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["RESTAURANT_DB_BACKEND"] = "sqlite"
+os.environ["RESTAURANT_DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="restaurant-tests-"), "test.db")
+os.environ["RESTAURANT_SLOW_QUERY_LOG"] = ""
+
+
+@pytest.fixture
+def staff_id():
+    from db import db_cursor
+    with db_cursor() as cursor:
+        cursor.execute("INSERT OR IGNORE INTO Role (role_id, role_name) VALUES (1, 'Manager')")
+        cursor.execute("INSERT INTO Staff (name, phone, role_id) VALUES ('Test Staff', '9000000000', 1)")
+        return cursor.lastrowid
+
+
+@pytest.fixture
+def supplier_id():
+    from db import db_cursor
+    with db_cursor() as cursor:
+        cursor.execute("INSERT INTO Supplier (name, phone, category) VALUES ('Test Supplier', '9000000001', 'Grocery')")
+        return cursor.lastrowid
+
+
+# make_item("Rice", 5) -> item_id of a new Grocery inventory item holding 5 units
+@pytest.fixture
+def make_item():
+    from db import db_cursor
+    def make(name, quantity=0):
+        with db_cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO InventoryItem (item_name, unit, current_quantity, category) VALUES (%s, 'kg', %s, 'Grocery')",
+                (name, quantity)
+            )
+            return cursor.lastrowid
+    return make
+
+
+def stock_of(item_id):
+    from decimal import Decimal
+    from db import db_cursor
+    with db_cursor() as cursor:
+        cursor.execute("SELECT current_quantity FROM InventoryItem WHERE item_id = %s", (item_id,))
+        return Decimal(str(cursor.fetchone()[0]))
+
+
+# make_menu_item("Veg Biryani", 180) -> menu_item_id of a new available dish
+@pytest.fixture
+def make_menu_item():
+    from db import db_cursor
+    def make(name, price):
+        with db_cursor() as cursor:
+            cursor.execute("INSERT OR IGNORE INTO MenuCategory (category_id, category_name) VALUES (1, 'Test Category')")
+            cursor.execute(
+                "INSERT INTO MenuItem (name, price, category_id, is_available) VALUES (%s, %s, 1, 1)", (name, price)
+            )
+            return cursor.lastrowid
+    return make
@@ -0,0 +1,55 @@
+from decimal import Decimal
+
+import pytest
+
+import api
+from db import db_cursor
+
+
+def test_order_lines_are_priced_from_the_menu(staff_id, make_menu_item):
+    thali = make_menu_item("Api Thali", 150)
+    result = api.post_order({}, {
+        "staff_id": staff_id, "customer_name": "Api Guest", "phone": "9200000000",
+        "lines": [{"menu_item_id": thali, "quantity": 2, "price": "0.01"}],
+    })
+    assert result["total"] == Decimal("300")
+    with db_cursor() as cursor:
+        cursor.execute("SELECT price FROM OrderDetail WHERE order_id = %s", (result["order_id"],))
+        assert Decimal(str(cursor.fetchone()[0])) == 150
+
+
+def test_an_unavailable_dish_cannot_be_ordered(staff_id, make_menu_item):
+    kulfi = make_menu_item("Api Kulfi", 60)
+    with db_cursor() as cursor:
+        cursor.execute("UPDATE MenuItem SET is_available = 0 WHERE menu_item_id = %s", (kulfi,))
+    with pytest.raises(ValueError, match="Not on the menu"):
+        api.post_order({}, {"staff_id": staff_id, "customer_name": "Api Guest", "phone": "9200000001",
+                            "lines": [{"menu_item_id": kulfi, "quantity": 1}]})
+
+
+@pytest.mark.parametrize("body", [
+    {"lines": "not a list"},
+    {"lines": [1, 2]},
+    {"lines": [{"menu_item_id": 1, "quantity": 1}], "discount_percent": "abc"},
+])
+def test_malformed_input_is_a_400(staff_id, body):
+    with pytest.raises(api.ApiError) as raised:
+        api.post_order({}, {"staff_id": staff_id, "customer_name": "Api Guest", "phone": "9200000002", **body})
+    assert raised.value.status == 400
+
+
+def test_adding_staff_creates_a_missing_role():
+    staff_id = api.post_staff({}, {"name": "Api Sommelier", "role_name": "Api Sommelier Role", "salary": "30000"})["staff_id"]
+    again = api.post_staff({}, {"name": "Api Sommelier 2", "role_name": "Api Sommelier Role"})["staff_id"]
+    with db_cursor() as cursor:
+        cursor.execute("SELECT DISTINCT role_id FROM Staff WHERE staff_id IN (%s, %s)", (staff_id, again))
+        assert len(cursor.fetchall()) == 1
+
+
+def test_adding_a_supplier_and_a_menu_item(make_menu_item):
+    assert api.post_supplier({}, {"name": "Api Dairy", "category": "Dairy"})["supplier_id"]
+    make_menu_item("Api Category Seed", 1)   # makes sure category 1 exists
+    menu_item_id = api.post_menu_item({}, {"name": "Api Lassi", "price": "70", "category_id": 1})["menu_item_id"]
+    assert [item_id for item_id, _, _ in api.menu_search.search("Api Lassi", 5)] == [menu_item_id]
+    with pytest.raises(ValueError):
+        api.post_supplier({}, {"name": "", "category": "Dairy"})
@@ -0,0 +1,53 @@
+import datetime
+
+from availability import AvailabilityIndex, availability
+from db import db_cursor
+from reservation_service import create_reservation, cancel_reservation
+
+DAY = datetime.date(2031, 1, 10)
+
+
+def add_table(number, seats):
+    with db_cursor() as cursor:
+        cursor.execute("INSERT INTO `Table` (table_number, seating_capacity) VALUES (%s, %s)", (number, seats))
+        return cursor.lastrowid
+
+
+def test_a_booked_table_is_taken_only_for_overlapping_slots():
+    table_id = add_table(901, 12)
+    availability.free_tables(DAY, "19:00-21:00", 12)   # load the day before booking, so the update path is used
+    availability.invalidate_tables()
+    reservation_id = create_reservation("Avail Guest", "9400000000", table_id, DAY, "19:00-21:00", 10)
+
+    def free(slot):
+        return table_id in [tid for tid, _, _ in availability.free_tables(DAY, slot, 12)]
+
+    assert not free("20:00-22:00")
+    assert free("21:00-23:00")
+    cancel_reservation(reservation_id)
+    assert free("20:00-22:00")
+
+
+def test_new_tables_show_up_after_invalidate_tables():
+    index = AvailabilityIndex(ttl=60)
+    assert index.free_tables(DAY, "12:00-13:00", 40) == []
+    table_id = add_table(902, 40)
+    assert index.free_tables(DAY, "12:00-13:00", 40) == []
+    index.invalidate_tables()
+    assert [tid for tid, _, _ in index.free_tables(DAY, "12:00-13:00", 40)] == [table_id]
+
+
+def test_the_table_list_expires_with_the_ttl():
+    index = AvailabilityIndex(ttl=0)
+    index.free_tables(DAY, "12:00-13:00", 50)
+    table_id = add_table(903, 50)
+    assert [tid for tid, _, _ in index.free_tables(DAY, "12:00-13:00", 50)] == [table_id]
+
+
+def test_past_dates_are_dropped_when_another_date_loads():
+    index = AvailabilityIndex(ttl=60)
+    yesterday = datetime.date.today() - datetime.timedelta(days=1)
+    index.free_tables(yesterday, "12:00-13:00")
+    assert yesterday in index._days
+    index.free_tables(DAY, "12:00-13:00")
+    assert list(index._days) == [DAY]
@@ -0,0 +1,29 @@
+import pytest
+
+from db import db_cursor
+from customer_service import upsert_customer, find_customer, recent_customers
+
+
+def test_a_rolled_back_upsert_leaves_the_cache_alone():
+    with pytest.raises(RuntimeError):
+        with db_cursor() as cursor:
+            upsert_customer(cursor, "Ghost", "93000 00000")
+            raise RuntimeError("order failed")
+    assert recent_customers.get(("Customer", "9300000000")) == (False, None)
+
+    with db_cursor() as cursor:
+        customer_id = upsert_customer(cursor, "Ravi", "9300000002")
+    with pytest.raises(RuntimeError):
+        with db_cursor() as cursor:
+            upsert_customer(cursor, "Ravi Renamed", "9300000002")
+            raise RuntimeError("order failed")
+    assert find_customer("9300000002") == (customer_id, "Ravi")
+
+
+def test_a_committed_upsert_is_cached_and_found_by_any_phone_format():
+    with db_cursor() as cursor:
+        customer_id = upsert_customer(cursor, "Meera", "+91 93000-00001")
+    assert recent_customers.get(("Customer", "9300000001")) == (True, (customer_id, "Meera"))
+    with db_cursor() as cursor:
+        assert upsert_customer(cursor, "Meera K", "093000 00001") == customer_id
+    assert find_customer("9300000001") == (customer_id, "Meera K")
@@ -0,0 +1,47 @@
+import datetime
+import random
+
+import pytest
+
+from event_index import IntervalTree
+from event_service import book_event, update_event, delete_event, check_season, season_dates
+
+DAY = datetime.date(2033, 5, 7)
+T = datetime.time
+
+
+def test_interval_tree_finds_exactly_the_overlaps():
+    rng = random.Random(7)
+    intervals = []
+    for key in range(200):
+        start = rng.randrange(0, 1380)
+        intervals.append((start, start + rng.randrange(1, 240), key))
+    tree = IntervalTree(intervals)
+    for _ in range(300):
+        start = rng.randrange(0, 1440)
+        end = start + rng.randrange(1, 120)
+        expected = sorted(i for i in intervals if i[0] < end and start < i[1])
+        assert sorted(tree.overlapping(start, end)) == expected
+    assert IntervalTree([]).overlapping(0, 1440) == []
+
+
+def test_bookings_clash_only_in_the_same_hall_and_hours(staff_id):
+    lunch = book_event(staff_id, "Event Host", "9700000000", "Lunch", "Garden Hall", DAY, T(12), T(15), 40)
+    # touching windows and other halls are fine; location is matched loosely
+    book_event(staff_id, "Event Host", "9700000000", "Tea", "garden  hall", DAY, T(15), T(17), 20)
+    book_event(staff_id, "Event Host", "9700000000", "Meeting", "Roof Deck", DAY, T(13), T(14), 10)
+    with pytest.raises(ValueError, match="Lunch"):
+        book_event(staff_id, "Event Host", "9700000000", "Clash", "Garden Hall", DAY, T(14), T(16), 10)
+
+    update_event(lunch, "Lunch", "Garden Hall", T(11), T(13))
+    book_event(staff_id, "Event Host", "9700000000", "Late Lunch", "Garden Hall", DAY, T(13), T(15), 10)
+    delete_event(lunch)
+    book_event(staff_id, "Event Host", "9700000000", "Brunch", "Garden Hall", DAY, T(10), T(12), 10)
+
+
+def test_a_season_is_checked_against_itself_and_existing_events(staff_id):
+    first = DAY + datetime.timedelta(days=7)
+    book_event(staff_id, "Event Host", "9700000001", "Recital", "Music Room", first + datetime.timedelta(weeks=2), T(18), T(20), 30)
+    dates = season_dates(first, first + datetime.timedelta(weeks=3))
+    assert [day for day, _ in check_season("Music Room", dates, T(19), T(21))] == [dates[2]]
+    assert [day for day, _ in check_season("Music Room", dates + [dates[0]], T(9), T(10))] == [dates[0], dates[0]]
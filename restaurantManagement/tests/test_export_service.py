@@ -0,0 +1,64 @@
+import csv
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from db import db_cursor, pool_stats
+from customer_service import upsert_customer
+from order_service import insert_order
+from export_service import EXPORTS, export, stream_rows
+from utils import day_range
+
+DAY = datetime.date(2034, 8, 1)
+
+
+@pytest.fixture(scope="module")
+def orders_on_day():
+    with db_cursor() as cursor:
+        cursor.execute("INSERT OR IGNORE INTO Role (role_id, role_name) VALUES (1, 'Manager')")
+        cursor.execute("INSERT INTO Staff (name, phone, role_id) VALUES ('Export Staff', '9800000000', 1)")
+        staff_id = cursor.lastrowid
+        cursor.execute("INSERT OR IGNORE INTO MenuCategory (category_id, category_name) VALUES (1, 'Test Category')")
+        cursor.execute("INSERT INTO MenuItem (name, price, category_id, is_available) VALUES ('Export Chai', 15, 1, 1)")
+        chai = cursor.lastrowid
+        customer_id = upsert_customer(cursor, "Export Guest", "9800000001")
+        return [
+            insert_order(cursor, staff_id, customer_id, [(chai, i + 1, 15)], Decimal(15 * (i + 1)),
+                         order_time=datetime.datetime.combine(DAY, datetime.time(8 + i)))[0]
+            for i in range(5)
+        ]
+
+
+def test_rows_arrive_in_chunks(orders_on_day):
+    _, sql = EXPORTS["orders"]
+    chunks = list(stream_rows(sql, day_range(DAY, DAY), chunk_size=2))
+    assert [len(rows) for rows in chunks] == [2, 2, 1]
+    assert [row[0] for rows in chunks for row in rows] == orders_on_day
+
+
+def test_stopping_early_returns_the_connection(orders_on_day):
+    _, sql = EXPORTS["orders"]
+    in_use = pool_stats()["in_use"]
+    chunks = stream_rows(sql, day_range(DAY, DAY), chunk_size=2)
+    next(chunks)
+    chunks.close()
+    assert pool_stats()["in_use"] == in_use
+
+
+def test_csv_export_writes_every_table(orders_on_day, tmp_path):
+    results = {name: (path, written) for name, path, written in export(DAY, DAY, out_dir=str(tmp_path), chunk_size=2)}
+    assert {name: written for name, (_, written) in results.items()} == {
+        "orders": 5, "order_details": 5, "invoices": 5, "payments": 0
+    }
+    with open(results["order_details"][0], newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [int(row["quantity"]) for row in rows] == [1, 2, 3, 4, 5]
+    assert {row["item_name"] for row in rows} == {"Export Chai"}
+
+
+def test_bad_requests_are_refused(tmp_path):
+    with pytest.raises(ValueError, match="Unknown export format"):
+        export(DAY, DAY, fmt="xlsx", out_dir=str(tmp_path))
+    with pytest.raises(ValueError, match="before start"):
+        export(DAY, DAY - datetime.timedelta(days=1), out_dir=str(tmp_path))
@@ -0,0 +1,49 @@
+import datetime
+
+import pytest
+
+from db import db_cursor, unit_of_work
+from grid_service import GRIDS
+from shift_service import add_shift
+
+
+def staff_row(staff_id):
+    with db_cursor() as cursor:
+        cursor.execute("SELECT name FROM Staff WHERE staff_id = %s", (staff_id,))
+        return cursor.fetchone()
+
+
+def test_on_save_runs_after_the_unit_of_work_commits(staff_id, monkeypatch):
+    grid = GRIDS["staff"]
+    calls = []
+    monkeypatch.setattr(grid, "on_save", lambda changed, deleted: calls.append(staff_row(staff_id)))
+    row = {"staff_id": staff_id, "name": "Renamed", "phone": "9000000000", "salary": 0}
+    with unit_of_work():
+        grid.save([row])
+        assert calls == []
+    assert calls == [("Renamed",)]
+
+
+def test_on_save_is_dropped_when_the_save_rolls_back(staff_id, monkeypatch):
+    grid = GRIDS["staff"]
+    calls = []
+    monkeypatch.setattr(grid, "on_save", lambda changed, deleted: calls.append(deleted))
+    row = {"staff_id": staff_id, "name": "Never Saved", "phone": "9000000000", "salary": 0}
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            grid.save([row])
+            raise RuntimeError("page failed")
+    assert calls == []
+    assert staff_row(staff_id) == ("Test Staff",)
+
+
+def test_staff_with_history_cannot_be_deleted(staff_id):
+    add_shift(staff_id, datetime.date(2030, 4, 1), datetime.time(9), datetime.time(13))
+    with pytest.raises(ValueError, match=f"Staff #{staff_id} still has shifts"):
+        GRIDS["staff"].save([], [staff_id])
+    assert staff_row(staff_id) == ("Test Staff",)
+
+
+def test_staff_without_history_can_be_deleted(staff_id):
+    assert GRIDS["staff"].save([], [staff_id]) == 1
+    assert staff_row(staff_id) is None
@@ -0,0 +1,25 @@
+import io
+from decimal import Decimal
+
+from db import db_cursor
+from import_service import import_csv
+
+
+def stock(name):
+    with db_cursor() as cursor:
+        cursor.execute("SELECT unit, current_quantity, par_level FROM InventoryItem WHERE item_name = %s", (name,))
+        unit, quantity, par_level = cursor.fetchone()
+        return unit, Decimal(str(quantity)), Decimal(str(par_level))
+
+
+def test_blank_cells_default_on_insert():
+    source = io.StringIO("item_name,unit,current_quantity,category,par_level\nBasmati,kg,,Grocery,\n")
+    assert import_csv("inventory", source) == (1, 0, [])
+    assert stock("Basmati") == ("kg", 0, 0)
+
+
+def test_blank_cells_keep_current_values_on_update():
+    import_csv("inventory", io.StringIO("item_name,unit,current_quantity,category,par_level\nJeera,kg,12.5,Spices,3\n"))
+    source = io.StringIO("item_name,unit,current_quantity,category,par_level\nJeera,g,,Spices,5\n")
+    assert import_csv("inventory", source) == (0, 1, [])
+    assert stock("Jeera") == ("g", Decimal("12.5"), 5)
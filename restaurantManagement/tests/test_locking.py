@@ -0,0 +1,36 @@
+import sqlite3
+
+import pytest
+
+from config import DB_PATH
+from db import backend, db_cursor, unit_of_work
+
+
+def other_writer_blocked():
+    conn = sqlite3.connect(DB_PATH, timeout=0)
+    try:
+        conn.execute("INSERT INTO Role (role_name) VALUES ('Blocked?')")
+        conn.rollback()
+        return False
+    except sqlite3.OperationalError as e:
+        assert "locked" in str(e)
+        return True
+    finally:
+        conn.close()
+
+
+def test_lock_is_held_until_commit(staff_id):
+    with db_cursor() as cursor:
+        backend.lock_rows(cursor, "Staff", "staff_id", staff_id)
+        assert other_writer_blocked()
+    assert not other_writer_blocked()
+
+
+def test_lock_inside_a_unit_of_work(staff_id):
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            with db_cursor() as cursor:
+                backend.lock_rows(cursor, "Staff", "staff_id", staff_id)
+            assert other_writer_blocked()
+            raise RuntimeError("page failed")
+    assert not other_writer_blocked()
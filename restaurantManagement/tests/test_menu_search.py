@@ -0,0 +1,38 @@
+from db import db_cursor
+from menu_search import MenuSearchIndex
+
+
+def names(results):
+    return [name for _, name, _ in results]
+
+
+def test_prefix_matches_rank_in_order_names_first(make_menu_item):
+    make_menu_item("Tikka Zorbish Wrap", 150)
+    make_menu_item("Zorbish Tikka Masala", 260)
+    make_menu_item("Zorbish Tikka", 240)
+    make_menu_item("Zorbish Kheer", 90)
+    index = MenuSearchIndex(ttl=60)
+
+    assert names(index.search("zorb tik")) == ["Zorbish Tikka", "Zorbish Tikka Masala", "Tikka Zorbish Wrap"]
+    assert names(index.search("zorbish", limit=2)) == ["Zorbish Kheer", "Zorbish Tikka"]
+    assert index.search("   ") == []
+
+
+def test_misspellings_fall_back_to_trigrams(make_menu_item):
+    make_menu_item("Quorbani Pulao", 210)
+    make_menu_item("Quorma Rice", 120)
+    index = MenuSearchIndex(ttl=60)
+
+    assert names(index.search("qourbani")) == ["Quorbani Pulao"]
+    assert names(index.search("quorbanni pulav"))[0] == "Quorbani Pulao"
+
+
+def test_unavailable_dishes_drop_out_after_clear(make_menu_item):
+    falooda = make_menu_item("Xylo Falooda", 110)
+    index = MenuSearchIndex(ttl=60)
+    assert names(index.search("xylo")) == ["Xylo Falooda"]
+    with db_cursor() as cursor:
+        cursor.execute("UPDATE MenuItem SET is_available = 0 WHERE menu_item_id = %s", (falooda,))
+    assert names(index.search("xylo")) == ["Xylo Falooda"]   # served from memory until dropped
+    index.clear()
+    assert index.search("xylo") == []
@@ -0,0 +1,19 @@
+import metrics
+
+
+def test_slow_query_log_is_created_on_first_slow_statement(tmp_path, monkeypatch):
+    path = tmp_path / "slow_queries.log"
+    monkeypatch.setattr(metrics, "SLOW_QUERY_LOG", str(path))
+    monkeypatch.setattr(metrics, "_slow_log_ready", False)
+    handlers = list(metrics.slow_log.handlers)
+    try:
+        metrics.record_query("test.fast", "SELECT 1", metrics.SLOW_QUERY_MS / 2, 1)
+        assert not path.exists()
+        metrics.record_query("test.slow", "SELECT 2", metrics.SLOW_QUERY_MS * 2, 1)
+        for handler in metrics.slow_log.handlers:
+            handler.flush()
+        assert "at test.slow: SELECT 2" in path.read_text()
+    finally:
+        for handler in metrics.slow_log.handlers[len(handlers):]:
+            metrics.slow_log.removeHandler(handler)
+            handler.close()
@@ -0,0 +1,31 @@
+import pytest
+
+import migrate
+from db import db_cursor
+
+
+def test_a_failed_file_resumes_after_its_last_applied_statement(tmp_path, monkeypatch):
+    monkeypatch.setattr(migrate, "MIGRATIONS_DIR", str(tmp_path))
+    monkeypatch.setattr(migrate, "DIALECT_DIR", str(tmp_path / "none"))
+    migration = tmp_path / "900_resume_test.sql"
+    migration.write_text(
+        "CREATE TABLE ResumeTest (id INT, code VARCHAR(10));\n"
+        "CREATE INDEX idx_resumetest_code ON ResumeTest (code);\n"
+        "INSERT INTO NoSuchTable VALUES (1);\n"
+    )
+    with pytest.raises(Exception):
+        migrate.run_migrations()
+
+    # the first two statements stay applied; rerunning them would fail
+    migration.write_text(
+        "CREATE TABLE ResumeTest (id INT, code VARCHAR(10));\n"
+        "CREATE INDEX idx_resumetest_code ON ResumeTest (code);\n"
+        "INSERT INTO ResumeTest VALUES (1, 'A');\n"
+    )
+    assert migrate.run_migrations() == ["900_resume_test.sql"]
+    assert migrate.run_migrations() == []
+    with db_cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM ResumeTest")
+        assert cursor.fetchone()[0] == 1
+        cursor.execute("SELECT COUNT(*) FROM SchemaMigrationStep WHERE name = '900_resume_test.sql'")
+        assert cursor.fetchone()[0] == 0
@@ -0,0 +1,82 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+
+import metrics
+import order_service
+from conftest import stock_of
+from db import db_cursor
+from customer_service import upsert_customer
+from order_service import order_total, place_order, insert_order, count_orders, list_orders, fetch_order_items
+from recipe_service import set_ingredient
+
+
+def record_queries(monkeypatch):
+    statements = []
+    monkeypatch.setattr(metrics, "record_query", lambda label, sql, *args: statements.append(sql))
+    return statements
+
+
+def test_a_page_of_orders_loads_its_lines_in_one_query(staff_id, make_menu_item, monkeypatch):
+    day = datetime.date(2032, 2, 1)
+    tea, bun = make_menu_item("Dash Tea", 20), make_menu_item("Dash Bun", 35)
+    with db_cursor() as cursor:
+        customer_id = upsert_customer(cursor, "Dash Guest", "9500000000")
+        order_ids = [
+            insert_order(cursor, staff_id, customer_id, lines, Decimal("0"),
+                         order_time=datetime.datetime.combine(day, datetime.time(9 + i)))[0]
+            for i, lines in enumerate([[(tea, 2, 20)], [(tea, 1, 20), (bun, 3, 35)], [(bun, 1, 35)]])
+        ]
+
+    assert count_orders(day, day) == 3
+    first, second = list_orders(day, day, page=1, page_size=2), list_orders(day, day, page=2, page_size=2)
+    assert [order.order_id for order in first + second] == order_ids
+    assert [order.total for order in first + second] == [40, 125, 35]
+
+    statements = record_queries(monkeypatch)
+    items = fetch_order_items([order.order_id for order in first])
+    assert sorted((line.name, line.quantity) for line in items[order_ids[1]]) == [("Dash Bun", 3), ("Dash Tea", 1)]
+    assert order_ids[2] not in items
+    assert fetch_order_items([]) == {}
+    assert len(statements) == 1
+
+
+def rows_for_phone(phone_key):
+    with db_cursor() as cursor:
+        cursor.execute("""
+            SELECT COUNT(DISTINCT c.customer_id), COUNT(DISTINCT o.order_id), COUNT(DISTINCT i.invoice_id), COUNT(p.payment_id)
+            FROM Customer c
+            LEFT JOIN `Order` o ON o.customer_id = c.customer_id
+            LEFT JOIN Invoice i ON i.order_id = o.order_id
+            LEFT JOIN Payment p ON p.invoice_id = i.invoice_id
+            WHERE c.phone_key = %s
+        """, (phone_key,))
+        return cursor.fetchone()
+
+
+def test_an_order_is_written_whole_or_not_at_all(staff_id, make_item, make_menu_item, monkeypatch):
+    paneer = make_item("Txn Paneer", 5)
+    tikka = make_menu_item("Txn Tikka", 220)
+    set_ingredient(tikka, paneer, 1)
+
+    def payment_fails(*args):
+        raise RuntimeError("card terminal offline")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(order_service, "insert_payment", payment_fails)
+        with pytest.raises(RuntimeError):
+            place_order(staff_id, "Txn Guest", "9500000001", [(tikka, 2)], payment_method="Cash")
+    assert rows_for_phone("9500000001") == (0, 0, 0, 0)
+    assert stock_of(paneer) == 5
+
+    _, _, total = place_order(staff_id, "Txn Guest", "9500000001", [(tikka, 2)], payment_method="Cash")
+    assert total == 440
+    assert rows_for_phone("9500000001") == (1, 1, 1, 1)
+    assert stock_of(paneer) == 3
+
+
+def test_order_totals_take_any_numeric_discount():
+    lines = [(1, 2, Decimal("45.50")), (2, 1, Decimal("9"))]
+    assert order_total(lines) == Decimal("100")
+    assert order_total(lines, 10) == order_total(lines, Decimal("10")) == order_total(lines, 10.0) == Decimal("90")
@@ -0,0 +1,68 @@
+import threading
+import time
+
+import pytest
+
+from db import ConnectionPool, backend
+
+
+class DeadConnection:
+    def is_connected(self):
+        return False
+
+    def reconnect(self, attempts=1, delay=0):
+        raise backend.PoolError("server has gone away")
+
+    def close(self):
+        pass
+
+
+def test_an_exhausted_pool_times_out():
+    pool = ConnectionPool(size=1, timeout=0.2)
+    conn = pool.acquire()
+    started = time.monotonic()
+    with pytest.raises(backend.PoolError):
+        pool.acquire()
+    assert time.monotonic() - started >= 0.2
+    assert pool.stats()["waits"] == 1
+    pool.release(conn)
+    pool.release(pool.acquire())
+
+
+def test_a_waiter_gets_the_room_a_discarded_connection_frees():
+    pool = ConnectionPool(size=1, timeout=5)
+    conn = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    time.sleep(0.1)
+    pool._discard(conn)   # what release() does with a connection that cannot roll back
+    waiter.join(timeout=1)
+    assert got and not waiter.is_alive()
+    assert pool.stats()["created"] == 2 and pool.stats()["open"] == 1
+    pool.release(got[0])
+
+
+def test_a_connection_that_cannot_reconnect_is_replaced():
+    pool = ConnectionPool(size=1, timeout=1, ping_after=0)
+    pool._created = 1   # the dead connection holds the pool's only slot
+    pool._idle.put((DeadConnection(), time.monotonic() - 1))
+    conn = pool.acquire()
+    assert not isinstance(conn, DeadConnection)
+    stats = pool.stats()
+    assert (stats["discarded"], stats["created"], stats["open"]) == (1, 1, 1)
+    pool.release(conn)
+
+
+def test_the_shared_pool_is_published_only_after_migrating(monkeypatch):
+    import db
+    import migrate
+    migrated = []
+
+    def run_migrations(pool):
+        assert db._pool is None   # nobody can check out of it mid-migration
+        migrated.append(pool)
+
+    monkeypatch.setattr(db, "_pool", None)
+    monkeypatch.setattr(migrate, "run_migrations", run_migrations)
+    assert db.get_pool() is migrated[0]
@@ -0,0 +1,51 @@
+import datetime
+
+from conftest import stock_of
+from purchase_service import (
+    record_purchase, update_purchase_status, receive_pending_purchases, count_purchases, list_purchases,
+    fetch_purchase_details
+)
+
+DAY = datetime.date(2030, 3, 4)
+
+
+def test_receiving_a_purchase_adds_its_stock(staff_id, supplier_id, make_item):
+    rice = make_item("Receive Rice", 2)
+    purchase_id, _ = record_purchase(supplier_id, staff_id, DAY, "Ordered", [(rice, 10, 40)])
+    assert stock_of(rice) == 2
+    update_purchase_status(purchase_id, "Received")
+    assert stock_of(rice) == 12
+    # resubmitting the same change applies nothing
+    update_purchase_status(purchase_id, "Received")
+    assert stock_of(rice) == 12
+    update_purchase_status(purchase_id, "Cancelled")
+    assert stock_of(rice) == 2
+
+
+def test_receive_pending_purchases_in_a_range(staff_id, supplier_id, make_item):
+    day = DAY + datetime.timedelta(days=1)
+    dal, oil = make_item("Pending Dal"), make_item("Pending Oil", 1)
+    record_purchase(supplier_id, staff_id, day, "Ordered", [(dal, 5, 90), (oil, 3, 150)])
+    record_purchase(supplier_id, staff_id, day, "Ordered", [(dal, 2.5, 90)])
+    record_purchase(supplier_id, staff_id, day, "Cancelled", [(oil, 100, 150)])
+    assert receive_pending_purchases(day, day) == 2
+    assert (stock_of(dal), stock_of(oil)) == (7.5, 4)
+    assert receive_pending_purchases(day, day) == 0
+    assert (stock_of(dal), stock_of(oil)) == (7.5, 4)
+
+
+def test_purchases_page_by_date_and_load_details_together(staff_id, supplier_id, make_item):
+    day = DAY + datetime.timedelta(days=2)
+    flour, salt = make_item("Page Flour"), make_item("Page Salt")
+    ids = [record_purchase(supplier_id, staff_id, day, "Ordered", items)[0]
+           for items in ([(flour, 4, 50)], [(flour, 1, 50), (salt, 2, 20)], [(salt, 6, 20)])]
+    record_purchase(supplier_id, staff_id, day + datetime.timedelta(days=1), "Ordered", [(salt, 1, 20)])
+
+    assert count_purchases(day, day) == 3
+    pages = list_purchases(day, day, page=1, page_size=2) + list_purchases(day, day, page=2, page_size=2)
+    assert [purchase.purchase_id for purchase in pages] == ids
+    assert [purchase.total_amount for purchase in pages] == [200, 90, 120]
+
+    details = fetch_purchase_details(ids[:2])
+    assert sorted((line.item_name, line.quantity) for line in details[ids[1]]) == [("Page Flour", 1), ("Page Salt", 2)]
+    assert ids[2] not in details
@@ -0,0 +1,50 @@
+from decimal import Decimal
+
+import pytest
+
+from conftest import stock_of
+from db import db_cursor
+from order_service import place_order, cancel_order
+from recipe_service import deplete_stock, restock, set_ingredient, remove_ingredient
+from reference_data import recipe
+
+
+def test_an_order_depletes_every_ingredient(staff_id, make_item, make_menu_item):
+    rice, oil = make_item("Recipe Rice", 10), make_item("Recipe Oil", 2)
+    biryani = make_menu_item("Recipe Biryani", 180)
+    set_ingredient(biryani, rice, Decimal("0.2"))
+    set_ingredient(biryani, oil, Decimal("0.05"))
+
+    order_id, _, _ = place_order(staff_id, "Recipe Guest", "9100000000", [(biryani, 3)])
+    assert (stock_of(rice), stock_of(oil)) == (Decimal("9.4"), Decimal("1.85"))
+
+    assert cancel_order(order_id)
+    assert (stock_of(rice), stock_of(oil)) == (10, 2)
+
+
+def test_deplete_and_restock_are_set_based_per_order(staff_id, make_item, make_menu_item):
+    rice, oil = make_item("Set Rice", 5), make_item("Set Oil", 5)
+    dosa, vada = make_menu_item("Set Dosa", 60), make_menu_item("Set Vada", 40)
+    set_ingredient(dosa, rice, 1)
+    set_ingredient(dosa, oil, Decimal("0.5"))
+    set_ingredient(vada, oil, Decimal("0.25"))
+    order_id, _, _ = place_order(staff_id, "Set Guest", "9100000001", [(dosa, 2), (vada, 4)])
+    assert (stock_of(rice), stock_of(oil)) == (3, 3)
+
+    with db_cursor() as cursor:
+        restock(cursor, order_id)
+    assert (stock_of(rice), stock_of(oil)) == (5, 5)
+    with db_cursor() as cursor:
+        deplete_stock(cursor, order_id)
+    assert (stock_of(rice), stock_of(oil)) == (3, 3)
+
+
+def test_recipe_edits_persist(make_item, make_menu_item):
+    rice = make_item("Edit Rice")
+    idli = make_menu_item("Edit Idli", 30)
+    set_ingredient(idli, rice, Decimal("0.1"))
+    assert [(item_id, qty) for item_id, _, _, qty in recipe(idli)] == [(rice, Decimal("0.1"))]
+    remove_ingredient(idli, rice)
+    assert recipe(idli) == ()
+    with pytest.raises(ValueError):
+        set_ingredient(idli, rice, 0)
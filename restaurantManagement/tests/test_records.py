@@ -0,0 +1,56 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from records import END_OF_DAY, Reservation, to_money, to_time
+
+
+@pytest.mark.parametrize("value, expected", [
+    (datetime.timedelta(hours=9, minutes=30), datetime.time(9, 30)),
+    (datetime.timedelta(0), datetime.time(0)),
+    (datetime.time(18, 45), datetime.time(18, 45)),
+    (datetime.datetime(2030, 1, 7, 21, 15, 5), datetime.time(21, 15, 5)),
+    ("9", datetime.time(9)),
+    ("09:30", datetime.time(9, 30)),
+    ("9:05:07", datetime.time(9, 5, 7)),
+    (" 23:59 ", datetime.time(23, 59)),
+    (None, None),
+])
+def test_to_time(value, expected):
+    assert to_time(value) == expected
+
+
+@pytest.mark.parametrize("value", [datetime.timedelta(days=1), "24", "24:00", "24:00:00"])
+def test_midnight_end_reads_as_end_of_day(value):
+    assert to_time(value) is END_OF_DAY
+
+
+@pytest.mark.parametrize("value", [
+    "", "abc", "9:3a", "25:00", "24:01", "9:60", "9:00:60", "1:2:3:4", "-1:00",
+    datetime.timedelta(hours=25), datetime.timedelta(minutes=-1), 930,
+])
+def test_to_time_rejects_bad_input(value):
+    with pytest.raises(ValueError):
+        to_time(value)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (0.1 + 0.2, Decimal("0.30")),
+    (250, Decimal("250.00")),
+    (Decimal("99.5"), Decimal("99.50")),
+    (Decimal("12.345"), Decimal("12.34")),
+    (None, None),
+])
+def test_to_money(value, expected):
+    assert to_money(value) == expected
+
+
+def test_record_decodes_typed_fields_and_unpacks():
+    row = (7, "Asha", 3, datetime.date(2030, 1, 7), datetime.timedelta(hours=19),
+           datetime.timedelta(days=1), 4, "Booked")
+    reservation = Reservation.from_row(row)
+    assert reservation.start_time == datetime.time(19)
+    assert reservation.end_time is END_OF_DAY
+    reservation_id, customer_name, *_ = reservation
+    assert (reservation_id, customer_name) == (7, "Asha")
@@ -0,0 +1,46 @@
+import threading
+
+from reference_data import TTLCache, session_cache_stats
+
+
+def test_session_counters_are_kept_apart():
+    cache = TTLCache(maxsize=10, ttl=60)
+    sessions = [{}, {}]
+
+    def browse(stats, lookups):
+        cache.bind_session(stats)
+        for _ in range(lookups):
+            cache.get_or_load(("MenuCategory",), lambda: ("Lunch",))
+
+    for stats, lookups in zip(sessions, (3, 1)):
+        thread = threading.Thread(target=browse, args=(stats, lookups))
+        thread.start()
+        thread.join()
+
+    assert session_cache_stats(sessions[0]) == {"hits": 2, "misses": 1, "round_trips_saved": 2}
+    assert session_cache_stats(sessions[1]) == {"hits": 1, "misses": 0, "round_trips_saved": 1}
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 1
+
+
+def test_a_load_overtaken_by_an_invalidation_is_not_cached():
+    cache = TTLCache(maxsize=10, ttl=60)
+
+    def stale_load():
+        cache.invalidate("MenuItem")   # a write commits while the old rows are being read
+        return ("old price",)
+
+    assert cache.get_or_load(("MenuItem", "all"), stale_load) == ("old price",)
+    assert cache.get(("MenuItem", "all")) == (False, None)
+    assert cache.get_or_load(("MenuItem", "all"), lambda: ("new price",)) == ("new price",)
+    assert cache.get(("MenuItem", "all")) == (True, ("new price",))
+
+
+def test_invalidating_another_table_does_not_discard_a_load():
+    cache = TTLCache(maxsize=10, ttl=60)
+
+    def load():
+        cache.invalidate("Supplier")
+        return ("Lunch",)
+
+    cache.get_or_load(("MenuCategory",), load)
+    assert cache.get(("MenuCategory",)) == (True, ("Lunch",))
@@ -0,0 +1,42 @@
+import datetime
+from decimal import Decimal
+
+from db import db_cursor
+from order_service import place_order, cancel_order, record_payment
+from reference_data import menu_items
+from sales_service import ROLLUP_TABLES, rebuild_sales, daily_sales, payment_sales
+
+
+def rollups(day):
+    snapshot = {}
+    with db_cursor() as cursor:
+        for table in ROLLUP_TABLES:
+            cursor.execute(f"SELECT * FROM {table} WHERE sales_date = %s", (day,))
+            rows = [
+                tuple(round(Decimal(str(v)), 2) if isinstance(v, (int, float, Decimal)) else str(v) for v in row)
+                for row in cursor.fetchall()
+            ]
+            # a cancellation leaves its rows at zero where a rebuild has none
+            snapshot[table] = sorted(row for row in rows if any(row[2:]))
+    return snapshot
+
+
+def test_incremental_rollups_match_a_rebuild(staff_id, make_menu_item):
+    today = datetime.date.today()
+    menu_items()   # cached before the dishes exist, as when another process adds them
+    idli, vada = make_menu_item("Rollup Idli", 40), make_menu_item("Rollup Vada", 30)
+    before = daily_sales(today, today)
+    orders_before = before[0].orders if before else 0
+
+    place_order(staff_id, "Rollup A", "9600000000", [(idli, 2), (vada, 1)], payment_method="Cash")
+    _, invoice_id, total = place_order(staff_id, "Rollup B", "9600000001", [(idli, 5)], discount_percent=10)
+    record_payment(invoice_id, total, "UPI")
+    cancelled, _, _ = place_order(staff_id, "Rollup C", "9600000002", [(vada, 3)], payment_method="Cash")
+    assert cancel_order(cancelled)
+
+    assert daily_sales(today, today)[0].orders == orders_before + 2
+    incremental = rollups(today)
+    rebuild_sales(today, today)
+    assert rollups(today) == incremental
+    # payments stand even when their order is cancelled
+    assert {row.payment_method for row in payment_sales(today, today)} >= {"Cash", "UPI"}
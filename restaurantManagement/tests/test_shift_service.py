@@ -0,0 +1,45 @@
+import datetime
+
+import pytest
+
+from db import db_cursor
+from shift_service import (
+    add_shift, create_template, add_template_shift, template_lines, remove_template_shift, apply_template,
+    shifts_for_staff, delete_template, list_templates,
+)
+
+DAY = datetime.date(2030, 2, 4)
+
+
+def test_add_shift_returns_the_new_id(staff_id):
+    first = add_shift(staff_id, DAY, datetime.time(9), datetime.time(13))
+    second = add_shift(staff_id, DAY, datetime.time(14), datetime.time(18))
+    assert first > 0 and second > first
+    with db_cursor() as cursor:
+        cursor.execute("SELECT staff_id, shift_date FROM ShiftSchedule WHERE shift_id = %s", (second,))
+        assert cursor.fetchone() == (staff_id, DAY)
+
+
+def test_add_shift_rejects_an_overlap(staff_id):
+    add_shift(staff_id, DAY, datetime.time(9), datetime.time(13))
+    with pytest.raises(ValueError, match="overlaps"):
+        add_shift(staff_id, DAY, datetime.time(12), datetime.time(15))
+
+
+def test_weekly_template_round_trip(staff_id):
+    template_id = create_template("Test Week")
+    add_template_shift(template_id, staff_id, [0, 2], datetime.time(9), datetime.time(17))
+    with pytest.raises(ValueError, match="overlapping template shift on Wednesday"):
+        add_template_shift(template_id, staff_id, [2], datetime.time(16), datetime.time(20))
+    lines = template_lines(template_id)
+    assert [(line.weekday, line.start_time) for line in lines] == [(0, datetime.time(9)), (2, datetime.time(9))]
+
+    remove_template_shift(lines[1].template_line_id)
+    assert [line.weekday for line in template_lines(template_id)] == [0]
+
+    monday = datetime.date(2030, 2, 11)
+    assert apply_template(template_id, monday, monday + datetime.timedelta(days=13)) == (2, [])
+    assert [shift.shift_date for shift in shifts_for_staff(staff_id)] == [monday, monday + datetime.timedelta(weeks=1)]
+
+    delete_template(template_id)
+    assert template_id not in [template.template_id for template in list_templates()]
@@ -0,0 +1,105 @@
+import datetime
+
+import pytest
+
+from db import db_cursor, unit_of_work
+from shift_service import add_shift
+
+DAY = datetime.date(2030, 1, 7)
+
+
+def shift_count(staff_id):
+    with db_cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM ShiftSchedule WHERE staff_id = %s", (staff_id,))
+        return cursor.fetchone()[0]
+
+
+def test_commits_on_success(staff_id):
+    with unit_of_work():
+        add_shift(staff_id, DAY, datetime.time(9), datetime.time(13))
+        add_shift(staff_id, DAY, datetime.time(14), datetime.time(18))
+    assert shift_count(staff_id) == 2
+
+
+def test_error_rolls_back_everything(staff_id):
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            add_shift(staff_id, DAY, datetime.time(9), datetime.time(13))
+            raise RuntimeError("page failed")
+    assert shift_count(staff_id) == 0
+
+
+def test_nothing_commits_before_the_scope_ends(staff_id):
+    with unit_of_work():
+        add_shift(staff_id, DAY, datetime.time(9), datetime.time(13))
+        # A second connection sees nothing yet
+        from db import get_pool
+        pool = get_pool()
+        other = pool.acquire()
+        try:
+            cursor = other.cursor()
+            cursor.execute("SELECT COUNT(*) FROM ShiftSchedule WHERE staff_id = %s", (staff_id,))
+            assert cursor.fetchone()[0] == 0
+        finally:
+            pool.release(other)
+    assert shift_count(staff_id) == 1
+
+
+def test_failed_block_undoes_only_itself(staff_id):
+    with unit_of_work():
+        add_shift(staff_id, DAY, datetime.time(9), datetime.time(13))
+        # The overlap check raises after nothing was written; a block that fails
+        # part way through is undone to its savepoint
+        with pytest.raises(ValueError):
+            add_shift(staff_id, DAY, datetime.time(10), datetime.time(12))
+        with pytest.raises(RuntimeError):
+            with db_cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO ShiftSchedule (staff_id, shift_date, start_time, end_time)
+                    VALUES (%s, %s, '20:00:00', '22:00:00')
+                """, (staff_id, DAY))
+                raise RuntimeError("block failed")
+        add_shift(staff_id, DAY, datetime.time(14), datetime.time(18))
+    with db_cursor() as cursor:
+        cursor.execute("SELECT start_time FROM ShiftSchedule WHERE staff_id = %s ORDER BY start_time", (staff_id,))
+        assert [row[0] for row in cursor.fetchall()] == [datetime.timedelta(hours=9), datetime.timedelta(hours=14)]
+
+
+def test_outside_a_unit_of_work_each_block_commits(staff_id):
+    add_shift(staff_id, DAY, datetime.time(9), datetime.time(13))
+    with pytest.raises(ValueError):
+        add_shift(staff_id, DAY, datetime.time(12), datetime.time(15))
+    assert shift_count(staff_id) == 1
+
+
+# Stand-in for streamlit's RerunException, which subclasses BaseException
+class RerunException(BaseException):
+    pass
+
+
+def test_rerun_keeps_the_work_before_it(staff_id):
+    with pytest.raises(RerunException):
+        with unit_of_work():
+            add_shift(staff_id, DAY, datetime.time(9), datetime.time(13))
+            raise RerunException()
+    assert shift_count(staff_id) == 1
+
+
+def test_rerun_inside_a_block_keeps_the_block(staff_id):
+    with pytest.raises(RerunException):
+        with unit_of_work():
+            with db_cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO ShiftSchedule (staff_id, shift_date, start_time, end_time)
+                    VALUES (%s, %s, '09:00:00', '13:00:00')
+                """, (staff_id, DAY))
+                raise RerunException()
+    assert shift_count(staff_id) == 1
+
+
+def test_other_base_exceptions_roll_back(staff_id):
+    with pytest.raises(KeyboardInterrupt):
+        with unit_of_work():
+            add_shift(staff_id, DAY, datetime.time(9), datetime.time(13))
+            raise KeyboardInterrupt()
+    assert shift_count(staff_id) == 0
@@ -0,0 +1,52 @@
+import pytest
+
+from upi_qr import qr_matrix
+
+# Version 1-M, mask 7; cross-checked against an independent encoder
+EXPECTED = [
+    "#######...##..#######",
+    "#.....#..##...#.....#",
+    "#.###.#....#..#.###.#",
+    "#.###.#...#...#.###.#",
+    "#.###.#..#..#.#.###.#",
+    "#.....#.#.....#.....#",
+    "#######.#.#.#.#######",
+    ".........#...........",
+    "#..#.##.#.####.#.....",
+    ".####..##...##.###..#",
+    "####..##..#.#.##..#.#",
+    "#...#..#####..##.#..#",
+    "..###.#..###.#..#..##",
+    "........#.#.#.#..####",
+    "#######...####.##.##.",
+    "#.....#.#.#..#..##.##",
+    "#.###.#....#...###...",
+    "#.###.#.#...#..##.###",
+    "#.###.#..#####..#...#",
+    "#.....#..#...#...#...",
+    "#######.##.##.##.#.#.",
+]
+
+
+def draw(grid):
+    return ["".join("#" if dark else "." for dark in row) for row in grid]
+
+
+def test_known_payload_gives_the_expected_modules():
+    assert draw(qr_matrix(b"upi://pay?am=1")) == EXPECTED
+
+
+def test_version_7_and_up_carry_version_information():
+    grid = qr_matrix(b"a" * 120)
+    size = len(grid)
+    assert size == 45
+    # both copies read back as version 7's BCH-protected value (ISO 18004 table D.1)
+    top_right = sum(grid[i // 3][size - 11 + i % 3] << i for i in range(18))
+    bottom_left = sum(grid[size - 11 + i % 3][i // 3] << i for i in range(18))
+    assert top_right == bottom_left == 0x07C94
+
+
+def test_payloads_past_version_10_are_refused():
+    assert len(qr_matrix(b"a" * 213)) == 57
+    with pytest.raises(ValueError, match="Too long"):
+        qr_matrix(b"a" * 214)
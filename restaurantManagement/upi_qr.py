@@ -0,0 +1,272 @@
+import functools
+import struct
+import zlib
+from decimal import Decimal
+from urllib.parse import quote
+from config import UPI_ID, UPI_PAYEE_NAME, UPI_QR_CACHE_SIZE
+
+# ------------------ UPI PAYMENT QR ------------------
+# Payment QR codes are drawn here rather than fetched from a web service, so
+# the payment screen works without internet and shows the real amount and
+# invoice. The image is a PNG built with zlib; the same (UPI ID, amount,
+# invoice) always gives the same bytes, so recent ones are kept in an LRU.
+#
+# The encoder covers what a UPI link needs: byte mode, error correction
+# level M, versions 1-10 (up to 213 bytes).
+
+# ---- Reed-Solomon over GF(256), polynomial 0x11D ----
+EXP = [0] * 512
+LOG = [0] * 256
+_x = 1
+for _i in range(255):
+    EXP[_i] = _x
+    LOG[_x] = _i
+    _x <<= 1
+    if _x & 0x100:
+        _x ^= 0x11D
+for _i in range(255, 512):
+    EXP[_i] = EXP[_i - 255]
+
+def _gf_mul(a, b):
+    return 0 if a == 0 or b == 0 else EXP[LOG[a] + LOG[b]]
+
+@functools.lru_cache(maxsize=None)
+def _rs_generator(degree):
+    poly = [1]
+    for i in range(degree):
+        poly = [a ^ _gf_mul(b, EXP[i]) for a, b in zip(poly + [0], [0] + poly)]
+    return poly
+
+def _rs_remainder(data, degree):
+    generator = _rs_generator(degree)
+    remainder = list(data) + [0] * degree
+    for i in range(len(data)):
+        coef = remainder[i]
+        if coef:
+            for j in range(1, degree + 1):
+                remainder[i + j] ^= _gf_mul(generator[j], coef)
+    return remainder[len(data):]
+
+
+# ---- level M block layout per version: (EC codewords per block, [data codewords per block]) ----
+BLOCKS = {
+    1: (10, [16]), 2: (16, [28]), 3: (26, [44]), 4: (18, [32] * 2), 5: (24, [43] * 2),
+    6: (16, [27] * 4), 7: (18, [31] * 4), 8: (22, [38] * 2 + [39] * 2),
+    9: (22, [36] * 3 + [37] * 2), 10: (26, [43] * 4 + [44]),
+}
+ALIGNMENT = {
+    1: [], 2: [6, 18], 3: [6, 22], 4: [6, 26], 5: [6, 30], 6: [6, 34],
+    7: [6, 22, 38], 8: [6, 24, 42], 9: [6, 26, 46], 10: [6, 28, 50],
+}
+MASKS = [
+    lambda x, y: (x + y) % 2 == 0,
+    lambda x, y: y % 2 == 0,
+    lambda x, y: x % 3 == 0,
+    lambda x, y: (x + y) % 3 == 0,
+    lambda x, y: (x // 3 + y // 2) % 2 == 0,
+    lambda x, y: x * y % 2 + x * y % 3 == 0,
+    lambda x, y: (x * y % 2 + x * y % 3) % 2 == 0,
+    lambda x, y: ((x + y) % 2 + x * y % 3) % 2 == 0,
+]
+
+
+# Data codewords: byte mode header, the bytes, terminator and padding
+def _data_codewords(data, version):
+    capacity = sum(BLOCKS[version][1])
+    bits = []
+    def put(value, length):
+        bits.extend((value >> i) & 1 for i in range(length - 1, -1, -1))
+    put(0b0100, 4)
+    put(len(data), 8 if version < 10 else 16)
+    for byte in data:
+        put(byte, 8)
+    bits.extend([0] * min(4, capacity * 8 - len(bits)))
+    bits.extend([0] * (-len(bits) % 8))
+    codewords = [int("".join(map(str, bits[i:i + 8])), 2) for i in range(0, len(bits), 8)]
+    for i in range(capacity - len(codewords)):
+        codewords.append(0xEC if i % 2 == 0 else 0x11)
+    return codewords
+
+# Split into blocks, add each block's EC codewords, interleave
+def _interleave(codewords, version):
+    ec_length, sizes = BLOCKS[version]
+    blocks, start = [], 0
+    for size in sizes:
+        blocks.append(codewords[start:start + size])
+        start += size
+    ecs = [_rs_remainder(block, ec_length) for block in blocks]
+    result = [block[i] for i in range(max(sizes)) for block in blocks if i < len(block)]
+    result += [ec[i] for i in range(ec_length) for ec in ecs]
+    return result
+
+
+class _Matrix:
+    def __init__(self, version):
+        self.version = version
+        self.size = version * 4 + 17
+        self.dark = [[False] * self.size for _ in range(self.size)]
+        self.reserved = [[False] * self.size for _ in range(self.size)]
+        self._function_patterns()
+
+    def set(self, x, y, dark):
+        self.dark[y][x] = dark
+        self.reserved[y][x] = True
+
+    def _function_patterns(self):
+        size = self.size
+        for i in range(size):
+            self.set(6, i, i % 2 == 0)
+            self.set(i, 6, i % 2 == 0)
+        for cx, cy in ((3, 3), (size - 4, 3), (3, size - 4)):
+            for dy in range(-4, 5):
+                for dx in range(-4, 5):
+                    x, y = cx + dx, cy + dy
+                    if 0 <= x < size and 0 <= y < size:
+                        self.set(x, y, max(abs(dx), abs(dy)) not in (2, 4))
+        positions = ALIGNMENT[self.version]
+        last = len(positions) - 1
+        for i, cx in enumerate(positions):
+            for j, cy in enumerate(positions):
+                if (i, j) in ((0, 0), (0, last), (last, 0)):
+                    continue
+                for dy in range(-2, 3):
+                    for dx in range(-2, 3):
+                        self.set(cx + dx, cy + dy, max(abs(dx), abs(dy)) != 1)
+        self.format_bits(0)
+        if self.version >= 7:
+            remainder = self.version
+            for _ in range(12):
+                remainder = (remainder << 1) ^ ((remainder >> 11) * 0x1F25)
+            bits = self.version << 12 | remainder
+            for i in range(18):
+                dark = (bits >> i) & 1 == 1
+                a, b = size - 11 + i % 3, i // 3
+                self.set(a, b, dark)
+                self.set(b, a, dark)
+
+    # Level M (format bits 00) and the mask number, BCH-protected, in both copies
+    def format_bits(self, mask):
+        size = self.size
+        remainder = mask
+        for _ in range(10):
+            remainder = (remainder << 1) ^ ((remainder >> 9) * 0x537)
+        bits = (mask << 10 | remainder) ^ 0x5412
+        bit = lambda i: (bits >> i) & 1 == 1
+        for i in range(6):
+            self.set(8, i, bit(i))
+        self.set(8, 7, bit(6))
+        self.set(8, 8, bit(7))
+        self.set(7, 8, bit(8))
+        for i in range(9, 15):
+            self.set(14 - i, 8, bit(i))
+        for i in range(8):
+            self.set(size - 1 - i, 8, bit(i))
+        for i in range(8, 15):
+            self.set(8, size - 15 + i, bit(i))
+        self.set(8, size - 8, True)
+
+    # Codeword bits in the two-column zigzag from the bottom right, skipping the timing column
+    def place(self, codewords):
+        size = self.size
+        i, total = 0, len(codewords) * 8
+        right = size - 1
+        while right >= 1:
+            if right == 6:
+                right = 5
+            upward = ((right + 1) & 2) == 0
+            for vert in range(size):
+                y = size - 1 - vert if upward else vert
+                for x in (right, right - 1):
+                    if not self.reserved[y][x] and i < total:
+                        self.dark[y][x] = (codewords[i >> 3] >> (7 - (i & 7))) & 1 == 1
+                        i += 1
+            right -= 2
+
+    def masked(self, mask):
+        test = MASKS[mask]
+        return [
+            [dark != (not reserved and test(x, y)) for x, (dark, reserved) in enumerate(zip(row, reserved_row))]
+            for y, (row, reserved_row) in enumerate(zip(self.dark, self.reserved))
+        ]
+
+
+FINDER_LIKE = [True, False, True, True, True, False, True]
+QUIET = [False] * 4
+
+def _penalty(grid):
+    size = len(grid)
+    score = 0
+    for lines in (grid, [list(column) for column in zip(*grid)]):
+        for line in lines:
+            run = 1
+            for i in range(1, size + 1):
+                if i < size and line[i] == line[i - 1]:
+                    run += 1
+                    continue
+                if run >= 5:
+                    score += run - 2
+                run = 1
+            # 1:1:3:1:1 with 4 light modules on either side; the quiet zone counts as light
+            padded = QUIET + line + QUIET
+            for i in range(4, size - 2):
+                if padded[i:i + 7] == FINDER_LIKE and QUIET in (padded[i - 4:i], padded[i + 7:i + 11]):
+                    score += 40
+    for y in range(size - 1):
+        for x in range(size - 1):
+            if grid[y][x] == grid[y][x + 1] == grid[y + 1][x] == grid[y + 1][x + 1]:
+                score += 3
+    dark = sum(map(sum, grid))
+    score += abs(dark * 100 // (size * size) - 50) // 5 * 10
+    return score
+
+# [[dark, ...], ...] rows of modules, without the quiet zone
+def qr_matrix(data):
+    for version in BLOCKS:
+        if len(data) + (2 if version < 10 else 3) <= sum(BLOCKS[version][1]):
+            break
+    else:
+        raise ValueError(f"Too long for a payment QR code ({len(data)} bytes)")
+    matrix = _Matrix(version)
+    matrix.place(_interleave(_data_codewords(data, version), version))
+    best = None
+    for mask in range(len(MASKS)):
+        matrix.format_bits(mask)
+        grid = matrix.masked(mask)
+        score = _penalty(grid)
+        if best is None or score < best[0]:
+            best = (score, grid)
+    return best[1]
+
+
+# 8-bit grayscale PNG, scale pixels per module, with the 4-module quiet zone
+def png_bytes(grid, scale=6, border=4):
+    width = (len(grid) + 2 * border) * scale
+    margin = b"\xff" * (border * scale)
+    lines = []
+    for row in [[False] * len(grid)] * border + grid + [[False] * len(grid)] * border:
+        # filter byte 0, then the row's pixels
+        line = b"\x00" + margin + b"".join((b"\x00" if dark else b"\xff") * scale for dark in row) + margin
+        lines.extend([line] * scale)
+    raw = b"".join(lines)
+
+    def chunk(kind, body):
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, width, 8, 0, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 9)) + chunk(b"IEND", b""))
+
+
+def upi_link(upi_id, amount, reference, payee=UPI_PAYEE_NAME):
+    return (f"upi://pay?pa={quote(upi_id, safe='@.')}&pn={quote(payee)}&am={amount}&cu=INR"
+            f"&tr={quote(reference)}&tn={quote('Invoice ' + reference)}")
+
+@functools.lru_cache(maxsize=UPI_QR_CACHE_SIZE)
+def _payment_qr(upi_id, amount, reference):
+    return png_bytes(qr_matrix(upi_link(upi_id, amount, reference).encode("utf-8")))
+
+# PNG bytes of the QR for paying amount against an invoice; the amount is
+# fixed to two places first so 250, 250.0 and Decimal("250.00") share an entry
+def payment_qr(amount, reference, upi_id=UPI_ID):
+    amount = Decimal(str(amount)).quantize(Decimal("0.01"))
+    return _payment_qr(upi_id, str(amount), str(reference))
+
+payment_qr_stats = _payment_qr.cache_info
@@ -1,24 +1,14 @@
 import datetime
-import streamlit as st
 
-def safe_parse_time(value):
-    if value is None:
-        return datetime.time(0, 0)
-    if isinstance(value, datetime.time):
-        return value
-    if isinstance(value, datetime.datetime):
-        return value.time()
-    if isinstance(value, str):
-        value = value.strip()
-        if value.isdigit():
-            value = value.zfill(2) + ":00"
-        if len(value) == 5:
-            return datetime.datetime.strptime(value, "%H:%M").time()
-        elif len(value) == 8:
-            return datetime.datetime.strptime(value, "%H:%M:%S").time()
-    return datetime.time(0, 0)
+# [start 00:00, day after end 00:00) for filtering DATETIME columns without DATE()
+def day_range(start_date, end_date):
+    start = datetime.datetime.combine(start_date, datetime.time.min)
+    end = datetime.datetime.combine(end_date + datetime.timedelta(days=1), datetime.time.min)
+    return start, end
 
 def initialize_session():
+    # Imported here so the time/date helpers stay usable without Streamlit
+    import streamlit as st
     if "logged_in" not in st.session_state:
         st.session_state.logged_in = False
         st.session_state.role = None